@@ -112,12 +112,20 @@ class User(AbstractUser):
         """Verifica se o usuário tem credenciais do Google configuradas"""
         return bool(self.google_access_token and self.google_refresh_token)
 
-    def is_google_token_expired(self) -> bool:
-        """Verifica se o token do Google expirou"""
+    def is_google_token_expired(self, leeway_seconds: int = 0) -> bool:
+        """
+        Verifica se o token do Google expirou
+
+        Args:
+            leeway_seconds: Considera expirado o token que vence nos próximos
+                segundos informados
+        """
         if not self.google_token_expires_at:
             return True
         return (
-            datetime.datetime.now(datetime.timezone.utc) >= self.google_token_expires_at
+            datetime.datetime.now(datetime.timezone.utc)
+            + datetime.timedelta(seconds=leeway_seconds)
+            >= self.google_token_expires_at
         )
 
     def update_google_credentials(
@@ -4,7 +4,7 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.urls import reverse
 
-from core.insper import InsperAuth
+from core.insper import InsperAuthError, InsperSessionCache
 from core.settings import DOMAIN
 
 from .models import EmailVerificationToken, User
@@ -65,14 +65,16 @@ def update_user_insper_academic_data(user_id):
         if not user.insper_portal_id:
             return f"Usuário {user.email} não possui portal_id configurado"
 
-        with InsperAuth() as auth:
-            success = auth.login(
-                user.insper_username, user.insper_enc_password, encrypt=False
+        try:
+            # Reaproveita a sessão (e os dados acadêmicos) do cache, se houver
+            academic_data = InsperSessionCache.run(
+                user.insper_username,
+                user.insper_enc_password,
+                lambda auth: auth.get_user_academic_data(),
+                encrypt=False,
             )
-            if not success:
-                return f"Erro ao logar no Insper para {user.email}"
-
-            academic_data = auth.get_user_academic_data()
+        except InsperAuthError:
+            return f"Erro ao logar no Insper para {user.email}"
 
         if academic_data is None:
             return f"Erro ao buscar dados acadêmicos do Insper para {user.email}"
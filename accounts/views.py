@@ -6,7 +6,12 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.crypto import get_random_string
 
 from core.google_calendar import GoogleCalendarClient, get_or_refresh_access_token
-from core.insper import encrypt_insper_password, validate_insper_credentials
+from core.insper import (
+    InsperSessionCache,
+    encrypt_insper_password,
+    validate_insper_credentials,
+)
+from sync.models import SyncConfiguration
 
 from .models import EmailVerificationToken, User
 from .tasks import send_verification_email, update_user_insper_academic_data
@@ -119,6 +124,10 @@ def setup_credentials(request):
         try:
             encrypted_password = encrypt_insper_password(insper_password)
 
+            # A sessão guardada é da conta (ou senha) anterior
+            if request.user.insper_username:
+                InsperSessionCache.invalidate(request.user.insper_username)
+
             request.user.update_insper_credentials(
                 insper_username, encrypted_password, user_data.id
             )
@@ -154,6 +163,8 @@ def setup_credentials(request):
 
 @login_required
 def logout_view(request):
+    if request.user.insper_username:
+        InsperSessionCache.invalidate(request.user.insper_username)
     logout(request)
     return redirect("home")
 
@@ -229,6 +240,12 @@ def google_callback(request):
             calendar_id=calendar_id,
         )
 
+        # A conta conectada pode ser outra: o calendário do Insper Sync precisa
+        # ser confirmado novamente na próxima sincronização
+        SyncConfiguration.objects.filter(user=request.user).update(
+            syncs_since_calendar_check=SyncConfiguration.CALENDAR_CHECK_INTERVAL
+        )
+
         messages.success(
             request,
             "Google Calendar conectado com sucesso! Agora você pode sincronizar seus eventos.",
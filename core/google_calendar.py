@@ -2,13 +2,28 @@
 Utilitários para integração com Google Calendar API
 """
 
+import base64
 import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urlencode
+import hashlib
+import json
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
 
 import httpx
 from django.conf import settings
 
+from core.http import create_client, in_current_context
+from core.monitoring import Counter
+from core.rate_limit import (
+    RateLimiter,
+    RateLimitTimeout,
+    backoff_delay,
+    wait_for_budget,
+)
 from core.settings import DOMAIN
 
 # Type aliases para melhor clareza
@@ -16,24 +31,353 @@ GoogleCalendarEvent = Dict[str, Any]
 GoogleTokenData = Dict[str, Any]
 GoogleCalendarInfo = Dict[str, Any]
 APIResponse = Tuple[bool, Optional[Any], Optional[str]]
-
-
-class GoogleCalendarClient:
-    """Cliente para interação com Google Calendar API"""
+# (método HTTP, caminho relativo a /calendar/v3, corpo JSON opcional)
+BatchRequest = Tuple[str, str, Optional[GoogleCalendarEvent]]
+
+# Cada item de um lote tem seu próprio status, que a métrica por requisição
+# HTTP (ver core.http) não enxerga
+BATCH_ITEMS = Counter(
+    "insper_sync_google_batch_items_total",
+    "Operações enviadas em lotes ao Google Calendar por método e status",
+    ["method", "status"],
+)
+TOKEN_REFRESHES = Counter(
+    "insper_sync_google_token_refreshes_total",
+    "Renovações do token de acesso do Google por resultado",
+    ["result"],
+)
+
+
+class BaseGoogleCalendarClient:
+    """Configuração e utilitários comuns aos clientes síncrono e assíncrono"""
 
     BASE_URL = "https://www.googleapis.com/calendar/v3"
     AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
     TOKEN_URL = "https://oauth2.googleapis.com/token"
+    BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+
+    # Limite de sub-requisições por chamada de lote imposto pelo Google
+    BATCH_MAX_SIZE = 50
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 32.0
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    RETRYABLE_ERROR_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+    # Tempo máximo esperando o limitador liberar uma requisição; depois disso
+    # ela falha com RateLimitTimeout (um erro temporário, repetido pelo lote
+    # ou pela fila de novas tentativas) em vez de sair sem quota
+    RATE_LIMIT_MAX_WAIT = 300.0
+
+    @classmethod
+    def get_rate_limiters(cls, quota_user: str | None = None) -> List[RateLimiter]:
+        """
+        Limitadores compartilhados aplicados às requisições à API
+
+        Args:
+            quota_user: Identificador do usuário (opcional)
+
+        Returns:
+            Limitador do projeto e, se informado, o do usuário
+        """
+        limiters = [
+            RateLimiter(
+                "google_calendar:project",
+                settings.GOOGLE_CALENDAR_PROJECT_REQUESTS_PER_MINUTE,
+            )
+        ]
+        if quota_user:
+            limiters.append(
+                RateLimiter(
+                    f"google_calendar:user:{quota_user}",
+                    settings.GOOGLE_CALENDAR_USER_REQUESTS_PER_MINUTE,
+                )
+            )
+        return limiters
+
+    @classmethod
+    def get_quota_budget(cls, quota_user: str | None = None) -> Dict[str, int]:
+        """
+        Requisições que podem ser enviadas agora (fichas nos baldes dos
+        limitadores), para decidir quanto trabalho agendar
+
+        Args:
+            quota_user: Identificador do usuário (opcional)
+
+        Returns:
+            Dicionário {"project": restantes, "user": restantes (se informado)}
+        """
+        limiters = cls.get_rate_limiters(quota_user)
+        budget = {"project": limiters[0].remaining()}
+        if quota_user:
+            budget["user"] = limiters[1].remaining()
+        return budget
+
+    @staticmethod
+    def _response_json(response: httpx.Response) -> Optional[Any]:
+        """Corpo JSON da resposta, ou None se não for JSON"""
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Espera pedida pelo servidor no cabeçalho Retry-After, em segundos"""
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    def _is_retryable(self, status_code: int, data: Optional[Any]) -> bool:
+        """Verifica se uma falha é temporária (quota ou erro do servidor)"""
+        if status_code in self.RETRYABLE_STATUS_CODES:
+            return True
+
+        if status_code == 403 and isinstance(data, dict):
+            errors = data.get("error", {}).get("errors", [])
+            return any(
+                error.get("reason") in self.RETRYABLE_ERROR_REASONS for error in errors
+            )
+
+        return False
+
+    @staticmethod
+    def _events_path(calendar_id: str) -> str:
+        """Caminho da coleção de eventos de um calendário"""
+        return f"/calendars/{quote(calendar_id, safe='@')}/events"
+
+    @staticmethod
+    def _listing_params(
+        private_extended_properties: Optional[Dict[str, str]] = None,
+        event_fields: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parâmetros de filtro e resposta parcial da listagem de eventos
+
+        Args:
+            private_extended_properties: Filtra no Google os eventos com estas
+                propriedades privadas (ex: {"sync_source": "insper"})
+            event_fields: Campos de cada evento a retornar (sintaxe do
+                parâmetro fields, ex: "id,status,extendedProperties/private")
+            query: Busca textual feita pelo Google
+
+        Returns:
+            Dicionário de parâmetros para a listagem
+        """
+        params: Dict[str, Any] = {}
+        if private_extended_properties:
+            params["privateExtendedProperty"] = [
+                f"{key}={value}" for key, value in private_extended_properties.items()
+            ]
+        if event_fields:
+            # Os tokens de paginação e sincronização sempre fazem parte da resposta
+            params["fields"] = f"nextPageToken,nextSyncToken,items({event_fields})"
+        if query:
+            params["q"] = query
+        return params
+
+    @staticmethod
+    def _has_name(calendar: GoogleCalendarInfo, calendar_name: str) -> bool:
+        """Verifica se o calendário tem o nome informado (sem diferenciar caixa)"""
+        return (
+            calendar.get("summary", "").strip().lower() == calendar_name.strip().lower()
+        )
 
-    def __init__(self, access_token: str | None = None):
+    @staticmethod
+    def _batch_result(
+        response: Tuple[int, Optional[Any], Optional[str]],
+    ) -> APIResponse:
+        """Converte (status_http, dados, erro) de um item do lote em APIResponse"""
+        status_code, data, error = response
+        if 200 <= status_code < 300:
+            return True, data, None
+        return False, None, error
+
+    @staticmethod
+    def _encode_batch(requests: List[BatchRequest]) -> Tuple[str, bytes]:
+        """
+        Monta o corpo multipart/mixed de uma chamada de lote
+
+        Args:
+            requests: Até BATCH_MAX_SIZE tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Tupla (content_type, corpo)
+        """
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+
+        for index, (method, path, body) in enumerate(requests):
+            part = (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{index}>\r\n"
+                "\r\n"
+                f"{method} /calendar/v3{path} HTTP/1.1\r\n"
+            )
+            if body is not None:
+                part += (
+                    "Content-Type: application/json; charset=UTF-8\r\n"
+                    "\r\n"
+                    f"{json.dumps(body)}\r\n"
+                )
+            else:
+                part += "\r\n"
+            parts.append(part)
+
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        return f"multipart/mixed; boundary={boundary}", content.encode("utf-8")
+
+    @classmethod
+    def _batch_item_results(
+        cls, requests: List[BatchRequest], response: httpx.Response
+    ) -> List[Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Separa a resposta de uma chamada de lote bem-sucedida por item
+
+        Args:
+            requests: Requisições enviadas no lote
+            response: Resposta HTTP 200 da chamada de lote
+
+        Returns:
+            Lista de tuplas (status_http, dados, mensagem_de_erro) por item
+        """
+        parsed = cls._parse_batch_response(response)
+        results = [
+            parsed.get(index, (500, None, "Resposta ausente no lote"))
+            for index in range(len(requests))
+        ]
+
+        for (method, _, _), (status_code, _, _) in zip(requests, results):
+            BATCH_ITEMS.inc(method=method, status=str(status_code))
+
+        return results
+
+    @staticmethod
+    def _parse_batch_response(
+        response: httpx.Response,
+    ) -> Dict[int, Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Interpreta o corpo multipart/mixed de uma resposta de lote
+
+        Args:
+            response: Resposta HTTP da chamada de lote
+
+        Returns:
+            Dicionário {índice_do_item: (status_http, dados, mensagem_de_erro)}
+        """
+        match = re.search(
+            r"boundary=\"?([^\";]+)\"?", response.headers.get("content-type", "")
+        )
+        if not match:
+            return {}
+
+        results = {}
+        for part in response.text.split(f"--{match.group(1)}"):
+            part = part.strip()
+            if not part or part == "--":
+                continue
+
+            # Cabeçalhos da parte, depois a mensagem HTTP embutida
+            sections = re.split(r"\r?\n\r?\n", part, maxsplit=2)
+            if len(sections) < 2:
+                continue
+
+            content_id = re.search(r"Content-ID:\s*<response-item-(\d+)>", sections[0])
+            status_line = re.match(r"HTTP/[\d.]+\s+(\d{3})", sections[1])
+            if not content_id or not status_line:
+                continue
+
+            status_code = int(status_line.group(1))
+            body = sections[2].strip() if len(sections) > 2 else ""
+
+            try:
+                data = json.loads(body) if body else None
+            except ValueError:
+                data = None
+
+            error = None
+            if not 200 <= status_code < 300:
+                error = f"Erro HTTP {status_code}: {body}"
+
+            results[int(content_id.group(1))] = (status_code, data, error)
+
+        return results
+
+
+class GoogleCalendarClient(BaseGoogleCalendarClient):
+    """Cliente para interação com Google Calendar API"""
+
+    def __init__(self, access_token: str | None = None, quota_user: str | None = None):
         """
         Inicializa o cliente com token de acesso opcional
 
         Args:
             access_token: Token de acesso do Google (opcional)
+            quota_user: Identificador do usuário para o limite de requisições
+                por usuário (opcional; sem ele vale apenas o limite do projeto)
         """
         self.access_token = access_token
-        self.client = httpx.Client()
+        self.quota_user = quota_user
+        self.client = create_client()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        cost: int = 1,
+        retry: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Envia uma requisição autenticada à API, passando pelos limitadores
+        compartilhados. Erros de quota e erros 5xx são repetidos com backoff
+        exponencial e jitter.
+
+        Args:
+            method: Método HTTP
+            url: URL completa
+            cost: Quantas requisições isso representa na quota (ex: itens de um lote)
+            retry: Se deve repetir falhas temporárias
+            **kwargs: Argumentos repassados ao httpx (params, json, content...)
+
+        Returns:
+            Resposta da última tentativa
+
+        Raises:
+            RateLimitTimeout: Se não houve quota dentro de RATE_LIMIT_MAX_WAIT
+        """
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            **kwargs.pop("headers", {}),
+        }
+        limiters = self.get_rate_limiters(self.quota_user)
+        max_retries = self.MAX_RETRIES if retry else 0
+
+        for attempt in range(max_retries + 1):
+            if not wait_for_budget(limiters, cost, max_wait=self.RATE_LIMIT_MAX_WAIT):
+                raise RateLimitTimeout(
+                    "Quota do Google Calendar indisponível após "
+                    f"{self.RATE_LIMIT_MAX_WAIT:.0f}s de espera"
+                )
+            response = self.client.request(method, url, headers=headers, **kwargs)
+
+            if attempt == max_retries or not self._is_retryable(
+                response.status_code, self._response_json(response)
+            ):
+                return response
+
+            time.sleep(
+                backoff_delay(
+                    attempt,
+                    self.RETRY_BASE_DELAY,
+                    self.RETRY_MAX_DELAY,
+                    retry_after=self._retry_after(response),
+                )
+            )
+
+        return response
 
     def get_authorization_url(self, state: str | None = None) -> str:
         """
@@ -135,9 +479,9 @@ class GoogleCalendarClient:
             return False, None, "Token de acesso não fornecido"
 
         try:
-            response = self.client.get(
+            response = self._request(
+                "GET",
                 f"{self.BASE_URL}/users/me/calendarList",
-                headers={"Authorization": f"Bearer {self.access_token}"},
             )
 
             if response.status_code == 200:
@@ -162,9 +506,9 @@ class GoogleCalendarClient:
             return False, None, "Token de acesso não fornecido"
 
         try:
-            response = self.client.get(
+            response = self._request(
+                "GET",
                 f"{self.BASE_URL}/calendars/primary",
-                headers={"Authorization": f"Bearer {self.access_token}"},
             )
 
             if response.status_code == 200:
@@ -199,12 +543,9 @@ class GoogleCalendarClient:
                 "timeZone": timezone,
             }
 
-            response = self.client.post(
+            response = self._request(
+                "POST",
                 f"{self.BASE_URL}/calendars",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json",
-                },
                 json=calendar_data,
             )
 
@@ -234,27 +575,95 @@ class GoogleCalendarClient:
             return False, None, error or "Erro ao listar calendários"
 
         for calendar in calendars:
-            if (
-                calendar.get("summary", "").strip().lower()
-                == calendar_name.strip().lower()
-            ):
+            if self._has_name(calendar, calendar_name):
                 return True, calendar, None
 
         return False, None, f"Calendário '{calendar_name}' não encontrado"
 
+    def get_calendar(
+        self, calendar_id: str
+    ) -> Tuple[bool, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Obtém os dados básicos (id e nome) de um calendário
+
+        Args:
+            calendar_id: ID do calendário
+
+        Returns:
+            Tupla (sucesso, dados_do_calendário, mensagem_de_erro)
+        """
+        status_code, calendar_data, error = self._fetch_calendar(calendar_id)
+        return status_code == 200, calendar_data, error
+
+    def _fetch_calendar(
+        self, calendar_id: str
+    ) -> Tuple[int, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Busca um calendário pedindo apenas os campos id e summary
+
+        Args:
+            calendar_id: ID do calendário
+
+        Returns:
+            Tupla (status_http, dados_do_calendário, mensagem_de_erro); status 0
+            indica falha antes de obter resposta
+        """
+        if not self.access_token:
+            return 0, None, "Token de acesso não fornecido"
+
+        try:
+            response = self._request(
+                "GET",
+                f"{self.BASE_URL}/calendars/{quote(calendar_id, safe='@')}",
+                params={"fields": "id,summary"},
+            )
+
+            if response.status_code == 200:
+                return 200, response.json(), None
+            else:
+                return (
+                    response.status_code,
+                    None,
+                    f"Erro HTTP {response.status_code}: {response.text}",
+                )
+
+        except Exception as e:
+            return 0, None, f"Erro ao obter calendário: {str(e)}"
+
     def get_or_create_insper_calendar(
-        self, calendar_name: str = "Insper Sync"
+        self,
+        calendar_name: str = "Insper Sync",
+        calendar_id: Optional[str] = None,
+        verify: bool = True,
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
-        Obtém ou cria o calendário do Insper Sync
+        Obtém ou cria o calendário do Insper Sync. Com um calendar_id já
+        conhecido, evita listar todos os calendários do usuário: sem verify o
+        ID é usado diretamente; com verify ele é confirmado com uma leitura do
+        próprio calendário e a busca por nome só acontece se ele não existir
+        mais (ou for outro calendário).
 
         Args:
             calendar_name: Nome do calendário (padrão: "Insper Sync")
+            calendar_id: ID salvo de uma sincronização anterior (opcional)
+            verify: Se deve confirmar o calendar_id no Google
 
         Returns:
             Tupla (sucesso, calendar_id, mensagem_de_erro)
         """
-        # Primeiro tenta encontrar o calendário existente
+        if calendar_id:
+            if not verify:
+                return True, calendar_id, None
+
+            status_code, calendar_data, error = self._fetch_calendar(calendar_id)
+            if status_code == 200 and calendar_data:
+                # O ID salvo pode ser de outro calendário (ex: o principal)
+                if self._has_name(calendar_data, calendar_name):
+                    return True, calendar_data["id"], None
+            elif status_code not in (404, 410):
+                return False, None, error
+
+        # Procura o calendário existente pelo nome
         success, calendar_data, error = self.find_calendar_by_name(calendar_name)
 
         if success and calendar_data:
@@ -276,7 +685,7 @@ class GoogleCalendarClient:
         self, calendar_id: str, events_data: List[GoogleCalendarEvent]
     ) -> Tuple[bool, List[GoogleCalendarEvent], List[str]]:
         """
-        Cria múltiplos eventos em lote (mais eficiente que criar um por um)
+        Cria múltiplos eventos em lote usando o endpoint de batch do Google
 
         Args:
             calendar_id: ID do calendário
@@ -288,11 +697,17 @@ class GoogleCalendarClient:
         if not self.access_token:
             return False, [], ["Token de acesso não fornecido"]
 
+        results = self.execute_batch(
+            [
+                ("POST", self._events_path(calendar_id), event_data)
+                for event_data in events_data
+            ]
+        )
+
         created_events = []
         errors = []
 
-        for event_data in events_data:
-            success, event, error = self.create_event(calendar_id, event_data)
+        for success, event, error in results:
             if success and event:
                 created_events.append(event)
             else:
@@ -304,21 +719,212 @@ class GoogleCalendarClient:
 
         return overall_success, created_events, errors
 
+    def batch_update_events(
+        self, calendar_id: str, updates: List[Tuple[str, GoogleCalendarEvent]]
+    ) -> List[APIResponse]:
+        """
+        Atualiza múltiplos eventos em lote
+
+        Args:
+            calendar_id: ID do calendário
+            updates: Lista de tuplas (event_id, dados_atualizados)
+
+        Returns:
+            Lista de tuplas (sucesso, dados_do_evento, mensagem_de_erro),
+            na mesma ordem de `updates`
+        """
+        return self.execute_batch(
+            [
+                ("PUT", f"{self._events_path(calendar_id)}/{quote(event_id)}", data)
+                for event_id, data in updates
+            ]
+        )
+
+    def batch_delete_events(
+        self, calendar_id: str, event_ids: List[str]
+    ) -> List[APIResponse]:
+        """
+        Remove múltiplos eventos em lote
+
+        Args:
+            calendar_id: ID do calendário
+            event_ids: IDs dos eventos a remover
+
+        Returns:
+            Lista de tuplas (sucesso, None, mensagem_de_erro),
+            na mesma ordem de `event_ids`
+        """
+        return self.execute_batch(
+            [
+                ("DELETE", f"{self._events_path(calendar_id)}/{quote(event_id)}", None)
+                for event_id in event_ids
+            ]
+        )
+
+    def batch_upsert_events(
+        self, calendar_id: str, events_data: List[GoogleCalendarEvent]
+    ) -> List[APIResponse]:
+        """
+        Cria múltiplos eventos em lote. Assim como em create_event, eventos com
+        ID definido pelo cliente que já existem (409) são sobrescritos com uma
+        atualização, também em lote.
+
+        Args:
+            calendar_id: ID do calendário
+            events_data: Lista de dados dos eventos
+
+        Returns:
+            Lista de tuplas (sucesso, dados_do_evento, mensagem_de_erro),
+            na mesma ordem de `events_data`
+        """
+        if not self.access_token:
+            return [(False, None, "Token de acesso não fornecido")] * len(events_data)
+
+        responses = self._execute_batch(
+            [
+                ("POST", self._events_path(calendar_id), event_data)
+                for event_data in events_data
+            ]
+        )
+        results = [self._batch_result(response) for response in responses]
+
+        conflicts = [
+            index
+            for index, (status_code, _, _) in enumerate(responses)
+            if status_code == 409 and events_data[index].get("id")
+        ]
+        if conflicts:
+            updates = self.batch_update_events(
+                calendar_id,
+                [
+                    (
+                        events_data[index]["id"],
+                        {**events_data[index], "status": "confirmed"},
+                    )
+                    for index in conflicts
+                ],
+            )
+            for index, result in zip(conflicts, updates):
+                results[index] = result
+
+        return results
+
+    def execute_batch(self, requests: List[BatchRequest]) -> List[APIResponse]:
+        """
+        Executa requisições em lote (multipart/mixed) na API do Google Calendar.
+
+        As requisições são agrupadas em chamadas de até BATCH_MAX_SIZE itens e
+        apenas as sub-requisições que falharam com erro temporário (quota,
+        erro 5xx) são reenviadas, com backoff exponencial.
+
+        Args:
+            requests: Lista de tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (sucesso, dados, mensagem_de_erro) por item,
+            na mesma ordem de `requests`
+        """
+        if not self.access_token:
+            return [(False, None, "Token de acesso não fornecido")] * len(requests)
+
+        return [
+            self._batch_result(response) for response in self._execute_batch(requests)
+        ]
+
+    def _execute_batch(
+        self, requests: List[BatchRequest]
+    ) -> List[Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Executa o lote com as novas tentativas de execute_batch, mantendo o
+        status HTTP de cada item
+
+        Args:
+            requests: Lista de tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (status_http, dados, mensagem_de_erro) por item
+        """
+        not_executed = (0, None, "Requisição não executada")
+        results = [not_executed] * len(requests)
+        pending = list(range(len(requests)))
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            to_retry = []
+
+            for chunk_start in range(0, len(pending), self.BATCH_MAX_SIZE):
+                chunk = pending[chunk_start : chunk_start + self.BATCH_MAX_SIZE]
+                responses = self._send_batch([requests[i] for i in chunk])
+
+                for index, response in zip(chunk, responses):
+                    results[index] = response
+                    status_code, data, _ = response
+                    if not 200 <= status_code < 300 and self._is_retryable(
+                        status_code, data
+                    ):
+                        to_retry.append(index)
+
+            if not to_retry or attempt == self.MAX_RETRIES:
+                break
+
+            pending = to_retry
+            time.sleep(
+                backoff_delay(attempt, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+            )
+
+        return results
+
+    def _send_batch(
+        self, requests: List[BatchRequest]
+    ) -> List[Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Envia uma única chamada de lote e separa as respostas por item
+
+        Args:
+            requests: Até BATCH_MAX_SIZE tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (status_http, dados, mensagem_de_erro) por item.
+            Falhas da chamada inteira são replicadas para todos os itens.
+        """
+        content_type, content = self._encode_batch(requests)
+
+        try:
+            # Cada item do lote conta como uma requisição na quota do Google.
+            # Falhas temporárias são reenviadas por execute_batch, item a item.
+            response = self._request(
+                "POST",
+                self.BATCH_URL,
+                cost=len(requests),
+                retry=False,
+                headers={"Content-Type": content_type},
+                content=content,
+            )
+        except Exception as e:
+            return [(503, None, f"Erro ao executar lote: {str(e)}")] * len(requests)
+
+        if response.status_code != 200:
+            error = f"Erro HTTP {response.status_code}: {response.text}"
+            return [(response.status_code, None, error)] * len(requests)
+
+        return self._batch_item_results(requests, response)
+
     def clear_calendar_events(
         self,
         calendar_id: str,
         time_min: Optional[datetime.datetime] = None,
         time_max: Optional[datetime.datetime] = None,
-        query: str = "source:insper",
+        query: Optional[str] = None,
     ) -> Tuple[bool, int, Optional[str]]:
         """
-        Remove eventos de um calendário (com filtros opcionais)
+        Remove os eventos criados pelo Insper Sync de um calendário (com
+        filtros opcionais). A seleção é feita pelo Google e apenas os IDs são
+        transferidos.
 
         Args:
             calendar_id: ID do calendário
             time_min: Data/hora mínima (opcional)
             time_max: Data/hora máxima (opcional)
-            query: Query de busca para filtrar eventos
+            query: Busca textual para restringir os eventos (opcional)
 
         Returns:
             Tupla (sucesso, quantidade_removida, mensagem_de_erro)
@@ -327,39 +933,24 @@ class GoogleCalendarClient:
             return False, 0, "Token de acesso não fornecido"
 
         try:
-            # Primeiro lista os eventos
             success, events, error = self.list_events(
                 calendar_id=calendar_id,
                 time_min=time_min,
                 time_max=time_max,
                 max_results=2500,  # Máximo permitido pela API
+                private_extended_properties={"sync_source": "insper"},
+                event_fields="id",
+                query=query,
             )
 
-            if not success or not events:
+            if not success or events is None:
                 return False, 0, error or "Erro ao listar eventos"
 
-            # Filtra eventos que contêm a query (ex: eventos do Insper)
-            filtered_events = []
-            if query:
-                for event in events:
-                    # Verifica se o evento foi criado pelo Insper Sync
-                    extended_props = event.get("extendedProperties", {}).get(
-                        "private", {}
-                    )
-                    if (
-                        extended_props.get("sync_source") == "insper"
-                        or query.lower() in event.get("summary", "").lower()
-                    ):
-                        filtered_events.append(event)
-            else:
-                filtered_events = events
-
-            # Remove os eventos filtrados
-            removed_count = 0
-            for event in filtered_events:
-                success, error = self.delete_event(calendar_id, event["id"])
-                if success:
-                    removed_count += 1
+            # Remove os eventos em lote
+            results = self.batch_delete_events(
+                calendar_id, [event["id"] for event in events]
+            )
+            removed_count = sum(1 for success, _, _ in results if success)
 
             return True, removed_count, None
 
@@ -387,12 +978,9 @@ class GoogleCalendarClient:
                 # Adiciona regra para tornar público para leitura
                 acl_rule = {"role": "reader", "scope": {"type": "default"}}
 
-                response = self.client.post(
+                response = self._request(
+                    "POST",
                     f"{self.BASE_URL}/calendars/{calendar_id}/acl",
-                    headers={
-                        "Authorization": f"Bearer {self.access_token}",
-                        "Content-Type": "application/json",
-                    },
                     json=acl_rule,
                 )
 
@@ -410,7 +998,9 @@ class GoogleCalendarClient:
         self, calendar_id: str, event_data: GoogleCalendarEvent
     ) -> Tuple[bool, Optional[GoogleCalendarEvent], Optional[str]]:
         """
-        Cria um evento no calendário
+        Cria um evento no calendário. Se event_data trouxer um "id" que já
+        existe no calendário (inclusive de um evento removido), o evento é
+        sobrescrito e reativado, tornando a criação idempotente.
 
         Args:
             calendar_id: ID do calendário
@@ -423,17 +1013,21 @@ class GoogleCalendarClient:
             return False, None, "Token de acesso não fornecido"
 
         try:
-            response = self.client.post(
+            response = self._request(
+                "POST",
                 f"{self.BASE_URL}/calendars/{calendar_id}/events",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json",
-                },
                 json=event_data,
             )
 
             if response.status_code == 200:
                 return True, response.json(), None
+            elif response.status_code == 409 and event_data.get("id"):
+                # O ID já foi usado: uma tentativa anterior criou o evento
+                return self.update_event(
+                    calendar_id,
+                    event_data["id"],
+                    {**event_data, "status": "confirmed"},
+                )
             else:
                 return False, None, f"Erro HTTP {response.status_code}: {response.text}"
 
@@ -458,12 +1052,9 @@ class GoogleCalendarClient:
             return False, None, "Token de acesso não fornecido"
 
         try:
-            response = self.client.put(
+            response = self._request(
+                "PUT",
                 f"{self.BASE_URL}/calendars/{calendar_id}/events/{event_id}",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json",
-                },
                 json=event_data,
             )
 
@@ -492,9 +1083,9 @@ class GoogleCalendarClient:
             return False, "Token de acesso não fornecido"
 
         try:
-            response = self.client.delete(
+            response = self._request(
+                "DELETE",
                 f"{self.BASE_URL}/calendars/{calendar_id}/events/{event_id}",
-                headers={"Authorization": f"Bearer {self.access_token}"},
             )
 
             if response.status_code == 204:
@@ -511,48 +1102,243 @@ class GoogleCalendarClient:
         time_min: Optional[datetime.datetime] = None,
         time_max: Optional[datetime.datetime] = None,
         max_results: int = 250,
+        private_extended_properties: Optional[Dict[str, str]] = None,
+        event_fields: Optional[str] = None,
+        query: Optional[str] = None,
     ) -> Tuple[bool, Optional[List[GoogleCalendarEvent]], Optional[str]]:
         """
-        Lista eventos de um calendário
+        Lista todos os eventos de um calendário, percorrendo todas as páginas
 
         Args:
             calendar_id: ID do calendário
             time_min: Data/hora mínima (opcional)
             time_max: Data/hora máxima (opcional)
-            max_results: Número máximo de resultados
+            max_results: Número máximo de resultados por página
+            private_extended_properties: Retorna apenas eventos com estas
+                propriedades privadas, filtrados pelo Google (opcional)
+            event_fields: Campos de cada evento a retornar (opcional)
+            query: Busca textual feita pelo Google (opcional)
 
         Returns:
             Tupla (sucesso, lista_de_eventos, mensagem_de_erro)
         """
+        events: List[GoogleCalendarEvent] = []
+
+        for success, page_events, error in self.iter_event_pages(
+            calendar_id,
+            time_min=time_min,
+            time_max=time_max,
+            max_results=max_results,
+            private_extended_properties=private_extended_properties,
+            event_fields=event_fields,
+            query=query,
+        ):
+            if not success:
+                return False, None, error
+            events.extend(page_events or [])
+
+        return True, events, None
+
+    def iter_event_pages(
+        self,
+        calendar_id: str,
+        time_min: Optional[datetime.datetime] = None,
+        time_max: Optional[datetime.datetime] = None,
+        max_results: int = 250,
+        prefetch: bool = True,
+        private_extended_properties: Optional[Dict[str, str]] = None,
+        event_fields: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> Iterator[APIResponse]:
+        """
+        Lista eventos de um calendário página por página, seguindo o
+        nextPageToken. Com `prefetch`, a próxima página é baixada em segundo
+        plano enquanto quem consome processa a página atual.
+
+        Args:
+            calendar_id: ID do calendário
+            time_min: Data/hora mínima (opcional)
+            time_max: Data/hora máxima (opcional)
+            max_results: Número máximo de resultados por página
+            prefetch: Se deve baixar a próxima página antecipadamente
+            private_extended_properties: Retorna apenas eventos com estas
+                propriedades privadas, filtrados pelo Google (opcional)
+            event_fields: Campos de cada evento a retornar (opcional)
+            query: Busca textual feita pelo Google (opcional)
+
+        Yields:
+            Tupla (sucesso, eventos_da_página, mensagem_de_erro) por página.
+            Após uma falha a iteração é encerrada.
+        """
         if not self.access_token:
-            return False, None, "Token de acesso não fornecido"
+            yield False, None, "Token de acesso não fornecido"
+            return
+
+        params: Dict[str, Any] = {
+            "maxResults": max_results,
+            "singleEvents": True,
+            "orderBy": "startTime",
+            **self._listing_params(private_extended_properties, event_fields, query),
+        }
+
+        if time_min:
+            params["timeMin"] = time_min.astimezone().isoformat()
+        if time_max:
+            params["timeMax"] = time_max.astimezone().isoformat()
+
+        for _, page, error in self._iter_pages(calendar_id, params, prefetch):
+            if page is None:
+                yield False, None, error
+                return
+            yield True, page.get("items", []), None
+
+    def iter_event_changes(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        max_results: int = 2500,
+        prefetch: bool = True,
+        event_fields: Optional[str] = None,
+    ) -> Iterator[APIResponse]:
+        """
+        Lista as mudanças de um calendário desde o último syncToken.
+
+        Sem `sync_token` (ou se o Google responder 410 Gone para um token
+        expirado) é feita uma listagem completa do calendário, que também
+        devolve um novo syncToken. O Google não aceita filtros como
+        privateExtendedProperty junto com syncToken; apenas os campos
+        retornados podem ser reduzidos.
+
+        Args:
+            calendar_id: ID do calendário
+            sync_token: nextSyncToken da sincronização anterior (opcional)
+            max_results: Número máximo de resultados por página
+            prefetch: Se deve baixar a próxima página antecipadamente
+            event_fields: Campos de cada evento a retornar (opcional)
+
+        Yields:
+            Tupla (sucesso, página, mensagem_de_erro) por página. A página
+            contém "items" (incluindo eventos cancelados), "fullSync" indicando
+            se é uma listagem completa e, na última, "nextSyncToken".
+        """
+        if not self.access_token:
+            yield False, None, "Token de acesso não fornecido"
+            return
+
+        params: Dict[str, Any] = {
+            "maxResults": max_results,
+            "singleEvents": True,
+            **self._listing_params(event_fields=event_fields),
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+
+        pages = self._iter_pages(calendar_id, params, prefetch)
+        status_code, page, error = next(pages)
+
+        if status_code == 410 and sync_token:
+            # Token expirado: recomeça com uma listagem completa
+            pages.close()
+            params.pop("syncToken")
+            sync_token = None
+            pages = self._iter_pages(calendar_id, params, prefetch)
+            status_code, page, error = next(pages)
+
+        while True:
+            if page is None:
+                yield False, None, error
+                return
+
+            yield True, {**page, "fullSync": not sync_token}, None
+
+            try:
+                status_code, page, error = next(pages)
+            except StopIteration:
+                return
+
+    def _iter_pages(
+        self, calendar_id: str, params: Dict[str, Any], prefetch: bool
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Percorre as páginas da listagem de eventos seguindo o nextPageToken
+
+        Args:
+            calendar_id: ID do calendário
+            params: Parâmetros da listagem
+            prefetch: Se deve baixar a próxima página em segundo plano
+
+        Yields:
+            Tupla (status_http, resposta_da_página, mensagem_de_erro).
+            Após uma falha a iteração é encerrada.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
 
         try:
-            params = {
-                "maxResults": max_results,
-                "singleEvents": True,
-                "orderBy": "startTime",
-            }
+            status_code, page, error = self._fetch_events_page(calendar_id, params)
+
+            while True:
+                if page is None:
+                    yield status_code, None, error
+                    return
+
+                next_page_token = page.get("nextPageToken")
+                next_page = None
+                if next_page_token:
+                    next_params = {**params, "pageToken": next_page_token}
+                    if executor:
+                        next_page = executor.submit(
+                            in_current_context(self._fetch_events_page),
+                            calendar_id,
+                            next_params,
+                        )
+
+                yield status_code, page, None
+
+                if not next_page_token:
+                    return
+
+                if next_page is not None:
+                    status_code, page, error = next_page.result()
+                else:
+                    status_code, page, error = self._fetch_events_page(
+                        calendar_id, next_params
+                    )
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
-            if time_min:
-                params["timeMin"] = time_min.astimezone().isoformat()
-            if time_max:
-                params["timeMax"] = time_max.astimezone().isoformat()
+    def _fetch_events_page(
+        self, calendar_id: str, params: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Busca uma única página da listagem de eventos
 
-            response = self.client.get(
-                f"{self.BASE_URL}/calendars/{calendar_id}/events",
-                headers={"Authorization": f"Bearer {self.access_token}"},
+        Args:
+            calendar_id: ID do calendário
+            params: Parâmetros da listagem (incluindo pageToken, se houver)
+
+        Returns:
+            Tupla (status_http, resposta_da_página, mensagem_de_erro).
+            O status é 0 quando a requisição nem chegou a ser feita.
+        """
+        try:
+            response = self._request(
+                "GET",
+                f"{self.BASE_URL}{self._events_path(calendar_id)}",
                 params=params,
             )
 
             if response.status_code == 200:
-                data = response.json()
-                return True, data.get("items", []), None
+                return response.status_code, response.json(), None
             else:
-                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+                return (
+                    response.status_code,
+                    None,
+                    f"Erro HTTP {response.status_code}: {response.text}",
+                )
 
         except Exception as e:
-            return False, None, f"Erro ao listar eventos: {str(e)}"
+            return 0, None, f"Erro ao listar eventos: {str(e)}"
 
     def __del__(self):
         """Cleanup do cliente HTTP"""
@@ -560,6 +1346,23 @@ class GoogleCalendarClient:
             self.client.close()
 
 
+def generate_event_id(*parts: Any) -> str:
+    """
+    Gera um ID de evento determinístico a partir das partes informadas, no
+    formato aceito pelo Google (base32hex: letras a-v e dígitos, 5 a 1024
+    caracteres). As mesmas partes sempre resultam no mesmo ID.
+
+    Args:
+        *parts: Valores que identificam o evento (ex: usuário e ID de origem)
+
+    Returns:
+        ID do evento
+    """
+    key = ":".join(str(part) for part in parts)
+    digest = hashlib.sha256(key.encode()).digest()
+    return base64.b32hexencode(digest).decode().rstrip("=").lower()
+
+
 def format_insper_event_for_google(insper_event: Dict[str, Any]) -> GoogleCalendarEvent:
     """
     Converte um evento do Insper para o formato do Google Calendar
@@ -596,12 +1399,18 @@ def format_insper_event_for_google(insper_event: Dict[str, Any]) -> GoogleCalend
     }
 
 
-def get_or_refresh_access_token(user) -> Tuple[bool, Optional[str], Optional[str]]:
+def get_or_refresh_access_token(
+    user,
+    leeway_seconds: int = 0,
+    client: Optional[GoogleCalendarClient] = None,
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Obtém um token de acesso válido, renovando se necessário
 
     Args:
         user: Instância do modelo User
+        leeway_seconds: Renova também o token que vence nos próximos segundos
+        client: Cliente usado na renovação (reaproveita suas conexões)
 
     Returns:
         Tupla (sucesso, token_de_acesso, mensagem_de_erro)
@@ -610,12 +1419,13 @@ def get_or_refresh_access_token(user) -> Tuple[bool, Optional[str], Optional[str
         return False, None, "Usuário não tem credenciais do Google configuradas"
 
     # Se o token não expirou, retorna o atual
-    if not user.is_google_token_expired():
+    if not user.is_google_token_expired(leeway_seconds):
         return True, user.google_access_token, None
 
     # Token expirado, tenta renovar
-    client = GoogleCalendarClient()
+    client = client or GoogleCalendarClient()
     success, token_data, error = client.refresh_access_token(user.google_refresh_token)
+    TOKEN_REFRESHES.inc(result="success" if success and token_data else "failure")
 
     if success and token_data:
         # Atualiza os tokens do usuário
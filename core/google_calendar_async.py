@@ -0,0 +1,865 @@
+"""
+Cliente assíncrono para a Google Calendar API
+"""
+
+import asyncio
+import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from core.google_calendar import (
+    APIResponse,
+    BaseGoogleCalendarClient,
+    BatchRequest,
+    GoogleCalendarEvent,
+    GoogleCalendarInfo,
+)
+from core.http import create_async_client
+from core.rate_limit import RateLimitTimeout, backoff_delay, wait_for_budget_async
+
+
+class AsyncGoogleCalendarClient(BaseGoogleCalendarClient):
+    """
+    Versão assíncrona do GoogleCalendarClient, com os mesmos métodos de
+    calendários e eventos (inclusive lotes e listagem incremental) e os mesmos
+    retornos. As requisições passam pelos mesmos limitadores compartilhados e
+    no máximo `max_concurrency` ficam em andamento ao mesmo tempo, então várias
+    escritas podem ser disparadas juntas com asyncio.gather:
+
+        async with AsyncGoogleCalendarClient(token) as client:
+            results = await asyncio.gather(
+                *(client.create_event(calendar_id, event) for event in events)
+            )
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 10
+
+    def __init__(
+        self,
+        access_token: str | None = None,
+        quota_user: str | None = None,
+        max_concurrency: int | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Inicializa o cliente
+
+        Args:
+            access_token: Token de acesso do Google (opcional)
+            quota_user: Identificador do usuário para o limite de requisições
+                por usuário (opcional)
+            max_concurrency: Máximo de requisições simultâneas deste cliente
+                (padrão DEFAULT_MAX_CONCURRENCY)
+            http_client: AsyncClient compartilhado entre vários clientes, por
+                exemplo ao sincronizar muitos usuários no mesmo event loop.
+                Quem o fornece é responsável por fechá-lo.
+        """
+        self.access_token = access_token
+        self.quota_user = quota_user
+        self.client = http_client or create_async_client()
+        self._owns_client = http_client is None
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        )
+
+    async def __aenter__(self) -> "AsyncGoogleCalendarClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP (se foi criado por este cliente)"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        cost: int = 1,
+        retry: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Envia uma requisição autenticada à API, respeitando o limite de
+        concorrência e os limitadores compartilhados; a espera por quota não
+        bloqueia o event loop. Erros de quota e erros 5xx são repetidos com
+        backoff exponencial e jitter.
+
+        Args:
+            method: Método HTTP
+            url: URL completa
+            cost: Quantas requisições isso representa na quota
+            retry: Se deve repetir falhas temporárias
+            **kwargs: Argumentos repassados ao httpx (params, json, content...)
+
+        Returns:
+            Resposta da última tentativa
+
+        Raises:
+            RateLimitTimeout: Se não houve quota dentro de RATE_LIMIT_MAX_WAIT
+        """
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            **kwargs.pop("headers", {}),
+        }
+        limiters = self.get_rate_limiters(self.quota_user)
+        max_retries = self.MAX_RETRIES if retry else 0
+
+        for attempt in range(max_retries + 1):
+            if not await wait_for_budget_async(
+                limiters, cost, max_wait=self.RATE_LIMIT_MAX_WAIT
+            ):
+                raise RateLimitTimeout(
+                    "Quota do Google Calendar indisponível após "
+                    f"{self.RATE_LIMIT_MAX_WAIT:.0f}s de espera"
+                )
+            async with self._semaphore:
+                response = await self.client.request(
+                    method, url, headers=headers, **kwargs
+                )
+
+            if attempt == max_retries or not self._is_retryable(
+                response.status_code, self._response_json(response)
+            ):
+                return response
+
+            # A espera acontece fora do semáforo para não segurar a vaga
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt,
+                    self.RETRY_BASE_DELAY,
+                    self.RETRY_MAX_DELAY,
+                    retry_after=self._retry_after(response),
+                )
+            )
+
+        return response
+
+    async def get_calendar_list(
+        self,
+    ) -> Tuple[bool, Optional[List[GoogleCalendarInfo]], Optional[str]]:
+        """
+        Lista calendários do usuário
+
+        Returns:
+            Tupla (sucesso, lista_de_calendários, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "GET", f"{self.BASE_URL}/users/me/calendarList"
+            )
+
+            if response.status_code == 200:
+                return True, response.json().get("items", []), None
+            else:
+                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, None, f"Erro ao listar calendários: {str(e)}"
+
+    async def get_primary_calendar(
+        self,
+    ) -> Tuple[bool, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Obtém o calendário principal do usuário
+
+        Returns:
+            Tupla (sucesso, dados_do_calendário, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request("GET", f"{self.BASE_URL}/calendars/primary")
+
+            if response.status_code == 200:
+                return True, response.json(), None
+            else:
+                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, None, f"Erro ao obter calendário principal: {str(e)}"
+
+    async def get_calendar(
+        self, calendar_id: str
+    ) -> Tuple[bool, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Obtém os dados básicos (id e nome) de um calendário
+
+        Args:
+            calendar_id: ID do calendário
+
+        Returns:
+            Tupla (sucesso, dados_do_calendário, mensagem_de_erro)
+        """
+        status_code, calendar_data, error = await self._fetch_calendar(calendar_id)
+        return status_code == 200, calendar_data, error
+
+    async def _fetch_calendar(
+        self, calendar_id: str
+    ) -> Tuple[int, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Busca um calendário pedindo apenas os campos id e summary
+
+        Args:
+            calendar_id: ID do calendário
+
+        Returns:
+            Tupla (status_http, dados_do_calendário, mensagem_de_erro); status 0
+            indica falha antes de obter resposta
+        """
+        if not self.access_token:
+            return 0, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "GET",
+                f"{self.BASE_URL}/calendars/{quote(calendar_id, safe='@')}",
+                params={"fields": "id,summary"},
+            )
+
+            if response.status_code == 200:
+                return 200, response.json(), None
+            else:
+                return (
+                    response.status_code,
+                    None,
+                    f"Erro HTTP {response.status_code}: {response.text}",
+                )
+
+        except Exception as e:
+            return 0, None, f"Erro ao obter calendário: {str(e)}"
+
+    async def create_calendar(
+        self, summary: str, description: str = "", timezone: str = "America/Sao_Paulo"
+    ) -> Tuple[bool, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Cria um novo calendário no Google Calendar
+
+        Args:
+            summary: Nome do calendário
+            description: Descrição do calendário
+            timezone: Fuso horário do calendário
+
+        Returns:
+            Tupla (sucesso, dados_do_calendário, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "POST",
+                f"{self.BASE_URL}/calendars",
+                json={
+                    "summary": summary,
+                    "description": description,
+                    "timeZone": timezone,
+                },
+            )
+
+            if response.status_code == 200:
+                return True, response.json(), None
+            else:
+                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, None, f"Erro ao criar calendário: {str(e)}"
+
+    async def find_calendar_by_name(
+        self, calendar_name: str
+    ) -> Tuple[bool, Optional[GoogleCalendarInfo], Optional[str]]:
+        """
+        Busca um calendário pelo nome
+
+        Args:
+            calendar_name: Nome do calendário a buscar
+
+        Returns:
+            Tupla (sucesso, dados_do_calendário, mensagem_de_erro)
+        """
+        success, calendars, error = await self.get_calendar_list()
+
+        if not success or not calendars:
+            return False, None, error or "Erro ao listar calendários"
+
+        for calendar in calendars:
+            if self._has_name(calendar, calendar_name):
+                return True, calendar, None
+
+        return False, None, f"Calendário '{calendar_name}' não encontrado"
+
+    async def get_or_create_insper_calendar(
+        self,
+        calendar_name: str = "Insper Sync",
+        calendar_id: Optional[str] = None,
+        verify: bool = True,
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Obtém ou cria o calendário do Insper Sync (mesmas regras de
+        GoogleCalendarClient.get_or_create_insper_calendar)
+
+        Args:
+            calendar_name: Nome do calendário (padrão: "Insper Sync")
+            calendar_id: ID salvo de uma sincronização anterior (opcional)
+            verify: Se deve confirmar o calendar_id no Google
+
+        Returns:
+            Tupla (sucesso, calendar_id, mensagem_de_erro)
+        """
+        if calendar_id:
+            if not verify:
+                return True, calendar_id, None
+
+            status_code, calendar_data, error = await self._fetch_calendar(calendar_id)
+            if status_code == 200 and calendar_data:
+                if self._has_name(calendar_data, calendar_name):
+                    return True, calendar_data["id"], None
+            elif status_code not in (404, 410):
+                return False, None, error
+
+        success, calendar_data, error = await self.find_calendar_by_name(calendar_name)
+        if success and calendar_data:
+            return True, calendar_data["id"], None
+
+        success, calendar_data, error = await self.create_calendar(
+            summary=calendar_name,
+            description="Calendário sincronizado automaticamente com o sistema acadêmico do Insper",
+            timezone="America/Sao_Paulo",
+        )
+
+        if success and calendar_data:
+            return True, calendar_data["id"], None
+        else:
+            return False, None, error or "Erro ao criar calendário do Insper Sync"
+
+    async def create_event(
+        self, calendar_id: str, event_data: GoogleCalendarEvent
+    ) -> Tuple[bool, Optional[GoogleCalendarEvent], Optional[str]]:
+        """
+        Cria um evento no calendário. Com um "id" já existente o evento é
+        sobrescrito e reativado, como em GoogleCalendarClient.create_event.
+
+        Args:
+            calendar_id: ID do calendário
+            event_data: Dados do evento
+
+        Returns:
+            Tupla (sucesso, dados_do_evento, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "POST",
+                f"{self.BASE_URL}{self._events_path(calendar_id)}",
+                json=event_data,
+            )
+
+            if response.status_code == 200:
+                return True, response.json(), None
+            elif response.status_code == 409 and event_data.get("id"):
+                return await self.update_event(
+                    calendar_id,
+                    event_data["id"],
+                    {**event_data, "status": "confirmed"},
+                )
+            else:
+                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, None, f"Erro ao criar evento: {str(e)}"
+
+    async def update_event(
+        self, calendar_id: str, event_id: str, event_data: GoogleCalendarEvent
+    ) -> Tuple[bool, Optional[GoogleCalendarEvent], Optional[str]]:
+        """
+        Atualiza um evento no calendário
+
+        Args:
+            calendar_id: ID do calendário
+            event_id: ID do evento
+            event_data: Dados atualizados do evento
+
+        Returns:
+            Tupla (sucesso, dados_do_evento, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, None, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "PUT",
+                f"{self.BASE_URL}{self._events_path(calendar_id)}/{quote(event_id)}",
+                json=event_data,
+            )
+
+            if response.status_code == 200:
+                return True, response.json(), None
+            else:
+                return False, None, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, None, f"Erro ao atualizar evento: {str(e)}"
+
+    async def delete_event(
+        self, calendar_id: str, event_id: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Remove um evento do calendário
+
+        Args:
+            calendar_id: ID do calendário
+            event_id: ID do evento
+
+        Returns:
+            Tupla (sucesso, mensagem_de_erro)
+        """
+        if not self.access_token:
+            return False, "Token de acesso não fornecido"
+
+        try:
+            response = await self._request(
+                "DELETE",
+                f"{self.BASE_URL}{self._events_path(calendar_id)}/{quote(event_id)}",
+            )
+
+            if response.status_code == 204:
+                return True, None
+            else:
+                return False, f"Erro HTTP {response.status_code}: {response.text}"
+
+        except Exception as e:
+            return False, f"Erro ao remover evento: {str(e)}"
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[datetime.datetime] = None,
+        time_max: Optional[datetime.datetime] = None,
+        max_results: int = 250,
+        private_extended_properties: Optional[Dict[str, str]] = None,
+        event_fields: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> Tuple[bool, Optional[List[GoogleCalendarEvent]], Optional[str]]:
+        """
+        Lista todos os eventos de um calendário, percorrendo todas as páginas
+
+        Args:
+            calendar_id: ID do calendário
+            time_min: Data/hora mínima (opcional)
+            time_max: Data/hora máxima (opcional)
+            max_results: Número máximo de resultados por página
+            private_extended_properties: Retorna apenas eventos com estas
+                propriedades privadas, filtrados pelo Google (opcional)
+            event_fields: Campos de cada evento a retornar (opcional)
+            query: Busca textual feita pelo Google (opcional)
+
+        Returns:
+            Tupla (sucesso, lista_de_eventos, mensagem_de_erro)
+        """
+        events: List[GoogleCalendarEvent] = []
+
+        async for success, page_events, error in self.iter_event_pages(
+            calendar_id,
+            time_min=time_min,
+            time_max=time_max,
+            max_results=max_results,
+            private_extended_properties=private_extended_properties,
+            event_fields=event_fields,
+            query=query,
+        ):
+            if not success:
+                return False, None, error
+            events.extend(page_events or [])
+
+        return True, events, None
+
+    async def iter_event_pages(
+        self,
+        calendar_id: str,
+        time_min: Optional[datetime.datetime] = None,
+        time_max: Optional[datetime.datetime] = None,
+        max_results: int = 250,
+        private_extended_properties: Optional[Dict[str, str]] = None,
+        event_fields: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> AsyncIterator[APIResponse]:
+        """
+        Lista eventos de um calendário página por página, seguindo o
+        nextPageToken
+
+        Args:
+            calendar_id: ID do calendário
+            time_min: Data/hora mínima (opcional)
+            time_max: Data/hora máxima (opcional)
+            max_results: Número máximo de resultados por página
+            private_extended_properties: Retorna apenas eventos com estas
+                propriedades privadas, filtrados pelo Google (opcional)
+            event_fields: Campos de cada evento a retornar (opcional)
+            query: Busca textual feita pelo Google (opcional)
+
+        Yields:
+            Tupla (sucesso, eventos_da_página, mensagem_de_erro) por página.
+            Após uma falha a iteração é encerrada.
+        """
+        if not self.access_token:
+            yield False, None, "Token de acesso não fornecido"
+            return
+
+        params: Dict[str, Any] = {
+            "maxResults": max_results,
+            "singleEvents": True,
+            "orderBy": "startTime",
+            **self._listing_params(private_extended_properties, event_fields, query),
+        }
+
+        if time_min:
+            params["timeMin"] = time_min.astimezone().isoformat()
+        if time_max:
+            params["timeMax"] = time_max.astimezone().isoformat()
+
+        async for _, page, error in self._iter_pages(calendar_id, params):
+            if page is None:
+                yield False, None, error
+                return
+            yield True, page.get("items", []), None
+
+    async def iter_event_changes(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        max_results: int = 2500,
+        event_fields: Optional[str] = None,
+    ) -> AsyncIterator[APIResponse]:
+        """
+        Lista as mudanças de um calendário desde o último syncToken (mesmas
+        regras de GoogleCalendarClient.iter_event_changes, inclusive a
+        listagem completa quando o token expirou)
+
+        Args:
+            calendar_id: ID do calendário
+            sync_token: nextSyncToken da sincronização anterior (opcional)
+            max_results: Número máximo de resultados por página
+            event_fields: Campos de cada evento a retornar (opcional)
+
+        Yields:
+            Tupla (sucesso, página, mensagem_de_erro) por página. A página
+            contém "items" (incluindo eventos cancelados), "fullSync" indicando
+            se é uma listagem completa e, na última, "nextSyncToken".
+        """
+        if not self.access_token:
+            yield False, None, "Token de acesso não fornecido"
+            return
+
+        params: Dict[str, Any] = {
+            "maxResults": max_results,
+            "singleEvents": True,
+            **self._listing_params(event_fields=event_fields),
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+
+        pages = self._iter_pages(calendar_id, params)
+        status_code, page, error = await anext(pages)
+
+        if status_code == 410 and sync_token:
+            # Token expirado: recomeça com uma listagem completa
+            await pages.aclose()
+            params.pop("syncToken")
+            sync_token = None
+            pages = self._iter_pages(calendar_id, params)
+            status_code, page, error = await anext(pages)
+
+        try:
+            while True:
+                if page is None:
+                    yield False, None, error
+                    return
+
+                yield True, {**page, "fullSync": not sync_token}, None
+
+                try:
+                    status_code, page, error = await anext(pages)
+                except StopAsyncIteration:
+                    return
+        finally:
+            await pages.aclose()
+
+    async def _iter_pages(
+        self, calendar_id: str, params: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Percorre as páginas da listagem de eventos seguindo o nextPageToken.
+        A próxima página é baixada em uma task enquanto quem consome processa
+        a página atual.
+
+        Args:
+            calendar_id: ID do calendário
+            params: Parâmetros da listagem
+
+        Yields:
+            Tupla (status_http, resposta_da_página, mensagem_de_erro).
+            Após uma falha a iteração é encerrada.
+        """
+        next_page: Optional[asyncio.Task] = None
+
+        try:
+            status_code, page, error = await self._fetch_events_page(
+                calendar_id, params
+            )
+
+            while True:
+                if page is None:
+                    yield status_code, None, error
+                    return
+
+                next_page_token = page.get("nextPageToken")
+                if next_page_token:
+                    next_page = asyncio.create_task(
+                        self._fetch_events_page(
+                            calendar_id, {**params, "pageToken": next_page_token}
+                        )
+                    )
+
+                yield status_code, page, None
+
+                if next_page is None:
+                    return
+
+                status_code, page, error = await next_page
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _fetch_events_page(
+        self, calendar_id: str, params: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Busca uma única página da listagem de eventos
+
+        Args:
+            calendar_id: ID do calendário
+            params: Parâmetros da listagem (incluindo pageToken, se houver)
+
+        Returns:
+            Tupla (status_http, resposta_da_página, mensagem_de_erro).
+            O status é 0 quando a requisição nem chegou a ser feita.
+        """
+        try:
+            response = await self._request(
+                "GET",
+                f"{self.BASE_URL}{self._events_path(calendar_id)}",
+                params=params,
+            )
+
+            if response.status_code == 200:
+                return response.status_code, response.json(), None
+            else:
+                return (
+                    response.status_code,
+                    None,
+                    f"Erro HTTP {response.status_code}: {response.text}",
+                )
+
+        except Exception as e:
+            return 0, None, f"Erro ao listar eventos: {str(e)}"
+
+    async def batch_update_events(
+        self, calendar_id: str, updates: List[Tuple[str, GoogleCalendarEvent]]
+    ) -> List[APIResponse]:
+        """
+        Atualiza múltiplos eventos em lote
+
+        Args:
+            calendar_id: ID do calendário
+            updates: Lista de tuplas (event_id, dados_atualizados)
+
+        Returns:
+            Lista de tuplas (sucesso, dados_do_evento, mensagem_de_erro),
+            na mesma ordem de `updates`
+        """
+        return await self.execute_batch(
+            [
+                ("PUT", f"{self._events_path(calendar_id)}/{quote(event_id)}", data)
+                for event_id, data in updates
+            ]
+        )
+
+    async def batch_delete_events(
+        self, calendar_id: str, event_ids: List[str]
+    ) -> List[APIResponse]:
+        """
+        Remove múltiplos eventos em lote
+
+        Args:
+            calendar_id: ID do calendário
+            event_ids: IDs dos eventos a remover
+
+        Returns:
+            Lista de tuplas (sucesso, None, mensagem_de_erro),
+            na mesma ordem de `event_ids`
+        """
+        return await self.execute_batch(
+            [
+                ("DELETE", f"{self._events_path(calendar_id)}/{quote(event_id)}", None)
+                for event_id in event_ids
+            ]
+        )
+
+    async def batch_upsert_events(
+        self, calendar_id: str, events_data: List[GoogleCalendarEvent]
+    ) -> List[APIResponse]:
+        """
+        Cria múltiplos eventos em lote, sobrescrevendo com uma atualização em
+        lote os que já existem (409), como em
+        GoogleCalendarClient.batch_upsert_events
+
+        Args:
+            calendar_id: ID do calendário
+            events_data: Lista de dados dos eventos
+
+        Returns:
+            Lista de tuplas (sucesso, dados_do_evento, mensagem_de_erro),
+            na mesma ordem de `events_data`
+        """
+        if not self.access_token:
+            return [(False, None, "Token de acesso não fornecido")] * len(events_data)
+
+        responses = await self._execute_batch(
+            [
+                ("POST", self._events_path(calendar_id), event_data)
+                for event_data in events_data
+            ]
+        )
+        results = [self._batch_result(response) for response in responses]
+
+        conflicts = [
+            index
+            for index, (status_code, _, _) in enumerate(responses)
+            if status_code == 409 and events_data[index].get("id")
+        ]
+        if conflicts:
+            updates = await self.batch_update_events(
+                calendar_id,
+                [
+                    (
+                        events_data[index]["id"],
+                        {**events_data[index], "status": "confirmed"},
+                    )
+                    for index in conflicts
+                ],
+            )
+            for index, result in zip(conflicts, updates):
+                results[index] = result
+
+        return results
+
+    async def execute_batch(self, requests: List[BatchRequest]) -> List[APIResponse]:
+        """
+        Executa requisições em lote (multipart/mixed). As chamadas de até
+        BATCH_MAX_SIZE itens são enviadas juntas, limitadas pelo semáforo do
+        cliente, e apenas os itens com falha temporária são reenviados.
+
+        Args:
+            requests: Lista de tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (sucesso, dados, mensagem_de_erro) por item,
+            na mesma ordem de `requests`
+        """
+        if not self.access_token:
+            return [(False, None, "Token de acesso não fornecido")] * len(requests)
+
+        return [
+            self._batch_result(response)
+            for response in await self._execute_batch(requests)
+        ]
+
+    async def _execute_batch(
+        self, requests: List[BatchRequest]
+    ) -> List[Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Executa o lote com as novas tentativas de execute_batch, mantendo o
+        status HTTP de cada item
+
+        Args:
+            requests: Lista de tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (status_http, dados, mensagem_de_erro) por item
+        """
+        not_executed = (0, None, "Requisição não executada")
+        results = [not_executed] * len(requests)
+        pending = list(range(len(requests)))
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            chunks = [
+                pending[start : start + self.BATCH_MAX_SIZE]
+                for start in range(0, len(pending), self.BATCH_MAX_SIZE)
+            ]
+            responses = await asyncio.gather(
+                *(self._send_batch([requests[i] for i in chunk]) for chunk in chunks)
+            )
+
+            to_retry = []
+            for chunk, chunk_responses in zip(chunks, responses):
+                for index, response in zip(chunk, chunk_responses):
+                    results[index] = response
+                    status_code, data, _ = response
+                    if not 200 <= status_code < 300 and self._is_retryable(
+                        status_code, data
+                    ):
+                        to_retry.append(index)
+
+            if not to_retry or attempt == self.MAX_RETRIES:
+                break
+
+            pending = to_retry
+            await asyncio.sleep(
+                backoff_delay(attempt, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+            )
+
+        return results
+
+    async def _send_batch(
+        self, requests: List[BatchRequest]
+    ) -> List[Tuple[int, Optional[Any], Optional[str]]]:
+        """
+        Envia uma única chamada de lote e separa as respostas por item
+
+        Args:
+            requests: Até BATCH_MAX_SIZE tuplas (método, caminho, corpo_json)
+
+        Returns:
+            Lista de tuplas (status_http, dados, mensagem_de_erro) por item.
+            Falhas da chamada inteira são replicadas para todos os itens.
+        """
+        content_type, content = self._encode_batch(requests)
+
+        try:
+            response = await self._request(
+                "POST",
+                self.BATCH_URL,
+                cost=len(requests),
+                retry=False,
+                headers={"Content-Type": content_type},
+                content=content,
+            )
+        except Exception as e:
+            return [(503, None, f"Erro ao executar lote: {str(e)}")] * len(requests)
+
+        if response.status_code != 200:
+            error = f"Erro HTTP {response.status_code}: {response.text}"
+            return [(response.status_code, None, error)] * len(requests)
+
+        return self._batch_item_results(requests, response)
@@ -0,0 +1,288 @@
+"""
+Clientes HTTP usados para acessar o Google e o portal do Insper, com contagem
+das requisições enviadas a cada serviço externo
+"""
+
+import contextvars
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar, Union
+
+import httpx
+
+from .monitoring import Counter, Histogram
+
+T = TypeVar("T")
+
+# Serviço externo de cada host; no portal do Insper o login é contado à parte
+UPSTREAM_HOSTS = {
+    "sga.insper.edu.br": "insper",
+    "www.googleapis.com": "google",
+    "oauth2.googleapis.com": "google_oauth",
+    "accounts.google.com": "google_oauth",
+}
+# (a página de login, "/AOnline/#/login", chega ao servidor como "/AOnline/")
+INSPER_AUTH_PATHS = ("/AOnline/auth", "/AOnline/config-properties")
+INSPER_LOGIN_PAGE_PATH = "/AOnline/"
+
+# Segmentos do caminho que identificam um recurso (trocados por um nome fixo
+# no rótulo "endpoint" das métricas, para limitar o número de séries)
+RESOURCE_ID_SEGMENTS = {
+    "calendars": "{calendarId}",
+    "events": "{eventId}",
+    "acl": "{ruleId}",
+    "pessoa": "{pessoaId}",
+    "user": "{userId}",
+}
+RESOURCE_ID_EXCEPTIONS = {"primary"}
+
+# Extensão da requisição com o instante do envio (para medir a espera até o
+# fim da resposta, que `Response.elapsed` só informa depois de fechada)
+STARTED_AT_EXTENSION = "insper_sync_started_at"
+
+
+Transport = Union[httpx.BaseTransport, httpx.AsyncBaseTransport]
+
+# Transporte usado pelos clientes criados a partir daqui no lugar da rede
+# (ex: servidores falsos do benchmark, ver override_transport)
+_transport_override: Optional[Transport] = None
+
+
+UPSTREAM_REQUESTS = Counter(
+    "insper_sync_upstream_requests_total",
+    "Requisições aos serviços externos por endpoint e status da resposta",
+    ["upstream", "method", "endpoint", "status"],
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "insper_sync_upstream_request_duration_seconds",
+    "Tempo até a resposta dos serviços externos, por endpoint",
+    ["upstream", "method", "endpoint"],
+)
+
+
+class RequestStats:
+    """Requisições HTTP, bytes e tempo de espera acumulados por serviço externo"""
+
+    def __init__(self):
+        self.upstreams: Dict[str, Dict[str, float]] = {}
+        # As requisições podem vir de threads auxiliares (ex: busca dos meses)
+        self._lock = threading.Lock()
+
+    def record(self, upstream: str, **values: float) -> None:
+        """
+        Soma valores às estatísticas de um serviço
+
+        Args:
+            upstream: Nome do serviço (ver upstream_name)
+            **values: Valores a somar (requests, bytes_sent, bytes_received,
+                seconds)
+        """
+        with self._lock:
+            stats = self.upstreams.setdefault(
+                upstream,
+                {"requests": 0, "bytes_sent": 0, "bytes_received": 0, "seconds": 0.0},
+            )
+            for key, value in values.items():
+                stats[key] += value
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Cópia das estatísticas por serviço"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.upstreams.items()}
+
+
+_collectors: contextvars.ContextVar[Tuple[RequestStats, ...]] = contextvars.ContextVar(
+    "http_request_collectors", default=()
+)
+
+
+@contextmanager
+def collect_requests() -> Iterator[RequestStats]:
+    """
+    Conta as requisições feitas pelos clientes de create_client e
+    create_async_client enquanto o bloco executa (na mesma thread ou tarefa,
+    ou em funções envolvidas por in_current_context)
+
+    Returns:
+        Estatísticas preenchidas ao longo do bloco
+    """
+    stats = RequestStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def in_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Envolve uma função para executá-la (ex: em um ThreadPoolExecutor) com o
+    contexto atual, mantendo a contagem de requisições. Use uma chamada por
+    tarefa submetida.
+
+    Args:
+        func: Função a executar
+
+    Returns:
+        Função que executa `func` em uma cópia do contexto atual
+    """
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+@contextmanager
+def override_transport(transport: Transport) -> Iterator[None]:
+    """
+    Faz os clientes criados por create_client e create_async_client enquanto
+    o bloco executa usarem `transport` em vez da rede. Vale para todo o
+    processo; feito para benchmarks e simulações locais.
+
+    Args:
+        transport: Transporte do httpx (ex: httpx.MockTransport, que serve
+            aos clientes síncronos e assíncronos)
+    """
+    global _transport_override
+    previous = _transport_override
+    _transport_override = transport
+    try:
+        yield
+    finally:
+        _transport_override = previous
+
+
+def upstream_name(url: httpx.URL) -> str:
+    """
+    Nome do serviço externo de uma URL
+
+    Args:
+        url: URL da requisição
+
+    Returns:
+        Nome do serviço ("insper", "insper_auth", "google", "google_oauth"
+        ou o próprio host)
+    """
+    upstream = UPSTREAM_HOSTS.get(url.host, url.host)
+    if upstream == "insper" and (
+        url.path == INSPER_LOGIN_PAGE_PATH or url.path.startswith(INSPER_AUTH_PATHS)
+    ):
+        return "insper_auth"
+    return upstream
+
+
+def endpoint_name(url: httpx.URL) -> str:
+    """
+    Caminho de uma URL com os identificadores de recursos trocados por nomes
+    fixos (ex: "/calendar/v3/calendars/{calendarId}/events/{eventId}")
+
+    Args:
+        url: URL da requisição
+
+    Returns:
+        Nome do endpoint
+    """
+    segments = url.path.split("/")
+    for i in range(1, len(segments)):
+        placeholder = RESOURCE_ID_SEGMENTS.get(segments[i - 1])
+        if placeholder and segments[i] and segments[i] not in RESOURCE_ID_EXCEPTIONS:
+            segments[i] = placeholder
+    # Demais identificadores numéricos ou hexadecimais longos
+    return "/".join(
+        re.sub(r"^(\d+|[0-9a-f]{12,})$", "{id}", segment) for segment in segments
+    )
+
+
+def create_client(**kwargs: Any) -> httpx.Client:
+    """
+    Cria um cliente HTTP síncrono com a contagem de requisições
+
+    Args:
+        **kwargs: Argumentos de httpx.Client
+
+    Returns:
+        Cliente HTTP
+    """
+    if _transport_override is not None:
+        kwargs.setdefault("transport", _transport_override)
+    return httpx.Client(
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+        **kwargs,
+    )
+
+
+def create_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    Cria um cliente HTTP assíncrono com a contagem de requisições
+
+    Args:
+        **kwargs: Argumentos de httpx.AsyncClient
+
+    Returns:
+        Cliente HTTP assíncrono
+    """
+    if _transport_override is not None:
+        kwargs.setdefault("transport", _transport_override)
+    return httpx.AsyncClient(
+        event_hooks={"request": [_aon_request], "response": [_aon_response]},
+        **kwargs,
+    )
+
+
+def _on_request(request: httpx.Request) -> None:
+    request.extensions[STARTED_AT_EXTENSION] = time.perf_counter()
+    collectors = _collectors.get()
+    if not collectors:
+        return
+    try:
+        bytes_sent = len(request.content)
+    except httpx.RequestNotRead:
+        bytes_sent = 0
+    upstream = upstream_name(request.url)
+    for stats in collectors:
+        stats.record(upstream, requests=1, bytes_sent=bytes_sent)
+
+
+def _on_response(response: httpx.Response) -> None:
+    if _collectors.get():
+        # Lê o corpo aqui para contar os bytes recebidos e o tempo até o fim
+        # da resposta (os clientes leem o corpo inteiro de qualquer forma)
+        response.read()
+        _record_response(response)
+    _observe_response(response)
+
+
+async def _aon_request(request: httpx.Request) -> None:
+    _on_request(request)
+
+
+async def _aon_response(response: httpx.Response) -> None:
+    if _collectors.get():
+        await response.aread()
+        _record_response(response)
+    _observe_response(response)
+
+
+def _record_response(response: httpx.Response) -> None:
+    request = response.request
+    started_at = request.extensions.get(STARTED_AT_EXTENSION)
+    seconds = time.perf_counter() - started_at if started_at else 0.0
+    # Respostas já lidas pelo transporte não passam pela contagem do stream
+    bytes_received = response.num_bytes_downloaded or len(response.content)
+    upstream = upstream_name(request.url)
+    for stats in _collectors.get():
+        stats.record(upstream, bytes_received=bytes_received, seconds=seconds)
+
+
+def _observe_response(response: httpx.Response) -> None:
+    """Registra a requisição nas métricas do Prometheus (ver core.monitoring)"""
+    request = response.request
+    started_at = request.extensions.get(STARTED_AT_EXTENSION)
+    labels = {
+        "upstream": upstream_name(request.url),
+        "method": request.method,
+        "endpoint": endpoint_name(request.url),
+    }
+    UPSTREAM_REQUESTS.inc(status=str(response.status_code), **labels)
+    if started_at:
+        UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - started_at, **labels)
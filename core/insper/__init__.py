@@ -2,20 +2,29 @@
 Módulo para integração com sistemas do Insper
 """
 
-from .auth import InsperAuth, validate_insper_credentials
-from .calendar import InsperCalendar, InsperEvent
+from .auth import AsyncInsperAuth, InsperAuth, validate_insper_credentials
+from .calendar import AsyncInsperCalendar, InsperCalendar, InsperEvent
 from .crypto import InsperCrypto, encrypt_insper_password
-from .exceptions import InsperAuthError, InsperConnectionError, InsperCryptoError
+from .exceptions import (
+    InsperAuthError,
+    InsperConnectionError,
+    InsperCryptoError,
+    InsperSessionExpiredError,
+)
 from .models import InsperAcademicData, InsperUserData
+from .session import InsperSessionCache
 from .utils import clear_insper_cache, get_insper_cache_info
 
 __all__ = [
     "InsperAuth",
+    "AsyncInsperAuth",
     "InsperCrypto",
     "InsperUserData",
     "InsperAcademicData",
     "InsperCalendar",
+    "AsyncInsperCalendar",
     "InsperEvent",
+    "InsperSessionCache",
     "validate_insper_credentials",
     "encrypt_insper_password",
     "clear_insper_cache",
@@ -23,4 +32,5 @@ __all__ = [
     "InsperConnectionError",
     "InsperAuthError",
     "InsperCryptoError",
+    "InsperSessionExpiredError",
 ]
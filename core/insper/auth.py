@@ -2,32 +2,31 @@
 Utilitários para autenticação com o sistema do Insper
 """
 
+import asyncio
 import base64
 import json
-from typing import Optional
+from dataclasses import asdict
+from typing import Any, Dict, Optional
 
 import httpx
 
+from core.http import create_async_client, create_client
+
 from .crypto import InsperCrypto
-from .exceptions import InsperAuthError
+from .exceptions import InsperAuthError, InsperSessionExpiredError
 from .models import InsperAcademicData, InsperUserData
 
 
-class InsperAuth:
-    """Utilitários para autenticação com o sistema do Insper"""
+class BaseInsperAuth:
+    """Comportamento comum às sessões síncrona e assíncrona com o portal"""
 
-    user_data: InsperUserData
+    BASE_URL = "https://sga.insper.edu.br"
+    # Respostas que indicam que a sessão expirou ou foi recusada
+    SESSION_EXPIRED_STATUS_CODES = {401, 403}
 
-    def __init__(self):
-        self.session = httpx.Client(base_url="https://sga.insper.edu.br")
-        # Define cookies iniciais
-        self.session.get("/AOnline/auth")
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
+    session: httpx.Client | httpx.AsyncClient
+    user_data: InsperUserData
+    academic_data: Optional[InsperAcademicData] = None
 
     def _parse_user_data(self, response: httpx.Response) -> InsperUserData:
         """Parse dos dados do usuário a partir da resposta de login"""
@@ -43,6 +42,124 @@ class InsperAuth:
         except Exception as e:
             raise InsperAuthError(f"Erro ao processar dados do usuário: {str(e)}")
 
+    @staticmethod
+    def _login_request(
+        username: str, password: str, encrypt: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Monta os argumentos da requisição de login
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha em texto plano (ou já criptografada)
+            encrypt: Se a senha deve ser criptografada
+
+        Returns:
+            Argumentos para o POST em /AOnline/auth
+        """
+        encrypted_password = (
+            InsperCrypto.encrypt_password(password) if encrypt else password
+        )
+        return {
+            "data": {"username": username, "password": encrypted_password},
+            "headers": {"content-type": "application/x-www-form-urlencoded"},
+        }
+
+    def _handle_login_response(self, response: httpx.Response) -> bool:
+        """Guarda os dados do usuário e indica se o login foi aceito"""
+        try:
+            self._parse_user_data(response)
+        except Exception:
+            pass
+
+        return response.status_code == 200 and "user-data" in response.cookies
+
+    def _academic_data_url(self) -> str:
+        return f"/AOnline/apix/api/rest/alunos/user/{self.user_data.id}"
+
+    def _handle_academic_data_response(
+        self, response: httpx.Response
+    ) -> Optional[InsperAcademicData]:
+        """
+        Interpreta a resposta dos dados acadêmicos e guarda o resultado
+
+        Raises:
+            InsperSessionExpiredError: Se a sessão não for mais aceita
+        """
+        if response.status_code in self.SESSION_EXPIRED_STATUS_CODES:
+            raise InsperSessionExpiredError(
+                f"Sessão do Insper expirada (HTTP {response.status_code})"
+            )
+
+        if response.status_code == 200:
+            data = response.json()
+
+            # Verifica se há conteúdo na resposta
+            if data.get("content") and len(data["content"]) > 0:
+                self.academic_data = InsperAcademicData.from_dict(data["content"][0])
+                return self.academic_data
+
+        return None
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Exporta os dados da sessão autenticada (cookies, dados do usuário e
+        dados acadêmicos) para que ela possa ser reaproveitada depois.
+
+        Returns:
+            Dicionário serializável com o estado da sessão
+        """
+        return {
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                }
+                for cookie in self.session.cookies.jar
+            ],
+            "user_data": asdict(self.user_data),
+            "academic_data": asdict(self.academic_data) if self.academic_data else None,
+        }
+
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        """Aplica à sessão atual um estado exportado com `export_state`"""
+        for cookie in state["cookies"]:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+            )
+
+        self.user_data = InsperUserData(**state["user_data"])
+        if state.get("academic_data"):
+            self.academic_data = InsperAcademicData(**state["academic_data"])
+
+
+class InsperAuth(BaseInsperAuth):
+    """Utilitários para autenticação com o sistema do Insper"""
+
+    def __init__(self, init_cookies: bool = True):
+        """
+        Inicializa a sessão HTTP com o portal do Insper
+
+        Args:
+            init_cookies: Se deve buscar os cookies iniciais (desnecessário ao
+                restaurar uma sessão já autenticada)
+        """
+        self.session = create_client(base_url=self.BASE_URL)
+        if init_cookies:
+            # Define cookies iniciais
+            self.session.get("/AOnline/auth")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.close()
+
     def login(self, username: str, password: str, encrypt: bool = True) -> bool:
         """
         Autentica o usuário no sistema do Insper para manter a sessão ativa.
@@ -56,53 +173,58 @@ class InsperAuth:
             True se a autenticação foi bem-sucedida, False caso contrário
         """
         try:
-            encrypted_password = (
-                InsperCrypto.encrypt_password(password) if encrypt else password
-            )
-
             response = self.session.post(
-                "/AOnline/auth",
-                data={"username": username, "password": encrypted_password},
-                headers={"content-type": "application/x-www-form-urlencoded"},
+                "/AOnline/auth", **self._login_request(username, password, encrypt)
             )
-
-            try:
-                self._parse_user_data(response)
-            except Exception:
-                pass
-
-            return response.status_code == 200 and "user-data" in response.cookies
+            return self._handle_login_response(response)
 
         except Exception:
             return False
 
-    def get_user_academic_data(self) -> Optional[InsperAcademicData]:
+    def get_user_academic_data(
+        self, refresh: bool = False
+    ) -> Optional[InsperAcademicData]:
         """
         Busca os dados acadêmicos do usuário no portal do Insper.
+        O resultado fica guardado na instância para chamadas seguintes.
+
+        Args:
+            refresh: Se deve ignorar os dados já obtidos nesta sessão
 
         Returns:
             Dados acadêmicos do usuário ou None se não encontrados
 
         Raises:
+            InsperSessionExpiredError: Se a sessão não for mais aceita
             Exception: Em caso de erro na requisição
         """
-        portal_id = self.user_data.id
+        if self.academic_data is not None and not refresh:
+            return self.academic_data
+
         try:
-            response = self.session.get(
-                f"/AOnline/apix/api/rest/alunos/user/{portal_id}", timeout=30
-            )
+            response = self.session.get(self._academic_data_url(), timeout=30)
+            return self._handle_academic_data_response(response)
 
-            if response.status_code == 200:
-                data = response.json()
+        except InsperSessionExpiredError:
+            raise
+        except Exception as e:
+            raise Exception(f"Erro ao buscar dados acadêmicos: {str(e)}")
 
-                # Verifica se há conteúdo na resposta
-                if data.get("content") and len(data["content"]) > 0:
-                    return InsperAcademicData.from_dict(data["content"][0])
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "InsperAuth":
+        """
+        Restaura uma sessão autenticada exportada com `export_state`,
+        sem fazer login novamente.
 
-            return None
+        Args:
+            state: Estado exportado da sessão
 
-        except Exception as e:
-            raise Exception(f"Erro ao buscar dados acadêmicos: {str(e)}")
+        Returns:
+            Instância do InsperAuth com os cookies restaurados
+        """
+        auth = cls(init_cookies=False)
+        auth._restore_state(state)
+        return auth
 
     def validate_credentials(
         self, username: str, password: str
@@ -154,6 +276,134 @@ class InsperAuth:
             return False
 
 
+class AsyncInsperAuth(BaseInsperAuth):
+    """
+    Versão assíncrona do InsperAuth. Todas as requisições passam por um
+    semáforo, que pode ser compartilhado entre várias sessões para limitar o
+    total de requisições simultâneas ao portal (ex: ao buscar o calendário de
+    muitos alunos no mesmo event loop).
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ):
+        """
+        Inicializa a sessão HTTP assíncrona com o portal do Insper
+
+        Args:
+            max_concurrency: Máximo de requisições simultâneas desta sessão
+                (padrão DEFAULT_MAX_CONCURRENCY; ignorado com `semaphore`)
+            semaphore: Semáforo compartilhado com outras sessões (opcional)
+        """
+        self.session = create_async_client(base_url=self.BASE_URL)
+        self._semaphore = semaphore or asyncio.Semaphore(
+            max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.session.aclose()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Faz uma requisição ao portal respeitando o limite de concorrência
+
+        Args:
+            method: Método HTTP
+            url: Caminho relativo ao portal
+            **kwargs: Argumentos repassados ao httpx
+
+        Returns:
+            Resposta do portal
+        """
+        async with self._semaphore:
+            return await self.session.request(method, url, **kwargs)
+
+    async def login(self, username: str, password: str, encrypt: bool = True) -> bool:
+        """
+        Autentica o usuário no sistema do Insper
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha em texto plano
+            encrypt: Se a senha deve ser criptografada
+
+        Returns:
+            True se a autenticação foi bem-sucedida, False caso contrário
+        """
+        try:
+            # Define cookies iniciais
+            await self.request("GET", "/AOnline/auth")
+
+            response = await self.request(
+                "POST",
+                "/AOnline/auth",
+                **self._login_request(username, password, encrypt),
+            )
+            return self._handle_login_response(response)
+
+        except Exception:
+            return False
+
+    async def get_user_academic_data(
+        self, refresh: bool = False
+    ) -> Optional[InsperAcademicData]:
+        """
+        Busca os dados acadêmicos do usuário no portal do Insper.
+        O resultado fica guardado na instância para chamadas seguintes.
+
+        Args:
+            refresh: Se deve ignorar os dados já obtidos nesta sessão
+
+        Returns:
+            Dados acadêmicos do usuário ou None se não encontrados
+
+        Raises:
+            InsperSessionExpiredError: Se a sessão não for mais aceita
+            Exception: Em caso de erro na requisição
+        """
+        if self.academic_data is not None and not refresh:
+            return self.academic_data
+
+        try:
+            response = await self.request("GET", self._academic_data_url(), timeout=30)
+            return self._handle_academic_data_response(response)
+
+        except InsperSessionExpiredError:
+            raise
+        except Exception as e:
+            raise Exception(f"Erro ao buscar dados acadêmicos: {str(e)}")
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> "AsyncInsperAuth":
+        """
+        Restaura uma sessão autenticada exportada com `export_state` (por
+        qualquer uma das versões), sem fazer login novamente.
+
+        Args:
+            state: Estado exportado da sessão
+            max_concurrency: Máximo de requisições simultâneas desta sessão
+            semaphore: Semáforo compartilhado com outras sessões (opcional)
+
+        Returns:
+            Instância do AsyncInsperAuth com os cookies restaurados
+        """
+        auth = cls(max_concurrency=max_concurrency, semaphore=semaphore)
+        auth._restore_state(state)
+        return auth
+
+
 def validate_insper_credentials(
     username: str, password: str
 ) -> tuple[bool, Optional[InsperUserData], Optional[str]]:
@@ -2,24 +2,43 @@
 Utilitários para trabalhar com o calendário do Insper
 """
 
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlencode
 
-from .auth import InsperAuth
-from .exceptions import InsperAuthError, InsperConnectionError
+import httpx
+
+from core.http import in_current_context
+
+from .auth import BaseInsperAuth
+from .exceptions import (
+    InsperAuthError,
+    InsperConnectionError,
+    InsperSessionExpiredError,
+)
 from .models import InsperAcademicData, InsperCalendarResponse, InsperEvent
 
+logger = logging.getLogger(__name__)
+
+
+class BaseInsperCalendar:
+    """Comportamento comum aos calendários síncrono e assíncrono"""
 
-class InsperCalendar:
-    """Utilitário para obter e manipular eventos do calendário do Insper"""
+    # Máximo de requisições simultâneas ao portal na mesma sessão
+    MAX_CONCURRENT_REQUESTS = 4
+    # Eventos por página pedidos à API
+    PAGE_SIZE = 1000
 
-    def __init__(self, auth: InsperAuth):
+    def __init__(self, auth: BaseInsperAuth):
         """
         Inicializa o calendário com uma sessão autenticada
 
         Args:
-            auth: Instância autenticada do InsperAuth
+            auth: Instância autenticada do InsperAuth (ou AsyncInsperAuth)
         """
         self.auth = auth
         if not hasattr(auth, "user_data"):
@@ -66,6 +85,116 @@ class InsperCalendar:
         query_string = urlencode(params)
         return f"/AOnline/apix/api/rest/alunos/pessoa/{pessoa_id}/events?{query_string}"
 
+    @staticmethod
+    def _months_in_range(
+        start_date: datetime, end_date: datetime
+    ) -> List[Tuple[int, int]]:
+        """
+        Lista os meses (ano, mês) cobertos por um range de datas
+
+        Args:
+            start_date: Data de início
+            end_date: Data de fim
+
+        Returns:
+            Lista de tuplas (ano, mês) em ordem cronológica
+        """
+        months = []
+        current_date = start_date.replace(day=1)  # Início do mês
+
+        while current_date <= end_date:
+            months.append((current_date.year, current_date.month))
+
+            # Vai para o próximo mês
+            if current_date.month == 12:
+                current_date = current_date.replace(year=current_date.year + 1, month=1)
+            else:
+                current_date = current_date.replace(month=current_date.month + 1)
+
+        return months
+
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+        """Primeiro e último dia de um mês"""
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        return start_date, end_date
+
+    @staticmethod
+    def _merge_months(
+        months: List[Tuple[int, int]],
+        responses: Dict[Tuple[int, int], InsperCalendarResponse],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[InsperEvent]:
+        """
+        Junta as respostas dos meses em ordem, mantendo apenas eventos dentro
+        do range e sem repetições
+
+        Args:
+            months: Meses (ano, mês) em ordem cronológica
+            responses: Resposta obtida para cada mês (meses com erro ficam de fora)
+            start_date: Data de início
+            end_date: Data de fim
+
+        Returns:
+            Lista de eventos
+        """
+        events_by_id: Dict[str, InsperEvent] = {}
+        for year_month in months:
+            response = responses.get(year_month)
+            if response is None:
+                continue
+
+            # Filtra eventos que estão dentro do range solicitado
+            for event in response.events:
+                if start_date <= event.start_datetime <= end_date:
+                    events_by_id.setdefault(event.event_id, event)
+
+        return list(events_by_id.values())
+
+    def _parse_events_response(
+        self, response: httpx.Response
+    ) -> InsperCalendarResponse:
+        """
+        Interpreta a resposta de uma página de eventos
+
+        Raises:
+            InsperSessionExpiredError: Se a sessão não for mais aceita
+            httpx.HTTPStatusError: Se o portal responder com erro
+        """
+        if response.status_code in self.auth.SESSION_EXPIRED_STATUS_CODES:
+            raise InsperSessionExpiredError(
+                f"Sessão do Insper expirada (HTTP {response.status_code})"
+            )
+
+        response.raise_for_status()
+
+        return InsperCalendarResponse.from_dict(response.json())
+
+
+class InsperCalendar(BaseInsperCalendar):
+    """
+    Utilitário para obter e manipular eventos do calendário do Insper. As
+    buscas em paralelo (meses e páginas) dividem entre si o limite de
+    MAX_CONCURRENT_REQUESTS requisições simultâneas na sessão.
+    """
+
+    def __init__(self, auth: BaseInsperAuth):
+        """
+        Inicializa o calendário com uma sessão autenticada
+
+        Args:
+            auth: Instância autenticada do InsperAuth
+        """
+        super().__init__(auth)
+        # Compartilhado por todas as threads que usam esta sessão (cada mês
+        # buscado em paralelo abre seu próprio pool de páginas)
+        self._request_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_REQUESTS)
+
     def get_events_for_month(
         self, year: int, month: int, academic_data: Optional[InsperAcademicData] = None
     ) -> InsperCalendarResponse:
@@ -89,34 +218,98 @@ class InsperCalendar:
             if academic_data is None:
                 raise InsperAuthError("Não foi possível obter dados acadêmicos")
 
-        # Define o primeiro e último dia do mês
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        start_date, end_date = self._month_bounds(year, month)
+
+        return InsperCalendarResponse.merge(
+            list(
+                self.iter_event_pages(
+                    start_date=start_date,
+                    end_date=end_date,
+                    academic_data=academic_data,
+                )
+            )
+        )
+
+    def iter_event_pages(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        academic_data: InsperAcademicData,
+        size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[InsperCalendarResponse]:
+        """
+        Percorre todas as páginas de eventos de um range. A primeira página
+        informa o total de páginas e as demais são buscadas em paralelo,
+        sendo entregues conforme chegam.
+
+        Args:
+            start_date: Data de início
+            end_date: Data de fim
+            academic_data: Dados acadêmicos
+            size: Tamanho da página (padrão PAGE_SIZE)
+            max_workers: Máximo de páginas buscadas ao mesmo tempo
+                (padrão MAX_CONCURRENT_REQUESTS)
 
-        return self._get_events_range(
-            start_date=start_date, end_date=end_date, academic_data=academic_data
+        Yields:
+            Resposta da API de cada página (fora de ordem após a primeira)
+
+        Raises:
+            InsperConnectionError: Se houver erro ao buscar alguma página
+        """
+        size = size or self.PAGE_SIZE
+        first_page = self._get_events_range(
+            start_date=start_date,
+            end_date=end_date,
+            academic_data=academic_data,
+            page=0,
+            size=size,
         )
+        yield first_page
+
+        remaining_pages = range(1, first_page.total_pages)
+        if not remaining_pages:
+            return
+
+        workers = min(max_workers or self.MAX_CONCURRENT_REQUESTS, len(remaining_pages))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    in_current_context(self._get_events_range),
+                    start_date=start_date,
+                    end_date=end_date,
+                    academic_data=academic_data,
+                    page=page,
+                    size=size,
+                )
+                for page in remaining_pages
+            ]
+
+            for future in as_completed(futures):
+                yield future.result()
 
     def get_events_for_range(
         self,
         start_date: datetime,
         end_date: datetime,
         academic_data: Optional[InsperAcademicData] = None,
+        max_workers: Optional[int] = None,
     ) -> List[InsperEvent]:
         """
         Obtém eventos para um range de datas, lidando com a limitação da API
-        que só retorna um mês por vez.
+        que só retorna um mês por vez. Os meses são buscados em paralelo na
+        mesma sessão autenticada.
 
         Args:
             start_date: Data de início
             end_date: Data de fim
             academic_data: Dados acadêmicos (se não fornecidos, serão buscados)
+            max_workers: Máximo de meses buscados ao mesmo tempo
+                (padrão MAX_CONCURRENT_REQUESTS; 1 busca em série)
 
         Returns:
-            Lista com todos os eventos no range especificado
+            Lista com todos os eventos no range especificado, sem repetições
 
         Raises:
             InsperConnectionError: Se houver erro na conexão
@@ -127,40 +320,33 @@ class InsperCalendar:
             if academic_data is None:
                 raise InsperAuthError("Não foi possível obter dados acadêmicos")
 
-        all_events = []
-        current_date = start_date.replace(day=1)  # Início do mês
+        months = self._months_in_range(start_date, end_date)
+        responses: Dict[Tuple[int, int], InsperCalendarResponse] = {}
+        workers = min(max_workers or self.MAX_CONCURRENT_REQUESTS, len(months)) or 1
 
-        while current_date <= end_date:
-            try:
-                # Busca eventos do mês atual
-                response = self.get_events_for_month(
-                    year=current_date.year,
-                    month=current_date.month,
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    in_current_context(self.get_events_for_month),
+                    year=year,
+                    month=month,
                     academic_data=academic_data,
-                )
-
-                # Filtra eventos que estão dentro do range solicitado
-                filtered_events = [
-                    event
-                    for event in response.events
-                    if start_date <= event.start_datetime <= end_date
-                ]
-
-                all_events.extend(filtered_events)
-
-            except Exception as e:
-                # Log do erro, mas continua para o próximo mês
-                print(
-                    f"Erro ao buscar eventos de {current_date.strftime('%m/%Y')}: {e}"
-                )
-
-            # Vai para o próximo mês
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-
-        return all_events
+                ): (year, month)
+                for year, month in months
+            }
+
+            for future in as_completed(futures):
+                year, month = futures[future]
+                try:
+                    responses[(year, month)] = future.result()
+                except InsperSessionExpiredError:
+                    # Sessão inválida afeta todos os meses: quem chamou refaz o login
+                    raise
+                except Exception as e:
+                    # Log do erro, mas continua com os outros meses
+                    logger.warning(f"Erro ao buscar eventos de {month:02d}/{year}: {e}")
+
+        return self._merge_months(months, responses, start_date, end_date)
 
     def _get_events_range(
         self,
@@ -168,7 +354,7 @@ class InsperCalendar:
         end_date: datetime,
         academic_data: InsperAcademicData,
         page: int = 0,
-        size: int = 1000,
+        size: Optional[int] = None,
     ) -> InsperCalendarResponse:
         """
         Método interno para buscar eventos em um range específico
@@ -178,7 +364,7 @@ class InsperCalendar:
             end_date: Data de fim
             academic_data: Dados acadêmicos
             page: Página
-            size: Tamanho da página
+            size: Tamanho da página (padrão PAGE_SIZE)
 
         Returns:
             Resposta da API
@@ -190,15 +376,15 @@ class InsperCalendar:
                 start_date=start_date,
                 end_date=end_date,
                 page=page,
-                size=size,
+                size=size or self.PAGE_SIZE,
             )
 
-            response = self.auth.session.get(url, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            return InsperCalendarResponse.from_dict(data)
+            with self._request_slots:
+                response = self.auth.session.get(url, timeout=30)
+            return self._parse_events_response(response)
 
+        except InsperSessionExpiredError:
+            raise
         except Exception as e:
             raise InsperConnectionError(f"Erro ao buscar eventos: {str(e)}")
 
@@ -286,3 +472,173 @@ class InsperCalendar:
         """
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         return self.get_events_for_range(today, today, academic_data)
+
+
+class AsyncInsperCalendar(BaseInsperCalendar):
+    """
+    Versão assíncrona do InsperCalendar, usada com um AsyncInsperAuth. Meses e
+    páginas são buscados ao mesmo tempo; o limite de requisições simultâneas é
+    o semáforo da sessão.
+    """
+
+    async def get_events_for_month(
+        self, year: int, month: int, academic_data: Optional[InsperAcademicData] = None
+    ) -> InsperCalendarResponse:
+        """
+        Obtém eventos de um mês específico
+
+        Args:
+            year: Ano
+            month: Mês (1-12)
+            academic_data: Dados acadêmicos (se não fornecidos, serão buscados)
+
+        Returns:
+            Resposta com os eventos do mês
+
+        Raises:
+            InsperConnectionError: Se houver erro na conexão
+            InsperAuthError: Se não houver dados acadêmicos
+        """
+        if academic_data is None:
+            academic_data = await self.auth.get_user_academic_data()
+            if academic_data is None:
+                raise InsperAuthError("Não foi possível obter dados acadêmicos")
+
+        start_date, end_date = self._month_bounds(year, month)
+
+        return InsperCalendarResponse.merge(
+            await self.get_event_pages(
+                start_date=start_date,
+                end_date=end_date,
+                academic_data=academic_data,
+            )
+        )
+
+    async def get_event_pages(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        academic_data: InsperAcademicData,
+        size: Optional[int] = None,
+    ) -> List[InsperCalendarResponse]:
+        """
+        Busca todas as páginas de eventos de um range. A primeira página
+        informa o total de páginas e as demais são buscadas ao mesmo tempo.
+
+        Args:
+            start_date: Data de início
+            end_date: Data de fim
+            academic_data: Dados acadêmicos
+            size: Tamanho da página (padrão PAGE_SIZE)
+
+        Returns:
+            Respostas de todas as páginas, em ordem
+
+        Raises:
+            InsperConnectionError: Se houver erro ao buscar alguma página
+        """
+        size = size or self.PAGE_SIZE
+        first_page = await self._get_events_range(
+            start_date, end_date, academic_data, page=0, size=size
+        )
+
+        remaining_pages = await asyncio.gather(
+            *(
+                self._get_events_range(
+                    start_date, end_date, academic_data, page=page, size=size
+                )
+                for page in range(1, first_page.total_pages)
+            )
+        )
+
+        return [first_page, *remaining_pages]
+
+    async def get_events_for_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        academic_data: Optional[InsperAcademicData] = None,
+    ) -> List[InsperEvent]:
+        """
+        Obtém eventos para um range de datas, buscando todos os meses ao
+        mesmo tempo
+
+        Args:
+            start_date: Data de início
+            end_date: Data de fim
+            academic_data: Dados acadêmicos (se não fornecidos, serão buscados)
+
+        Returns:
+            Lista com todos os eventos no range especificado, sem repetições
+
+        Raises:
+            InsperConnectionError: Se houver erro na conexão
+            InsperAuthError: Se não houver dados acadêmicos
+        """
+        if academic_data is None:
+            academic_data = await self.auth.get_user_academic_data()
+            if academic_data is None:
+                raise InsperAuthError("Não foi possível obter dados acadêmicos")
+
+        months = self._months_in_range(start_date, end_date)
+        results = await asyncio.gather(
+            *(
+                self.get_events_for_month(year, month, academic_data)
+                for year, month in months
+            ),
+            return_exceptions=True,
+        )
+
+        responses: Dict[Tuple[int, int], InsperCalendarResponse] = {}
+        for (year, month), result in zip(months, results):
+            if isinstance(result, InsperSessionExpiredError):
+                # Sessão inválida afeta todos os meses: quem chamou refaz o login
+                raise result
+            if isinstance(result, BaseException):
+                # Log do erro, mas continua com os outros meses
+                logger.warning(
+                    f"Erro ao buscar eventos de {month:02d}/{year}: {result}"
+                )
+                continue
+            responses[(year, month)] = result
+
+        return self._merge_months(months, responses, start_date, end_date)
+
+    async def _get_events_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        academic_data: InsperAcademicData,
+        page: int = 0,
+        size: Optional[int] = None,
+    ) -> InsperCalendarResponse:
+        """
+        Método interno para buscar uma página de eventos em um range
+
+        Args:
+            start_date: Data de início
+            end_date: Data de fim
+            academic_data: Dados acadêmicos
+            page: Página
+            size: Tamanho da página (padrão PAGE_SIZE)
+
+        Returns:
+            Resposta da API
+        """
+        try:
+            url = self._build_calendar_url(
+                pessoa_id=academic_data.id,
+                cod_aluno=academic_data.codAluno,
+                start_date=start_date,
+                end_date=end_date,
+                page=page,
+                size=size or self.PAGE_SIZE,
+            )
+
+            response = await self.auth.request("GET", url, timeout=30)
+            return self._parse_events_response(response)
+
+        except InsperSessionExpiredError:
+            raise
+        except Exception as e:
+            raise InsperConnectionError(f"Erro ao buscar eventos: {str(e)}")
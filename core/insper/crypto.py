@@ -4,11 +4,12 @@ Utilitários para criptografia com o sistema do Insper
 
 import base64
 
-import httpx
 from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from django.core.cache import cache
 
+from core.http import create_client
+
 from .exceptions import InsperCryptoError
 
 
@@ -32,7 +33,7 @@ class InsperCrypto:
         if public_key_pem is None:
             # Se não está em cache, faz requisição
             try:
-                with httpx.Client(base_url="https://sga.insper.edu.br") as client:
+                with create_client(base_url="https://sga.insper.edu.br") as client:
                     # Primeiro faz uma requisição para definir cookies
                     client.get("/AOnline/auth")
 
@@ -15,6 +15,12 @@ class InsperAuthError(Exception):
     pass
 
 
+class InsperSessionExpiredError(InsperAuthError):
+    """Exceção customizada para sessões do Insper expiradas ou recusadas"""
+
+    pass
+
+
 class InsperCryptoError(Exception):
     """Exceção customizada para erros de criptografia"""
 
@@ -168,3 +168,20 @@ class InsperCalendarResponse:
             current_page=page_info["number"],
             page_size=page_info["size"],
         )
+
+    @classmethod
+    def merge(cls, pages: List["InsperCalendarResponse"]):
+        """
+        Junta as páginas de uma mesma consulta em uma única resposta,
+        mantendo os eventos na ordem das páginas
+        """
+        pages = sorted(pages, key=lambda page: page.current_page)
+        events = [event for page in pages for event in page.events]
+
+        return cls(
+            events=events,
+            total_elements=pages[0].total_elements if pages else len(events),
+            total_pages=pages[0].total_pages if pages else 1,
+            current_page=0,
+            page_size=len(events),
+        )
@@ -0,0 +1,266 @@
+"""
+Cache de sessões autenticadas com o sistema do Insper
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.core.cache import cache
+
+from .auth import AsyncInsperAuth, InsperAuth
+from .exceptions import InsperAuthError, InsperSessionExpiredError
+
+T = TypeVar("T")
+
+
+class InsperSessionCache:
+    """
+    Guarda por usuário os cookies e dados (InsperUserData/InsperAcademicData)
+    de uma sessão já autenticada, evitando um novo login a cada tarefa. O
+    estado é criptografado (Fernet, chave derivada da SECRET_KEY): quem lê o
+    cache não consegue assumir a sessão nem ver os dados do aluno.
+    """
+
+    CACHE_KEY_PREFIX = "insper_session"
+    CACHE_TIMEOUT = 1800  # 30 minutos
+
+    @classmethod
+    def get_cache_key(cls, username: str) -> str:
+        """Chave do cache da sessão de um usuário"""
+        username_hash = hashlib.sha256(username.encode()).hexdigest()
+        return f"{cls.CACHE_KEY_PREFIX}:{username_hash}"
+
+    @classmethod
+    def _fernet(cls) -> Fernet:
+        key = hashlib.sha256(f"{cls.CACHE_KEY_PREFIX}:{settings.SECRET_KEY}".encode())
+        return Fernet(base64.urlsafe_b64encode(key.digest()))
+
+    @classmethod
+    def _encrypt_state(cls, state: Dict[str, Any]) -> bytes:
+        """Estado da sessão criptografado para o cache"""
+        return cls._fernet().encrypt(json.dumps(state).encode())
+
+    @classmethod
+    def _decrypt_state(cls, token: Any) -> Optional[Dict[str, Any]]:
+        """
+        Estado da sessão guardado no cache
+
+        Returns:
+            Estado, ou None se não houver sessão ou ela não puder ser lida
+            (ex: SECRET_KEY trocada), caso em que é feito um novo login
+        """
+        if not isinstance(token, bytes):
+            return None
+        try:
+            return json.loads(cls._fernet().decrypt(token, ttl=cls.CACHE_TIMEOUT))
+        except (InvalidToken, ValueError):
+            return None
+
+    @classmethod
+    def get_auth(
+        cls,
+        username: str,
+        password: str,
+        encrypt: bool = True,
+        force_login: bool = False,
+    ) -> InsperAuth:
+        """
+        Obtém uma sessão autenticada, restaurando do cache quando possível.
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha (em texto plano ou já criptografada)
+            encrypt: Se a senha deve ser criptografada
+            force_login: Se deve ignorar o cache e fazer login novamente
+
+        Returns:
+            Instância autenticada do InsperAuth (deve ser fechada por quem chama)
+
+        Raises:
+            InsperAuthError: Se o login falhar
+        """
+        state = None
+        if not force_login:
+            state = cls._decrypt_state(cache.get(cls.get_cache_key(username)))
+        if state:
+            return InsperAuth.from_state(state)
+
+        auth = InsperAuth()
+        if not auth.login(username, password, encrypt=encrypt):
+            auth.session.close()
+            cls.invalidate(username)
+            raise InsperAuthError("Falha na autenticação com o Insper")
+
+        # Os dados acadêmicos entram no cache junto com a sessão
+        auth.get_user_academic_data()
+        cls.store(username, auth)
+
+        return auth
+
+    @classmethod
+    def store(cls, username: str, auth: InsperAuth):
+        """Guarda o estado da sessão autenticada no cache"""
+        cache.set(
+            cls.get_cache_key(username),
+            cls._encrypt_state(auth.export_state()),
+            cls.CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate(cls, username: str):
+        """Remove a sessão de um usuário do cache (ex: logout, senha recusada)"""
+        cache.delete(cls.get_cache_key(username))
+
+    @classmethod
+    async def ainvalidate(cls, username: str):
+        """Versão assíncrona de invalidate"""
+        await cache.adelete(cls.get_cache_key(username))
+
+    @classmethod
+    def run(
+        cls,
+        username: str,
+        password: str,
+        operation: Callable[[InsperAuth], T],
+        encrypt: bool = True,
+    ) -> T:
+        """
+        Executa uma operação com uma sessão autenticada do cache. Se o portal
+        recusar a sessão (401/403), faz login novamente e repete uma vez.
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha (em texto plano ou já criptografada)
+            operation: Função que recebe a sessão autenticada
+            encrypt: Se a senha deve ser criptografada
+
+        Returns:
+            Resultado da operação
+
+        Raises:
+            InsperAuthError: Se o login falhar
+            InsperSessionExpiredError: Se a sessão for recusada mesmo após novo login
+        """
+        for attempt in range(2):
+            with cls.get_auth(
+                username, password, encrypt=encrypt, force_login=attempt > 0
+            ) as auth:
+                try:
+                    result = operation(auth)
+                except InsperSessionExpiredError:
+                    cls.invalidate(username)
+                    if attempt > 0:
+                        raise
+                    continue
+
+                # Mantém os cookies mais recentes para a próxima tarefa
+                cls.store(username, auth)
+                return result
+
+        raise InsperSessionExpiredError("Sessão do Insper expirada")
+
+    @classmethod
+    async def aget_auth(
+        cls,
+        username: str,
+        password: str,
+        encrypt: bool = True,
+        force_login: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> AsyncInsperAuth:
+        """
+        Versão assíncrona de get_auth. As sessões ficam no mesmo cache e
+        servem às duas versões.
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha (em texto plano ou já criptografada)
+            encrypt: Se a senha deve ser criptografada
+            force_login: Se deve ignorar o cache e fazer login novamente
+            semaphore: Semáforo que limita as requisições simultâneas ao
+                portal, compartilhado entre sessões (opcional)
+
+        Returns:
+            Instância autenticada do AsyncInsperAuth (deve ser fechada por quem chama)
+
+        Raises:
+            InsperAuthError: Se o login falhar
+        """
+        state = None
+        if not force_login:
+            state = cls._decrypt_state(await cache.aget(cls.get_cache_key(username)))
+        if state:
+            return AsyncInsperAuth.from_state(state, semaphore=semaphore)
+
+        auth = AsyncInsperAuth(semaphore=semaphore)
+        if not await auth.login(username, password, encrypt=encrypt):
+            await auth.session.aclose()
+            await cls.ainvalidate(username)
+            raise InsperAuthError("Falha na autenticação com o Insper")
+
+        await auth.get_user_academic_data()
+        await cls.astore(username, auth)
+
+        return auth
+
+    @classmethod
+    async def astore(cls, username: str, auth: AsyncInsperAuth):
+        """Versão assíncrona de store"""
+        await cache.aset(
+            cls.get_cache_key(username),
+            cls._encrypt_state(auth.export_state()),
+            cls.CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    async def arun(
+        cls,
+        username: str,
+        password: str,
+        operation: Callable[[AsyncInsperAuth], Awaitable[T]],
+        encrypt: bool = True,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> T:
+        """
+        Versão assíncrona de run: executa uma corrotina com uma sessão
+        autenticada do cache, refazendo o login uma vez se a sessão for recusada.
+
+        Args:
+            username: Nome de usuário do Insper
+            password: Senha (em texto plano ou já criptografada)
+            operation: Função assíncrona que recebe a sessão autenticada
+            encrypt: Se a senha deve ser criptografada
+            semaphore: Semáforo compartilhado entre sessões (opcional)
+
+        Returns:
+            Resultado da operação
+
+        Raises:
+            InsperAuthError: Se o login falhar
+            InsperSessionExpiredError: Se a sessão for recusada mesmo após novo login
+        """
+        for attempt in range(2):
+            async with await cls.aget_auth(
+                username,
+                password,
+                encrypt=encrypt,
+                force_login=attempt > 0,
+                semaphore=semaphore,
+            ) as auth:
+                try:
+                    result = await operation(auth)
+                except InsperSessionExpiredError:
+                    await cls.ainvalidate(username)
+                    if attempt > 0:
+                        raise
+                    continue
+
+                await cls.astore(username, auth)
+                return result
+
+        raise InsperSessionExpiredError("Sessão do Insper expirada")
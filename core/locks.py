@@ -0,0 +1,92 @@
+"""
+Locks distribuídos sobre o cache de coordenação
+"""
+
+import uuid
+
+from django.core.cache import caches
+
+
+class CacheLock:
+    """
+    Lock exclusivo com expiração, guardado no cache de coordenação (Redis em
+    produção) para valer entre processos e workers. A aquisição usa `add`,
+    que só grava se a chave não existir; a expiração libera o lock caso o
+    processo que o detém morra sem soltá-lo.
+    """
+
+    CACHE_ALIAS = "coordination"
+    CACHE_KEY_PREFIX = "lock"
+
+    def __init__(self, name: str, timeout: int = 1800):
+        """
+        Inicializa o lock
+
+        Args:
+            name: Nome do recurso protegido (ex: "sync:user:42")
+            timeout: Segundos até o lock expirar sozinho
+        """
+        self.name = name
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+
+    @property
+    def cache(self):
+        return caches[self.CACHE_ALIAS]
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.CACHE_KEY_PREFIX}:{self.name}"
+
+    def acquire(self) -> bool:
+        """
+        Tenta obter o lock sem esperar
+
+        Returns:
+            True se o lock foi obtido
+        """
+        self.acquired = self.cache.add(self.cache_key, self.token, timeout=self.timeout)
+        return self.acquired
+
+    async def aacquire(self) -> bool:
+        """Versão assíncrona de acquire"""
+        self.acquired = await self.cache.aadd(
+            self.cache_key, self.token, timeout=self.timeout
+        )
+        return self.acquired
+
+    def extend(self) -> bool:
+        """
+        Renova a expiração de um lock que ainda pertence a este processo
+
+        Returns:
+            True se o lock foi renovado
+        """
+        if self.cache.get(self.cache_key) != self.token:
+            self.acquired = False
+            return False
+        return self.cache.touch(self.cache_key, timeout=self.timeout)
+
+    def release(self) -> None:
+        """Solta o lock, se ainda pertencer a este processo"""
+        # Não remove o lock de outro processo caso o nosso já tenha expirado
+        if self.acquired and self.cache.get(self.cache_key) == self.token:
+            self.cache.delete(self.cache_key)
+        self.acquired = False
+
+    async def arelease(self) -> None:
+        """Versão assíncrona de release"""
+        if self.acquired and await self.cache.aget(self.cache_key) == self.token:
+            await self.cache.adelete(self.cache_key)
+        self.acquired = False
+
+    def is_locked(self) -> bool:
+        """Se algum processo detém o lock"""
+        return self.cache.get(self.cache_key) is not None
+
+    def __enter__(self) -> "CacheLock":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
@@ -0,0 +1,394 @@
+"""
+Métricas no formato de exposição do Prometheus. Cada processo (servidor web e
+workers) acumula suas observações em memória e as envia periodicamente, em
+uma única escrita em pipeline, para hashes no Redis de coordenação
+(COORDINATION_CACHE_URL), onde as de todos os processos são somadas. Sem
+Redis as métricas ficam desativadas.
+"""
+
+import abc
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from django.conf import settings
+from django.core import checks
+
+logger = logging.getLogger(__name__)
+
+# Limites padrão dos buckets dos histogramas de duração, em segundos
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Intervalo entre os envios das observações acumuladas ao Redis, em segundos
+FLUSH_INTERVAL = 10
+
+KEY_PREFIX = "metrics"
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+# Métricas expostas por render_metrics (cada métrica se registra ao ser criada)
+REGISTRY: List["Metric"] = []
+
+
+def metrics_enabled() -> bool:
+    """As métricas só são coletadas com o Redis de coordenação configurado"""
+    return bool(settings.COORDINATION_CACHE_URL)
+
+
+def check_metrics_backend(app_configs, **kwargs) -> List[checks.CheckMessage]:
+    """
+    Recusa METRICS_TOKEN sem o Redis de coordenação: o Prometheus coletaria
+    um /metrics/ sempre indisponível
+    """
+    if settings.METRICS_TOKEN and not metrics_enabled():
+        return [
+            checks.Error(
+                "METRICS_TOKEN está definido, mas as métricas exigem o Redis de "
+                "coordenação.",
+                hint="Configure COORDINATION_CACHE_URL ou remova METRICS_TOKEN.",
+                id="core.E001",
+            )
+        ]
+    return []
+
+
+_client: Optional[redis.Redis] = None
+_client_pid: Optional[int] = None
+
+
+def get_client() -> redis.Redis:
+    """Cliente do Redis de coordenação (um por processo)"""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        _client = redis.Redis.from_url(
+            settings.COORDINATION_CACHE_URL, socket_timeout=2, socket_connect_timeout=2
+        )
+        _client_pid = os.getpid()
+    return _client
+
+
+class Metric(abc.ABC):
+    """
+    Métrica com rótulos. Cada combinação de valores dos rótulos (série) é um
+    campo do hash da métrica no Redis (ver _field); os incrementos ficam em
+    memória até o próximo flush.
+    """
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Inicializa a métrica e a adiciona ao registro exposto por render_metrics
+
+        Args:
+            name: Nome da métrica (ex: "insper_sync_upstream_requests_total")
+            documentation: Descrição exibida no HELP
+            labelnames: Nomes dos rótulos
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Incrementos ainda não enviados, por campo do hash
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    @property
+    def key(self) -> str:
+        return f"{KEY_PREFIX}:{self.name}"
+
+    def _labels(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Rótulos de {self.name} devem ser {', '.join(self.labelnames)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @staticmethod
+    def _field(values: Labels, part: str = "") -> str:
+        """Campo do hash: valores dos rótulos e, nos histogramas, a parte"""
+        return json.dumps([part, *values])
+
+    @staticmethod
+    def _parse_field(field: bytes) -> Tuple[str, Labels]:
+        part, *values = json.loads(field)
+        return part, tuple(values)
+
+    def _add(self, increments: Dict[str, float]) -> None:
+        """Acumula incrementos em memória até o próximo flush"""
+        if not metrics_enabled():
+            return
+        with self._lock:
+            for field, amount in increments.items():
+                self._pending[field] = self._pending.get(field, 0) + amount
+        _ensure_flusher()
+
+    def _take_pending(self) -> Dict[str, float]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _stored(self) -> Dict[Tuple[str, Labels], float]:
+        """Valores somados de todos os processos, por (parte, rótulos)"""
+        stored = {}
+        for field, value in get_client().hgetall(self.key).items():
+            value = float(value)
+            stored[self._parse_field(field)] = (
+                int(value) if value.is_integer() else value
+            )
+        return stored
+
+    def _label_dict(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    @abc.abstractmethod
+    def samples(self) -> List[Sample]:
+        """
+        Valores atuais de todas as séries
+
+        Returns:
+            Lista de tuplas (nome, rótulos, valor)
+        """
+
+
+class Counter(Metric):
+    """Contador que só aumenta"""
+
+    TYPE = "counter"
+
+    def inc(self, amount: int = 1, **labels: str) -> None:
+        """
+        Incrementa o contador
+
+        Args:
+            amount: Valor a somar
+            **labels: Valores dos rótulos
+        """
+        self._add({self._field(self._labels(labels)): amount})
+
+    def samples(self) -> List[Sample]:
+        return [
+            (self.name, self._label_dict(values), value)
+            for (_, values), value in sorted(self._stored().items())
+        ]
+
+
+class Histogram(Metric):
+    """Histograma com buckets fixos (ex: durações)"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Inicializa o histograma
+
+        Args:
+            name: Nome da métrica (ex: "insper_sync_duration_seconds")
+            documentation: Descrição exibida no HELP
+            labelnames: Nomes dos rótulos
+            buckets: Limites superiores dos buckets, em ordem crescente
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Registra uma observação
+
+        Args:
+            value: Valor observado
+            **labels: Valores dos rótulos
+        """
+        values = self._labels(labels)
+        # Cada observação conta só no primeiro bucket que a comporta; os
+        # valores acumulados do formato do Prometheus são somados na exposição
+        bucket = next(
+            (i for i, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        self._add(
+            {
+                self._field(values, f"bucket:{bucket}"): 1,
+                self._field(values, "count"): 1,
+                self._field(values, "sum"): value,
+            }
+        )
+
+    def samples(self) -> List[Sample]:
+        stored = self._stored()
+        bounds = [*self.buckets, math.inf]
+
+        samples = []
+        for values in sorted({values for _, values in stored}):
+            labels = self._label_dict(values)
+            cumulative = 0
+            for i, bound in enumerate(bounds):
+                cumulative += stored.get((f"bucket:{i}", values), 0)
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        {**labels, "le": _format_value(bound)},
+                        cumulative,
+                    )
+                )
+            samples.append(
+                (f"{self.name}_count", labels, stored.get(("count", values), 0))
+            )
+            samples.append((f"{self.name}_sum", labels, stored.get(("sum", values), 0)))
+        return samples
+
+
+class CallbackGauge(Metric):
+    """
+    Valor medido no momento da exposição (ex: tamanho de uma fila), sem nada
+    guardado no Redis
+    """
+
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+        labelnames: Sequence[str] = (),
+    ):
+        """
+        Inicializa o gauge
+
+        Args:
+            name: Nome da métrica
+            documentation: Descrição exibida no HELP
+            callback: Função que devolve tuplas (rótulos, valor)
+            labelnames: Nomes dos rótulos
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, labels, value) for labels, value in self.callback()]
+
+
+def flush() -> None:
+    """
+    Envia ao Redis, em uma única escrita em pipeline, as observações
+    acumuladas neste processo. Se o envio falhar, elas voltam a ser acumuladas
+    para o próximo flush.
+    """
+    pending = [(metric, metric._take_pending()) for metric in REGISTRY]
+    pending = [(metric, increments) for metric, increments in pending if increments]
+    if not pending:
+        return
+
+    pipeline = get_client().pipeline(transaction=False)
+    for metric, increments in pending:
+        for field, amount in increments.items():
+            if isinstance(amount, int):
+                pipeline.hincrby(metric.key, field, amount)
+            else:
+                pipeline.hincrbyfloat(metric.key, field, amount)
+    try:
+        pipeline.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Erro ao enviar métricas ao Redis: {str(e)}")
+        for metric, increments in pending:
+            metric._add(increments)
+
+
+_flusher_pid: Optional[int] = None
+_flusher_lock = threading.Lock()
+
+
+def _ensure_flusher() -> None:
+    """
+    Inicia a thread que chama flush a cada FLUSH_INTERVAL, uma por processo
+    (os workers do Celery são criados por fork, que não copia threads)
+    """
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        threading.Thread(
+            target=_flush_forever, name="metrics-flush", daemon=True
+        ).start()
+
+
+def _flush_forever() -> None:
+    stop = threading.Event()
+    while not stop.wait(FLUSH_INTERVAL):
+        try:
+            flush()
+        except Exception as e:
+            # A thread não pode morrer; tenta de novo no próximo intervalo
+            logger.warning(f"Erro ao enviar métricas ao Redis: {str(e)}")
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if metrics_enabled() and _flusher_pid == os.getpid():
+        flush()
+
+
+def render_metrics(metrics: Optional[Iterable[Metric]] = None) -> str:
+    """
+    Gera o texto no formato de exposição do Prometheus (versão 0.0.4)
+
+    Args:
+        metrics: Métricas a expor (padrão: todas as registradas)
+
+    Returns:
+        Texto da exposição
+    """
+    lines = []
+    for metric in REGISTRY if metrics is None else metrics:
+        try:
+            samples = metric.samples()
+        except Exception as e:
+            # Uma métrica indisponível (ex: broker fora do ar) não derruba as
+            # demais
+            logger.warning(f"Erro ao coletar métrica {metric.name}: {str(e)}")
+            continue
+
+        lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+        for name, labels, value in samples:
+            if labels:
+                rendered = ",".join(
+                    f'{key}="{_escape_label(value)}"' for key, value in labels.items()
+                )
+                lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value)) if not isinstance(value, float) else f"{value:.1f}"
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return _escape_help(str(value)).replace('"', r"\"")
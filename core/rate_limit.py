@@ -0,0 +1,327 @@
+"""
+Limitador de requisições compartilhado entre processos e workers
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional, Sequence, Tuple
+
+from django.core.cache import caches
+
+from .locks import CacheLock
+
+
+class RateLimitTimeout(Exception):
+    """Os limitadores não liberaram a requisição dentro da espera máxima"""
+
+    pass
+
+
+# Estado de um balde: (fichas disponíveis, instante da última atualização)
+BucketState = Tuple[float, float]
+
+
+class RateLimiter:
+    """
+    Balde de fichas (token bucket) compartilhado entre processos e workers. O
+    balde comporta `burst` fichas e é reabastecido continuamente a
+    (limit - burst) / period fichas por segundo, então em qualquer intervalo
+    de `period` segundos passam no máximo `limit` requisições (a rajada
+    inicial mais o reabastecimento), sem o pico de até 2× o limite na virada
+    de uma janela fixa.
+
+    O estado do balde fica no cache de coordenação (Redis em produção) e é
+    lido e gravado sob um CacheLock curto, para que workers consumindo ao
+    mesmo tempo não sobrescrevam uns aos outros.
+    """
+
+    CACHE_ALIAS = "coordination"
+    CACHE_KEY_PREFIX = "rate_limit"
+    # Expiração do lock do estado, caso o processo morra segurando-o
+    LOCK_TIMEOUT = 5
+    # Tempo máximo esperando o lock do estado antes de tratar como recusa
+    LOCK_WAIT = 1.0
+    LOCK_POLL_INTERVAL = 0.005
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        period: float = 60.0,
+        burst: Optional[int] = None,
+    ):
+        """
+        Inicializa o limitador
+
+        Args:
+            name: Nome do escopo limitado (ex: "google:project", "google:user:42")
+            limit: Máximo de fichas em qualquer intervalo de `period` segundos
+            period: Duração do intervalo em segundos
+            burst: Capacidade do balde, ou seja, quantas fichas podem ser
+                consumidas de uma vez (padrão e máximo: metade do limite)
+        """
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.burst = max(min(burst or limit // 2, limit // 2), 1)
+        self.rate = max(limit - self.burst, 1) / period
+
+    @property
+    def cache(self):
+        return caches[self.CACHE_ALIAS]
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.CACHE_KEY_PREFIX}:{self.name}"
+
+    def _lock(self) -> CacheLock:
+        return CacheLock(self.cache_key, timeout=self.LOCK_TIMEOUT)
+
+    def _tokens(self, state: Optional[BucketState], now: float) -> float:
+        """Fichas no balde em `now`, contando o reabastecimento"""
+        if state is None:
+            return float(self.burst)
+        tokens, updated_at = state
+        return min(self.burst, tokens + max(now - updated_at, 0) * self.rate)
+
+    def _cost(self, cost: int) -> int:
+        # Um pedido maior que o balde consome o balde cheio
+        return min(cost, self.burst)
+
+    def _take(
+        self, state: Optional[BucketState], cost: int
+    ) -> Tuple[BucketState, bool]:
+        """
+        Novo estado do balde após tentar consumir `cost` fichas
+
+        Returns:
+            Tupla (estado, se as fichas foram consumidas)
+        """
+        now = time.time()
+        tokens = self._tokens(state, now)
+        if tokens >= self._cost(cost):
+            return (tokens - self._cost(cost), now), True
+        return (tokens, now), False
+
+    def _give_back(self, state: Optional[BucketState], cost: int) -> BucketState:
+        now = time.time()
+        return min(self.burst, self._tokens(state, now) + self._cost(cost)), now
+
+    @property
+    def _state_timeout(self) -> int:
+        # Depois disso o balde estaria cheio de qualquer forma
+        return int(self.burst / self.rate) + 1
+
+    def try_acquire(self, cost: int = 1) -> bool:
+        """
+        Tenta consumir fichas sem esperar. Se não houver fichas suficientes,
+        nada é consumido.
+
+        Args:
+            cost: Quantidade de fichas (requisições) a consumir
+
+        Returns:
+            True se havia fichas suficientes
+        """
+        lock = self._lock()
+        if not _wait_for_lock(lock, self.LOCK_WAIT, self.LOCK_POLL_INTERVAL):
+            return False
+        with lock:
+            state, acquired = self._take(self.cache.get(self.cache_key), cost)
+            self.cache.set(self.cache_key, state, timeout=self._state_timeout)
+        return acquired
+
+    async def atry_acquire(self, cost: int = 1) -> bool:
+        """Versão assíncrona de try_acquire"""
+        lock = self._lock()
+        if not await _await_lock(lock, self.LOCK_WAIT, self.LOCK_POLL_INTERVAL):
+            return False
+        try:
+            state, acquired = self._take(await self.cache.aget(self.cache_key), cost)
+            await self.cache.aset(self.cache_key, state, timeout=self._state_timeout)
+        finally:
+            await lock.arelease()
+        return acquired
+
+    def release(self, cost: int) -> None:
+        """
+        Devolve fichas consumidas e não usadas
+
+        Args:
+            cost: Quantidade de fichas a devolver
+        """
+        lock = self._lock()
+        if not _wait_for_lock(lock, self.LOCK_WAIT, self.LOCK_POLL_INTERVAL):
+            # As fichas voltam sozinhas com o reabastecimento
+            return
+        with lock:
+            state = self._give_back(self.cache.get(self.cache_key), cost)
+            self.cache.set(self.cache_key, state, timeout=self._state_timeout)
+
+    async def arelease(self, cost: int) -> None:
+        """Versão assíncrona de release"""
+        lock = self._lock()
+        if not await _await_lock(lock, self.LOCK_WAIT, self.LOCK_POLL_INTERVAL):
+            return
+        try:
+            state = self._give_back(await self.cache.aget(self.cache_key), cost)
+            await self.cache.aset(self.cache_key, state, timeout=self._state_timeout)
+        finally:
+            await lock.arelease()
+
+    def remaining(self) -> int:
+        """Fichas disponíveis agora"""
+        return int(self._tokens(self.cache.get(self.cache_key), time.time()))
+
+    def seconds_until_available(self, cost: int = 1) -> float:
+        """Segundos até o balde ter `cost` fichas (sem contar outros consumos)"""
+        tokens = self._tokens(self.cache.get(self.cache_key), time.time())
+        return max(self._cost(cost) - tokens, 0) / self.rate
+
+
+# Fração do período usada como jitter máximo ao esperar por fichas, para os
+# workers em espera não voltarem todos no mesmo instante
+WAIT_JITTER_FRACTION = 0.02
+# Espera mínima entre tentativas (ex: lock do estado ocupado)
+MIN_WAIT = 0.05
+
+
+def _wait_delay(refused: RateLimiter, cost: int) -> float:
+    delay = max(refused.seconds_until_available(cost), MIN_WAIT)
+    return delay + random.uniform(0, refused.period * WAIT_JITTER_FRACTION)
+
+
+def wait_for_budget(
+    limiters: Sequence[RateLimiter], cost: int = 1, max_wait: float = 300.0
+) -> bool:
+    """
+    Espera até conseguir fichas em todos os limitadores ao mesmo tempo. As
+    fichas só ficam consumidas quando todos liberam: se um recusa, as já
+    obtidas nos demais são devolvidas antes de esperar.
+
+    Args:
+        limiters: Limitadores que precisam liberar a requisição
+        cost: Quantidade de fichas a consumir em cada um
+        max_wait: Tempo máximo de espera em segundos
+
+    Returns:
+        True se conseguiu as fichas, False se o tempo de espera esgotou
+    """
+    deadline = time.monotonic() + max_wait
+
+    while True:
+        refused = _acquire_all(limiters, cost)
+        if refused is None:
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(_wait_delay(refused, cost), remaining))
+
+
+async def wait_for_budget_async(
+    limiters: Sequence[RateLimiter], cost: int = 1, max_wait: float = 300.0
+) -> bool:
+    """
+    Versão assíncrona de wait_for_budget: o cache é acessado pelos métodos
+    assíncronos e a espera não bloqueia o event loop
+
+    Args:
+        limiters: Limitadores que precisam liberar a requisição
+        cost: Quantidade de fichas a consumir em cada um
+        max_wait: Tempo máximo de espera em segundos
+
+    Returns:
+        True se conseguiu as fichas, False se o tempo de espera esgotou
+    """
+    deadline = time.monotonic() + max_wait
+
+    while True:
+        refused = await _aacquire_all(limiters, cost)
+        if refused is None:
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # seconds_until_available lê o cache; a leitura vai para uma thread
+        delay = await asyncio.to_thread(_wait_delay, refused, cost)
+        await asyncio.sleep(min(delay, remaining))
+
+
+def _acquire_all(limiters: Sequence[RateLimiter], cost: int) -> Optional[RateLimiter]:
+    """
+    Consome fichas em todos os limitadores ou em nenhum
+
+    Returns:
+        O limitador que recusou, ou None se todos liberaram
+    """
+    acquired = []
+    for limiter in limiters:
+        if not limiter.try_acquire(cost):
+            for taken in acquired:
+                taken.release(cost)
+            return limiter
+        acquired.append(limiter)
+    return None
+
+
+async def _aacquire_all(
+    limiters: Sequence[RateLimiter], cost: int
+) -> Optional[RateLimiter]:
+    """Versão assíncrona de _acquire_all"""
+    acquired = []
+    for limiter in limiters:
+        if not await limiter.atry_acquire(cost):
+            for taken in acquired:
+                await taken.arelease(cost)
+            return limiter
+        acquired.append(limiter)
+    return None
+
+
+def _wait_for_lock(lock: CacheLock, max_wait: float, poll_interval: float) -> bool:
+    """Tenta obter o lock por até `max_wait` segundos"""
+    deadline = time.monotonic() + max_wait
+    while not lock.acquire():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval * random.uniform(1, 2))
+    return True
+
+
+async def _await_lock(lock: CacheLock, max_wait: float, poll_interval: float) -> bool:
+    """Versão assíncrona de _wait_for_lock"""
+    deadline = time.monotonic() + max_wait
+    while not await lock.aacquire():
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(poll_interval * random.uniform(1, 2))
+    return True
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = 1.0,
+    max_delay: float = 32.0,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Calcula a espera antes de uma nova tentativa: backoff exponencial com
+    jitter, respeitando o Retry-After informado pelo servidor
+
+    Args:
+        attempt: Número da tentativa que falhou (começando em 0)
+        base_delay: Espera base em segundos
+        max_delay: Espera máxima em segundos
+        retry_after: Espera pedida pelo servidor, se houver
+
+    Returns:
+        Segundos a esperar
+    """
+    delay = min(base_delay * (2**attempt), max_delay) + random.uniform(0, 1)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
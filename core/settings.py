@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -106,6 +107,11 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.environ.get("DATABASE_PATH", BASE_DIR / "db.sqlite3"),
+        # Web e workers gravam ao mesmo tempo: as transações pedem o lock de
+        # escrita já no início (uma transação que lê e depois grava não
+        # consegue promover o lock e falharia na hora com "database is
+        # locked") e esperam até `timeout` segundos pelo lock ocupado
+        "OPTIONS": {"timeout": 20, "transaction_mode": "IMMEDIATE"},
     }
 }
 
@@ -115,9 +121,23 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
         "LOCATION": str(BASE_DIR / "cache"),
-    }
+    },
 }
 
+# Cache compartilhado entre web e workers para coordenação (limites de
+# requisições, travas). Em produção deve apontar para o Redis.
+COORDINATION_CACHE_URL = os.getenv("COORDINATION_CACHE_URL", "")
+if COORDINATION_CACHE_URL:
+    CACHES["coordination"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": COORDINATION_CACHE_URL,
+    }
+else:
+    CACHES["coordination"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(BASE_DIR / "cache" / "coordination"),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -190,6 +210,39 @@ CELERY_TIMEZONE = "America/Sao_Paulo"
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
+# Intervalo entre execuções do agendador de sincronizações (sync_all_users).
+# As tasks dos usuários devidos são distribuídas ao longo desse intervalo.
+SYNC_SCHEDULER_INTERVAL_MINUTES = int(
+    os.getenv("SYNC_SCHEDULER_INTERVAL_MINUTES", "60")
+)
+
+# Sessões de sincronização em execução sem heartbeat há mais que isso são
+# consideradas abandonadas (worker interrompido) e marcadas como falhas
+SYNC_HEARTBEAT_TIMEOUT_MINUTES = int(os.getenv("SYNC_HEARTBEAT_TIMEOUT_MINUTES", "15"))
+
+CELERY_BEAT_SCHEDULE = {
+    "sync-due-users": {
+        "task": "sync.tasks.sync_all_users",
+        "schedule": timedelta(minutes=SYNC_SCHEDULER_INTERVAL_MINUTES),
+    },
+    "reap-stale-sync-sessions": {
+        "task": "sync.tasks.reap_stale_sync_sessions",
+        "schedule": timedelta(minutes=5),
+    },
+    "retry-failed-events": {
+        "task": "sync.tasks.retry_failed_events",
+        "schedule": timedelta(minutes=5),
+    },
+    "cleanup-old-sync-sessions": {
+        "task": "sync.tasks.cleanup_old_sync_sessions",
+        "schedule": timedelta(days=1),
+    },
+}
+
+# Token aceito pelo endpoint /metrics/ (Prometheus), enviado no cabeçalho
+# "Authorization: Bearer <token>". Sem ele, só administradores logados acessam.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Google Calendar API Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -197,6 +250,15 @@ GOOGLE_REDIRECT_URI = (
     f"http{'' if 'localhost' in DOMAIN else 's'}://{DOMAIN}/accounts/google-callback/"
 )
 
+# Limites de requisições à Google Calendar API por minuto, compartilhados
+# entre todos os workers (abaixo das quotas padrão do projeto e por usuário)
+GOOGLE_CALENDAR_PROJECT_REQUESTS_PER_MINUTE = int(
+    os.getenv("GOOGLE_CALENDAR_PROJECT_REQUESTS_PER_MINUTE", "10000")
+)
+GOOGLE_CALENDAR_USER_REQUESTS_PER_MINUTE = int(
+    os.getenv("GOOGLE_CALENDAR_USER_REQUESTS_PER_MINUTE", "500")
+)
+
 # Google Calendar API Scopes
 GOOGLE_CALENDAR_SCOPES = [
     "https://www.googleapis.com/auth/calendar",
@@ -25,6 +25,7 @@ urlpatterns = [
     path("", views.home, name="home"),
     path("dashboard/", views.dashboard, name="dashboard"),
     path("terms/", views.terms_of_use, name="terms"),
+    path("metrics/", views.metrics, name="metrics"),
     path("accounts/", include("accounts.urls")),
     path("sync/", include("sync.urls")),
 ]
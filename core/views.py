@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse
 from django.shortcuts import redirect, render
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .monitoring import metrics_enabled, render_metrics
 
 
 def home(request):
@@ -13,6 +19,28 @@ def terms_of_use(request):
     return render(request, "terms_of_use.html")
 
 
+@require_GET
+def metrics(request):
+    """Métricas para o Prometheus (requisições externas, sincronizações e filas)"""
+    authorization = request.headers.get("Authorization", "")
+    authorized = request.user.is_staff or (
+        settings.METRICS_TOKEN
+        and constant_time_compare(authorization, f"Bearer {settings.METRICS_TOKEN}")
+    )
+    if not authorized:
+        return HttpResponse(status=403)
+    if not metrics_enabled():
+        return HttpResponse(
+            "Métricas desativadas: configure COORDINATION_CACHE_URL (Redis)",
+            status=503,
+            content_type="text/plain; charset=utf-8",
+        )
+
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @login_required
 def dashboard(request):
     """Dashboard do usuário"""
@@ -2,5 +2,15 @@ from django.apps import AppConfig
 
 
 class SyncConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'sync'
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "sync"
+
+    def ready(self):
+        from django.core import checks
+
+        from core.monitoring import check_metrics_backend
+
+        # Registra as métricas do Prometheus da sincronização (ver core.monitoring)
+        from . import metrics  # noqa: F401
+
+        checks.register(check_metrics_backend)
@@ -0,0 +1,16 @@
+"""
+Benchmark offline da sincronização, com servidores falsos do portal do
+Insper e da Google Calendar API (ver o comando benchmark_sync)
+"""
+
+from .runner import BenchmarkConfig, isolated_environment, run_benchmark
+from .servers import FakeGoogleCalendar, FakeInsperPortal, FakeUpstreams
+
+__all__ = [
+    "BenchmarkConfig",
+    "isolated_environment",
+    "run_benchmark",
+    "FakeGoogleCalendar",
+    "FakeInsperPortal",
+    "FakeUpstreams",
+]
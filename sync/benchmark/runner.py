@@ -0,0 +1,273 @@
+"""
+Benchmark da sincronização de ponta a ponta: executa sync_user_calendar para
+usuários sintéticos contra os servidores falsos e mede tempo, requisições e
+consultas ao banco
+"""
+
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.db import connection
+from django.test.utils import override_settings
+
+from accounts.models import User
+from core.http import collect_requests, override_transport
+
+from ..metrics import percentile
+from ..models import SyncSession
+from ..tasks import sync_user_calendar
+from .servers import FakeGoogleCalendar, FakeInsperPortal, FakeUpstreams
+
+# Caches separados para o benchmark: locks, limitadores e sessões do Insper
+# não se misturam com os do ambiente real
+BENCHMARK_CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": f"benchmark-{alias}",
+    }
+    for alias in ("default", "coordination")
+}
+
+
+@dataclass
+class BenchmarkConfig:
+    """Parâmetros de um benchmark"""
+
+    users: int = 10
+    months: int = 4
+    events_per_month: int = 40
+    existing_events: int = 0
+    runs: int = 2
+    change_rate: float = 0.1
+    concurrency: int = 1
+    latency: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+@contextmanager
+def isolated_environment() -> Iterator[None]:
+    """
+    Executa o bloco em um banco de dados de teste descartável e com caches
+    em memória, sem tocar nos dados, nos locks nem nas métricas do ambiente
+    configurado
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_test_name = test_settings.get("NAME")
+    with tempfile.TemporaryDirectory() as directory:
+        # O SQLite em memória compartilhado entre threads trava tabelas
+        # inteiras; em arquivo valem as OPTIONS do banco configurado (espera
+        # pelo lock de escrita), como nos workers em produção
+        if connection.vendor == "sqlite" and not previous_test_name:
+            test_settings["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, COORDINATION_CACHE_URL=""):
+                yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings["NAME"] = previous_test_name
+
+
+def run_benchmark(config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    Sincroniza `config.users` usuários sintéticos `config.runs` vezes. A
+    primeira execução cria todos os eventos; antes de cada execução seguinte
+    uma fração `config.change_rate` dos eventos muda no portal.
+
+    Args:
+        config: Parâmetros do benchmark
+
+    Returns:
+        Relatório com a configuração, as estatísticas de cada execução
+        (ver _summarize_run) e as requisições recebidas por rota em cada
+        servidor falso
+    """
+    insper = FakeInsperPortal(
+        events_per_month=config.events_per_month,
+        latency=config.latency,
+        error_rate=config.error_rate,
+        seed=config.seed,
+    )
+    google = FakeGoogleCalendar(
+        existing_events=config.existing_events,
+        latency=config.latency,
+        error_rate=config.error_rate,
+        seed=config.seed + 1,
+    )
+    users = create_benchmark_users(config.users)
+    start_date, end_date = _sync_range(config.months)
+
+    runs = []
+    with override_transport(FakeUpstreams(insper, google).transport()):
+        for run in range(1, config.runs + 1):
+            if run > 1:
+                insper.publish_changes(config.change_rate)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=config.concurrency) as executor:
+                results = list(
+                    executor.map(
+                        lambda user: _sync_user(user, start_date, end_date), users
+                    )
+                )
+            wall_seconds = time.perf_counter() - started
+
+            runs.append(_summarize_run(run, results, wall_seconds))
+
+    return {
+        "config": asdict(config),
+        "runs": runs,
+        "google_events": google.event_count(),
+        "server_requests": {"insper": insper.requests, "google": google.requests},
+    }
+
+
+def create_benchmark_users(count: int) -> List[User]:
+    """
+    Cria usuários prontos para sincronizar, cada um com sua conta no Google
+    falso
+
+    Args:
+        count: Quantidade de usuários
+
+    Returns:
+        Usuários criados
+    """
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+    return [
+        User.objects.create(
+            email=f"benchmark{index}@al.insper.edu.br",
+            is_active=True,
+            email_verified=True,
+            credentials_configured=True,
+            google_connected=True,
+            insper_username=f"benchmark{index}",
+            insper_enc_password="benchmark",
+            google_access_token=f"benchmark-token-{index}",
+            google_refresh_token=f"benchmark-refresh-{index}",
+            google_token_expires_at=expires_at,
+        )
+        for index in range(count)
+    ]
+
+
+def _sync_range(months: int) -> Tuple[str, str]:
+    start = date.today().replace(day=1)
+    end = start + timedelta(days=31 * months)
+    return start.isoformat(), end.replace(day=1).isoformat()
+
+
+def _sync_user(user: User, start_date: str, end_date: str) -> Dict[str, Any]:
+    """
+    Executa uma sincronização completa do usuário, como o worker faria
+
+    Args:
+        user: Usuário
+        start_date: Data inicial (YYYY-MM-DD)
+        end_date: Data final (YYYY-MM-DD)
+
+    Returns:
+        Tempo, consultas ao banco, requisições por serviço e resultado da sessão
+    """
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    try:
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_query), collect_requests() as requests:
+            sync_user_calendar.apply(args=[user.pk, start_date, end_date]).get()
+        seconds = time.perf_counter() - started
+
+        session = SyncSession.objects.filter(user=user).order_by("-started_at").first()
+        return {
+            "seconds": seconds,
+            "db_queries": queries,
+            "http": requests.as_dict(),
+            "status": session.status if session else "failed",
+            "created": session.events_created if session else 0,
+            "updated": session.events_updated if session else 0,
+            "deleted": session.events_deleted if session else 0,
+            "failed": session.events_failed if session else 0,
+        }
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def _summarize_run(
+    run: int, results: List[Dict[str, Any]], wall_seconds: float
+) -> Dict[str, Any]:
+    """
+    Estatísticas de uma execução do benchmark
+
+    Args:
+        run: Número da execução
+        results: Resultados de _sync_user
+        wall_seconds: Duração total da execução
+
+    Returns:
+        Dicionário com vazão (usuários por minuto), tempo por sincronização
+        (p50, p95, máximo), requisições e consultas médias por usuário e
+        totais de eventos. Se alguma sincronização falhou, "valid" é False e
+        vazão e tempos ficam None: não medem a sincronização completa.
+    """
+    seconds = [result["seconds"] for result in results]
+    queries = [result["db_queries"] for result in results]
+
+    requests_per_user: Dict[str, float] = {}
+    for result in results:
+        for upstream, stats in result["http"].items():
+            requests_per_user[upstream] = (
+                requests_per_user.get(upstream, 0) + stats["requests"]
+            )
+
+    completed = sum(1 for result in results if result["status"] == "completed")
+    valid = completed == len(results)
+
+    return {
+        "run": run,
+        "users": len(results),
+        "completed": completed,
+        "valid": valid,
+        "wall_seconds": round(wall_seconds, 3) if valid else None,
+        "users_per_minute": (
+            round(len(results) / wall_seconds * 60, 1) if valid else None
+        ),
+        "sync_seconds": (
+            {
+                "p50": round(percentile(seconds, 50), 3),
+                "p95": round(percentile(seconds, 95), 3),
+                "max": round(max(seconds), 3),
+            }
+            if valid
+            else None
+        ),
+        "requests_per_user": {
+            upstream: round(total / len(results), 1)
+            for upstream, total in sorted(requests_per_user.items())
+        },
+        "db_queries_per_user": {
+            "mean": round(statistics.fmean(queries), 1),
+            "p95": percentile(queries, 95),
+        },
+        "events": {
+            key: sum(result[key] for result in results)
+            for key in ("created", "updated", "deleted", "failed")
+        },
+    }
@@ -0,0 +1,578 @@
+"""
+Servidores falsos do portal do Insper (SGA) e da Google Calendar API v3,
+servidos em memória por um httpx.MockTransport
+"""
+
+import base64
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# (status HTTP, corpo JSON opcional)
+FakeResponse = Tuple[int, Optional[Any]]
+
+
+class FakeServer:
+    """
+    Base dos servidores falsos: latência fixa por requisição e falhas
+    aleatórias (reproduzíveis pela semente), além da contagem de requisições
+    por rota
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        """
+        Inicializa o servidor
+
+        Args:
+            latency: Segundos de espera antes de cada resposta
+            error_rate: Probabilidade (0 a 1) de uma requisição falhar com erro
+                temporário
+            seed: Semente das falhas aleatórias
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+
+class FakeInsperPortal(FakeServer):
+    """
+    Imita os endpoints do SGA usados pela sincronização: cookies iniciais e
+    login em /AOnline/auth, chave pública, dados acadêmicos e eventos do
+    calendário (paginados, um mês por consulta). Cada usuário tem
+    `events_per_month` eventos por mês, gerados a partir do login.
+    """
+
+    HOST = "sga.insper.edu.br"
+    EVENTS_PATH = re.compile(r"^/AOnline/apix/api/rest/alunos/pessoa/([^/]+)/events$")
+    ACADEMIC_DATA_PATH = re.compile(r"^/AOnline/apix/api/rest/alunos/user/([^/]+)$")
+
+    def __init__(self, events_per_month: int = 40, **kwargs: Any):
+        """
+        Inicializa o portal
+
+        Args:
+            events_per_month: Eventos de cada usuário por mês
+            **kwargs: Latência, taxa de erros e semente (ver FakeServer)
+        """
+        super().__init__(**kwargs)
+        self.events_per_month = events_per_month
+        self.revision = 0
+        self.change_rate = 0.0
+        self._sessions: Dict[str, str] = {}
+        self._session_ids = itertools.count(1)
+        self._public_key_pem: Optional[bytes] = None
+
+    def publish_changes(self, change_rate: float) -> None:
+        """
+        Altera o título de uma fração dos eventos, como se o portal tivesse
+        sido atualizado desde a última sincronização
+
+        Args:
+            change_rate: Fração (0 a 1) dos eventos alterados
+        """
+        self.revision += 1
+        self.change_rate = change_rate
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._wait()
+        path = request.url.path
+
+        if path == "/AOnline/auth":
+            self._count("auth")
+            if request.method == "GET":
+                return httpx.Response(
+                    200, headers={"set-cookie": "JSESSIONID=initial; Path=/"}
+                )
+            return self._login(request)
+
+        if path == "/AOnline/config-properties/public-key":
+            self._count("public_key")
+            return httpx.Response(200, content=self._public_key())
+
+        if path == "/AOnline/":
+            self._count("login_page")
+            return httpx.Response(200, text="<html></html>")
+
+        username = self._session_user(request)
+        if username is None:
+            self._count("unauthorized")
+            return httpx.Response(401)
+
+        if self.ACADEMIC_DATA_PATH.match(path):
+            self._count("academic_data")
+            return httpx.Response(
+                200, json={"content": [self._academic_data(username)]}
+            )
+
+        if self.EVENTS_PATH.match(path):
+            self._count("events")
+            if self._should_fail():
+                return httpx.Response(500, json={"error": "Erro interno"})
+            return httpx.Response(200, json=self._events_page(username, request.url))
+
+        self._count("not_found")
+        return httpx.Response(404)
+
+    def _login(self, request: httpx.Request) -> httpx.Response:
+        form = dict(
+            pair.split("=", 1)
+            for pair in request.content.decode().split("&")
+            if "=" in pair
+        )
+        username = unquote(form.get("username", ""))
+        if not username:
+            return httpx.Response(401)
+
+        with self._lock:
+            token = f"session-{next(self._session_ids)}"
+            self._sessions[token] = username
+
+        user_data = {
+            "id": self._person_id(username),
+            "name": username,
+            "login": username,
+            "senhaAlterada": "N",
+            "roles": "",
+            "root": False,
+            "theme": "",
+        }
+        encoded = base64.b64encode(json.dumps(user_data).encode()).decode()
+        return httpx.Response(
+            200,
+            headers=[
+                ("set-cookie", f"user-data={encoded}; Path=/"),
+                ("set-cookie", f"SESSION={token}; Path=/"),
+            ],
+        )
+
+    def _session_user(self, request: httpx.Request) -> Optional[str]:
+        cookies = request.headers.get("cookie", "")
+        match = re.search(r"SESSION=([^;]+)", cookies)
+        return self._sessions.get(match.group(1)) if match else None
+
+    @staticmethod
+    def _person_id(username: str) -> str:
+        return hashlib.sha1(username.encode()).hexdigest()[:12]
+
+    def _academic_data(self, username: str) -> Dict[str, str]:
+        return {
+            "id": self._person_id(username),
+            "matricula": username,
+            "codAluno": f"A{self._person_id(username)}",
+            "situacaoAluno": "Matriculado",
+            "nomeAluno": username,
+            "codCurso": "ENG",
+            "nomeCurso": "Engenharia",
+            "sexo": "",
+            "turma": "A",
+            "serie": "1",
+            "ano": "2025",
+            "semestre": "1",
+            "descrSemestre": "",
+        }
+
+    def _events_page(self, username: str, url: httpx.URL) -> Dict[str, Any]:
+        month_start = datetime.fromisoformat(url.params["start"][:10])
+        page = int(url.params.get("page", 0))
+        size = int(url.params.get("size", 1000))
+
+        events = [
+            self._event(username, month_start, index)
+            for index in range(self.events_per_month)
+        ]
+        total_pages = max(1, -(-len(events) // size))
+        return {
+            "content": events[page * size : (page + 1) * size],
+            "page": {
+                "totalElements": len(events),
+                "totalPages": total_pages,
+                "number": page,
+                "size": size,
+            },
+        }
+
+    def _event(self, username: str, month_start: datetime, index: int) -> Dict:
+        # Aulas espalhadas pelo mês, das 8h às 17h
+        day = month_start + timedelta(days=(index * 3) % 28, hours=8 + index % 10)
+        start_ms = int(day.timestamp() * 1000)
+        discipline = f"DISC{index % 6:02d}"
+        event_key = f"{username}:{month_start:%Y-%m}:{index}"
+
+        title = f"Aula {index}\n{discipline}"
+        if self.revision and self._changed(event_key):
+            title = f"Aula {index} (revisão {self.revision})\n{discipline}"
+
+        return {
+            "id": None,
+            "title": title,
+            "allDay": False,
+            "startStr": "",
+            "endStr": "",
+            "startDate": start_ms,
+            "endDate": start_ms + 90 * 60 * 1000,
+            "timeZone": "America/Sao_Paulo",
+            "descricao": f"Turma: A | Dependencia: Sala {index % 20}",
+            "icone": "",
+            "eventId": hashlib.sha1(event_key.encode()).hexdigest()[:16],
+            "tipoEvento": "AULA",
+            "hoverInfo": "Docente: Professor",
+            "className": "",
+        }
+
+    def _changed(self, event_key: str) -> bool:
+        digest = hashlib.sha1(f"{event_key}:{self.revision}".encode()).digest()
+        return digest[0] / 256 < self.change_rate
+
+    def _public_key(self) -> bytes:
+        with self._lock:
+            if self._public_key_pem is None:
+                private_key = rsa.generate_private_key(
+                    public_exponent=65537, key_size=2048
+                )
+                self._public_key_pem = private_key.public_key().public_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PublicFormat.SubjectPublicKeyInfo,
+                )
+            return self._public_key_pem
+
+
+class FakeGoogleCalendar(FakeServer):
+    """
+    Imita a Google Calendar API v3 usada pela sincronização: lista e criação
+    de calendários, eventos (listagem paginada e incremental com syncToken,
+    resposta parcial com `fields`, criação com ID fixo, atualização e
+    remoção), chamadas de lote e renovação de token. Cada token de acesso
+    corresponde a uma conta separada.
+    """
+
+    HOSTS = {"www.googleapis.com", "oauth2.googleapis.com"}
+    BATCH_PATH = "/batch/calendar/v3"
+    EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/([^/]+)/events(?:/([^/]+))?$")
+    CALENDAR_PATH = re.compile(r"^/calendar/v3/calendars/([^/]+)$")
+
+    def __init__(self, existing_events: int = 0, **kwargs: Any):
+        """
+        Inicializa a API
+
+        Args:
+            existing_events: Eventos que não são do Insper Sync criados em cada
+                calendário novo (aumentam o volume das listagens)
+            **kwargs: Latência, taxa de erros e semente (ver FakeServer)
+        """
+        super().__init__(**kwargs)
+        self.existing_events = existing_events
+        self._accounts: Dict[str, Dict[str, Dict]] = {}
+        self._calendar_ids = itertools.count(1)
+        self._versions = itertools.count(1)
+        self._event_ids = itertools.count(1)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._wait()
+
+        if request.url.host == "oauth2.googleapis.com":
+            self._count("token")
+            return httpx.Response(
+                200, json={"access_token": "benchmark-token", "expires_in": 3600}
+            )
+
+        account = request.headers.get("authorization", "")
+
+        if request.url.path == self.BATCH_PATH:
+            self._count("batch")
+            return self._batch(account, request)
+
+        self._count(request.method)
+        if self._should_fail():
+            return httpx.Response(503, json=self._error(503, "backendError"))
+
+        body = json.loads(request.content) if request.content else None
+        status, data = self.handle(
+            account, request.method, request.url.path, request.url.params, body
+        )
+        return (
+            httpx.Response(status, json=data)
+            if data is not None
+            else httpx.Response(status)
+        )
+
+    def _batch(self, account: str, request: httpx.Request) -> httpx.Response:
+        boundary = re.search(
+            r"boundary=\"?([^\";]+)\"?", request.headers["content-type"]
+        ).group(1)
+        parts = [
+            part
+            for part in request.content.decode().split(f"--{boundary}")
+            if part.strip() and part.strip() != "--"
+        ]
+
+        responses = []
+        for part in parts:
+            content_id = re.search(r"Content-ID: <item-(\d+)>", part).group(1)
+            sections = re.split(r"\r\n\r\n", part.strip(), maxsplit=2)
+            method, target = re.match(r"(\w+) (\S+) HTTP", sections[1]).groups()
+            body_text = sections[2].strip() if len(sections) > 2 else ""
+
+            if self._should_fail():
+                status, data = 503, self._error(503, "backendError")
+            else:
+                url = httpx.URL(f"https://www.googleapis.com{target}")
+                status, data = self.handle(
+                    account,
+                    method,
+                    url.path,
+                    url.params,
+                    json.loads(body_text) if body_text else None,
+                )
+
+            payload = json.dumps(data) if data is not None else ""
+            responses.append(
+                "--batch_response\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-item-{content_id}>\r\n"
+                "\r\n"
+                f"HTTP/1.1 {status} OK\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n"
+                "\r\n"
+                f"{payload}\r\n"
+            )
+
+        return httpx.Response(
+            200,
+            headers={"content-type": "multipart/mixed; boundary=batch_response"},
+            content="".join(responses) + "--batch_response--\r\n",
+        )
+
+    def handle(
+        self,
+        account: str,
+        method: str,
+        path: str,
+        params: httpx.QueryParams,
+        body: Optional[Dict],
+    ) -> FakeResponse:
+        """
+        Responde a uma requisição à API (direta ou item de um lote)
+
+        Args:
+            account: Cabeçalho Authorization, que identifica a conta
+            method: Método HTTP
+            path: Caminho da URL
+            params: Parâmetros da URL
+            body: Corpo JSON, se houver
+
+        Returns:
+            Tupla (status_http, corpo_json)
+        """
+        with self._lock:
+            calendars = self._accounts.setdefault(account, {})
+
+            if path == "/calendar/v3/users/me/calendarList":
+                items = [
+                    {"id": calendar_id, "summary": calendar["summary"]}
+                    for calendar_id, calendar in calendars.items()
+                ]
+                return 200, {"items": items}
+
+            if path == "/calendar/v3/calendars" and method == "POST":
+                return 200, self._create_calendar(calendars, body["summary"])
+
+            match = self.CALENDAR_PATH.match(path)
+            if match:
+                calendar_id = unquote(match.group(1))
+                if calendar_id not in calendars:
+                    return 404, self._error(404, "notFound")
+                return 200, {
+                    "id": calendar_id,
+                    "summary": calendars[calendar_id]["summary"],
+                }
+
+            match = self.EVENTS_PATH.match(path)
+            if match:
+                calendar_id = unquote(match.group(1))
+                if calendar_id not in calendars:
+                    return 404, self._error(404, "notFound")
+                events = calendars[calendar_id]["events"]
+                event_id = match.group(2) and unquote(match.group(2))
+                if event_id is None:
+                    if method == "GET":
+                        return self._list_events(events, params)
+                    return self._insert_event(events, body)
+                return self._event_request(events, method, event_id, body)
+
+        return 404, self._error(404, "notFound")
+
+    def _create_calendar(self, calendars: Dict[str, Dict], summary: str) -> Dict:
+        calendar_id = f"benchmark{next(self._calendar_ids)}@group.calendar.google.com"
+        events: Dict[str, Dict] = {}
+        for index in range(self.existing_events):
+            start = datetime(2025, 1, 1) + timedelta(hours=index * 7)
+            event_id = f"existing{next(self._event_ids)}"
+            events[event_id] = {
+                "id": event_id,
+                "status": "confirmed",
+                "summary": f"Evento pessoal {index}",
+                "start": {"dateTime": start.isoformat() + "Z"},
+                "end": {"dateTime": (start + timedelta(hours=1)).isoformat() + "Z"},
+                "_version": next(self._versions),
+            }
+        calendars[calendar_id] = {"summary": summary, "events": events}
+        return {"id": calendar_id, "summary": summary}
+
+    def _list_events(
+        self, events: Dict[str, Dict], params: httpx.QueryParams
+    ) -> FakeResponse:
+        sync_token = params.get("syncToken")
+        since = int(sync_token) if sync_token else 0
+        items = [
+            event
+            for event in events.values()
+            if event["_version"] > since
+            and (sync_token or event["status"] != "cancelled")
+        ]
+
+        for prop in params.get_list("privateExtendedProperty"):
+            key, value = prop.split("=", 1)
+            items = [
+                event
+                for event in items
+                if event.get("extendedProperties", {}).get("private", {}).get(key)
+                == value
+            ]
+
+        size = int(params.get("maxResults", 250))
+        start = int(params.get("pageToken", 0))
+        page = [self._public(event) for event in items[start : start + size]]
+
+        fields = params.get("fields")
+        if fields:
+            match = re.search(r"items\((.*)\)", fields)
+            if match:
+                keep = {field.split("/")[0] for field in match.group(1).split(",")}
+                page = [{k: v for k, v in event.items() if k in keep} for event in page]
+
+        result: Dict[str, Any] = {"items": page}
+        if start + size < len(items):
+            result["nextPageToken"] = str(start + size)
+        else:
+            latest = max((event["_version"] for event in events.values()), default=0)
+            result["nextSyncToken"] = str(latest)
+        return 200, result
+
+    def _insert_event(self, events: Dict[str, Dict], body: Dict) -> FakeResponse:
+        event_id = body.get("id") or f"event{next(self._event_ids)}"
+        if event_id in events:
+            return 409, self._error(409, "duplicate")
+        event = {
+            **body,
+            "id": event_id,
+            "status": "confirmed",
+            "htmlLink": f"https://calendar.google.com/event?eid={event_id}",
+            "_version": next(self._versions),
+        }
+        events[event_id] = event
+        return 200, self._public(event)
+
+    def _event_request(
+        self, events: Dict[str, Dict], method: str, event_id: str, body: Optional[Dict]
+    ) -> FakeResponse:
+        event = events.get(event_id)
+        if event is None:
+            return 404, self._error(404, "notFound")
+
+        if method == "GET":
+            return 200, self._public(event)
+
+        if method in ("PUT", "PATCH"):
+            base = event if method == "PATCH" else {"htmlLink": event.get("htmlLink")}
+            events[event_id] = {
+                **base,
+                **(body or {}),
+                "id": event_id,
+                "status": (body or {}).get("status", "confirmed"),
+                "_version": next(self._versions),
+            }
+            return 200, self._public(events[event_id])
+
+        if method == "DELETE":
+            if event["status"] == "cancelled":
+                return 410, self._error(410, "deleted")
+            event["status"] = "cancelled"
+            event["_version"] = next(self._versions)
+            return 204, None
+
+        return 405, self._error(405, "methodNotAllowed")
+
+    @staticmethod
+    def _public(event: Dict) -> Dict:
+        return {key: value for key, value in event.items() if key != "_version"}
+
+    @staticmethod
+    def _error(code: int, reason: str) -> Dict:
+        return {"error": {"code": code, "errors": [{"reason": reason}]}}
+
+    def event_count(self) -> int:
+        """Eventos ativos em todos os calendários"""
+        with self._lock:
+            return sum(
+                1
+                for calendars in self._accounts.values()
+                for calendar in calendars.values()
+                for event in calendar["events"].values()
+                if event["status"] != "cancelled"
+            )
+
+
+class FakeUpstreams:
+    """
+    Encaminha cada requisição ao servidor falso do host; usado como
+    httpx.MockTransport(FakeUpstreams(portal, google))
+    """
+
+    def __init__(self, insper: FakeInsperPortal, google: FakeGoogleCalendar):
+        """
+        Inicializa o roteador
+
+        Args:
+            insper: Portal do Insper falso
+            google: Google Calendar falso
+        """
+        self.insper = insper
+        self.google = google
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == FakeInsperPortal.HOST:
+            return self.insper(request)
+        if request.url.host in FakeGoogleCalendar.HOSTS:
+            return self.google(request)
+        return httpx.Response(502, text=f"Host desconhecido: {request.url.host}")
+
+    def transport(self) -> httpx.MockTransport:
+        """Transporte do httpx que responde com os servidores falsos"""
+        return httpx.MockTransport(self)
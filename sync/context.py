@@ -0,0 +1,110 @@
+"""
+Contexto compartilhado pelas etapas de uma sincronização
+"""
+
+from typing import Optional
+
+from accounts.models import User
+from core.google_calendar import GoogleCalendarClient, get_or_refresh_access_token
+from core.locks import CacheLock
+
+from .metrics import SyncMetrics
+from .models import SyncConfiguration, SyncSession
+
+
+class SyncContext:
+    """
+    Estado de uma execução de sincronização: usuário, configuração, sessão e um
+    único cliente do Google (com seu pool de conexões) usado por todas as etapas.
+
+    O token de acesso é resolvido uma vez ao abrir o contexto e renovado apenas
+    quando estiver perto de expirar, mesmo no meio de uma sincronização longa.
+    """
+
+    # Renova o token quando faltar menos que isso para expirar, evitando que
+    # uma requisição saia com um token que vence durante o envio
+    TOKEN_REFRESH_LEEWAY_SECONDS = 300
+
+    def __init__(
+        self,
+        user: User,
+        sync_config: SyncConfiguration,
+        sync_session: Optional[SyncSession] = None,
+        lock: Optional[CacheLock] = None,
+        metrics: Optional[SyncMetrics] = None,
+    ):
+        """
+        Inicializa o contexto
+
+        Args:
+            user: Usuário sincronizado
+            sync_config: Configuração de sincronização do usuário
+            sync_session: Sessão de sincronização em andamento (opcional)
+            lock: Lock de sincronização do usuário, renovado a cada heartbeat
+                (opcional)
+            metrics: Métricas da sincronização, preenchidas pelas etapas
+                (opcional)
+        """
+        self.user = user
+        self.sync_config = sync_config
+        self.sync_session = sync_session
+        self.lock = lock
+        self.metrics = metrics or SyncMetrics()
+        self.calendar_id: Optional[str] = None
+        self._client = GoogleCalendarClient(quota_user=str(user.pk))
+
+    def __enter__(self) -> "SyncContext":
+        self.heartbeat()
+        with self.metrics.phase("google_token"):
+            self.refresh_token()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def google(self) -> GoogleCalendarClient:
+        """Cliente do Google com um token de acesso válido"""
+        self.refresh_token()
+        return self._client
+
+    def refresh_token(self) -> str:
+        """
+        Garante que o cliente tenha um token de acesso válido, renovando-o se
+        estiver expirado ou perto de expirar
+
+        Returns:
+            Token de acesso em uso
+
+        Raises:
+            Exception: Se não for possível obter um token válido
+        """
+        if self._client.access_token and not self.user.is_google_token_expired(
+            self.TOKEN_REFRESH_LEEWAY_SECONDS
+        ):
+            return self._client.access_token
+
+        success, access_token, error = get_or_refresh_access_token(
+            self.user,
+            leeway_seconds=self.TOKEN_REFRESH_LEEWAY_SECONDS,
+            client=self._client,
+        )
+        if not success or not access_token:
+            raise Exception(f"Erro ao obter token do Google: {error}")
+
+        self._client.access_token = access_token
+        return access_token
+
+    def heartbeat(self) -> None:
+        """
+        Sinaliza que a sincronização continua em andamento: atualiza o
+        heartbeat da sessão e renova o lock do usuário
+        """
+        if self.sync_session is not None:
+            self.sync_session.heartbeat()
+        if self.lock is not None:
+            self.lock.extend()
+
+    def close(self) -> None:
+        """Fecha as conexões do cliente do Google"""
+        self._client.client.close()
@@ -0,0 +1,489 @@
+"""
+Execução de um plano de sincronização no Google Calendar e no banco de dados
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from core.google_calendar import APIResponse, GoogleCalendarClient
+
+from .context import SyncContext
+from .metrics import SYNC_EVENTS
+from .models import EventMapping, GoogleEvent, SyncSession
+from .planner import DELETED, PlannedChange, SyncPlan
+
+logger = logging.getLogger(__name__)
+
+
+class SyncExecutor:
+    """
+    Aplica um SyncPlan: as operações de cada tipo são enviadas ao Google em
+    lotes (uma requisição HTTP por lote) e o resultado de cada lote é gravado
+    no banco em uma única transação, antes do próximo lote ser enviado. As
+    operações concluídas entram no checkpoint da sessão a cada lote e as que
+    falharam entram na fila de novas tentativas (ver retry_failed_events).
+    """
+
+    BATCH_SIZE = GoogleCalendarClient.BATCH_MAX_SIZE
+
+    def __init__(self, ctx: SyncContext):
+        """
+        Inicializa o executor
+
+        Args:
+            ctx: Contexto da sincronização (com o calendário já configurado)
+        """
+        self.ctx = ctx
+        self.stats = {"created": 0, "updated": 0, "deleted": 0, "failed": 0}
+
+    def execute(self, plan: SyncPlan) -> Dict[str, int]:
+        """
+        Executa o plano: criações e atualizações primeiro, remoções por último
+
+        Args:
+            plan: Plano montado por build_sync_plan
+
+        Returns:
+            Estatísticas de sincronização
+        """
+        metrics = self.ctx.metrics
+
+        for chunk in self._chunks(plan.creates):
+            with metrics.phase("google_push"):
+                results = self._send_batch(
+                    "batch_upsert_events", [change.payload for change in chunk]
+                )
+            with metrics.phase("db_write"):
+                self._save_results(chunk, results, "created")
+            self.ctx.heartbeat()
+
+        for chunk in self._chunks(plan.updates):
+            with metrics.phase("google_push"):
+                results = self._send_batch(
+                    "batch_update_events",
+                    [(change.google_event_id, change.payload) for change in chunk],
+                )
+            with metrics.phase("db_write"):
+                self._save_results(chunk, results, "updated")
+            self.ctx.heartbeat()
+
+        for chunk in self._chunks(plan.deletes):
+            with metrics.phase("google_push"):
+                results = self._send_batch(
+                    "batch_delete_events",
+                    [change.google_event_id for change in chunk],
+                )
+            with metrics.phase("db_write"):
+                self._save_deletions(chunk, results)
+            self.ctx.heartbeat()
+
+        for operation, count in self.stats.items():
+            if count:
+                SYNC_EVENTS.inc(count, operation=operation)
+
+        return self.stats
+
+    def _chunks(self, changes: List[PlannedChange]) -> Iterator[List[PlannedChange]]:
+        for start in range(0, len(changes), self.BATCH_SIZE):
+            yield changes[start : start + self.BATCH_SIZE]
+
+    def _send_batch(self, method_name: str, items: List[Any]) -> List[APIResponse]:
+        """
+        Envia um lote ao Google, convertendo exceções em falhas por item para
+        que um lote com erro não interrompa os demais
+
+        Args:
+            method_name: Método de lote do cliente (batch_*_events)
+            items: Itens do lote
+
+        Returns:
+            Lista de tuplas (sucesso, dados, mensagem_de_erro) por item
+        """
+        try:
+            # ctx.google renova o token se ele vencer no meio do processo
+            send = getattr(self.ctx.google, method_name)
+            return send(self.ctx.calendar_id, items)
+        except Exception as e:
+            return [(False, None, str(e))] * len(items)
+
+    def _save_results(
+        self, changes: List[PlannedChange], results: List[APIResponse], stat: str
+    ) -> None:
+        """
+        Grava os eventos criados ou atualizados e seus mapeamentos com poucas
+        consultas por lote (ver prepare_google_events)
+
+        Args:
+            changes: Operações enviadas no lote
+            results: Respostas do Google, na mesma ordem de `changes`
+            stat: Estatística incrementada a cada sucesso
+        """
+        synced = []
+        for change, (success, google_event, error) in zip(changes, results):
+            if not success or not google_event:
+                logger.error(
+                    f"Erro ao sincronizar evento {change.insper_event.insper_event_id} "
+                    f"({change.action}) no Google: {error}"
+                )
+                self._record_failure(change, error)
+                continue
+            synced.append((change, google_event))
+
+        if not synced:
+            return
+
+        try:
+            # As leituras ficam fora da transação de escrita (ver
+            # prepare_google_events)
+            changes = prepare_google_events(
+                self.ctx.user,
+                [google_event for _, google_event in synced],
+                self.ctx.calendar_id,
+            )
+            with transaction.atomic():
+                google_events = changes.save()
+                # Mapeamentos já existentes (ex: atualizações) são mantidos
+                EventMapping.objects.bulk_create(
+                    [
+                        EventMapping(
+                            insper_event=change.insper_event,
+                            google_event=google_events[google_event["id"]],
+                            sync_session=self._session_for(change),
+                            status="synced",
+                            direction="insper_to_google",
+                        )
+                        for change, google_event in synced
+                    ],
+                    ignore_conflicts=True,
+                )
+
+                # Operações que estavam na fila e agora foram concluídas
+                failed = EventMapping.objects.filter(
+                    insper_event__in=[change.insper_event for change, _ in synced],
+                    status="failed",
+                )
+                failed.filter(google_event__isnull=True).delete()
+                failed.update(**_RESOLVED_RETRY_FIELDS, status="synced")
+        except Exception as e:
+            logger.error(f"Erro ao gravar lote de eventos sincronizados: {str(e)}")
+            for change, _ in synced:
+                self._record_failure(change, str(e))
+            return
+
+        self.stats[stat] += len(synced)
+        completed = {
+            change.google_event_id: change.payload["extendedProperties"]["private"][
+                "sync_fingerprint"
+            ]
+            for change, _ in synced
+        }
+        self._save_checkpoint(completed)
+
+    def _save_deletions(
+        self, changes: List[PlannedChange], results: List[APIResponse]
+    ) -> None:
+        """
+        Desativa localmente os eventos removidos do Google
+
+        Args:
+            changes: Remoções enviadas no lote
+            results: Respostas do Google, na mesma ordem de `changes`
+        """
+        deleted_ids = []
+        for change, (success, _, error) in zip(changes, results):
+            if success:
+                deleted_ids.append(change.google_event_id)
+            else:
+                logger.error(
+                    f"Erro ao deletar evento {change.google_event_id}: {error}"
+                )
+                self._record_failure(change, error)
+
+        if deleted_ids:
+            with transaction.atomic():
+                GoogleEvent.objects.filter(
+                    user=self.ctx.user, google_event_id__in=deleted_ids
+                ).update(is_active=False)
+                EventMapping.objects.filter(
+                    google_event__user=self.ctx.user,
+                    google_event__google_event_id__in=deleted_ids,
+                    status="failed",
+                ).update(**_RESOLVED_RETRY_FIELDS, status="deleted")
+            self.stats["deleted"] += len(deleted_ids)
+
+        self._save_checkpoint({event_id: DELETED for event_id in deleted_ids})
+
+    def _session_for(self, change: PlannedChange) -> Optional[SyncSession]:
+        """Sessão à qual o mapeamento da operação pertence"""
+        if change.mapping is not None:
+            return change.mapping.sync_session
+        return self.ctx.sync_session
+
+    def _record_failure(self, change: PlannedChange, error: Optional[str]) -> None:
+        """
+        Conta a falha e coloca a operação na fila de novas tentativas. Se nem
+        isso puder ser gravado, a exceção interrompe a sincronização: a sessão
+        falha e a task é repetida, em vez de a operação se perder.
+
+        Args:
+            change: Operação que falhou
+            error: Mensagem de erro
+        """
+        self.stats["failed"] += 1
+        try:
+            record_failed_operation(self._session_for(change), change, error or "")
+        except Exception as e:
+            logger.error(
+                f"Erro ao registrar falha do evento {change.google_event_id}: {str(e)}"
+            )
+            raise
+
+    def _save_checkpoint(self, completed: Dict[str, str]) -> None:
+        """
+        Registra no checkpoint da sessão as operações concluídas no lote
+
+        Args:
+            completed: {google_event_id: fingerprint ou DELETED}
+        """
+        if completed and self.ctx.sync_session is not None:
+            self.ctx.sync_session.save_checkpoint(completed=completed)
+
+
+# Campos da fila de novas tentativas limpos quando a operação é concluída
+_RESOLVED_RETRY_FIELDS = {
+    "operation": "",
+    "payload": {},
+    "attempts": 0,
+    "next_retry_at": None,
+    "error_message": "",
+}
+
+
+# Campos do GoogleEvent reescritos quando o evento já existe no banco
+GOOGLE_EVENT_UPDATE_FIELDS = [
+    "google_calendar_id",
+    "title",
+    "description",
+    "start_datetime",
+    "end_datetime",
+    "all_day",
+    "location",
+    "html_link",
+    "timezone",
+    "raw_data",
+    "content_hash",
+    "is_active",
+    "synced_from_insper",
+    "last_synced_at",
+    "updated_at",
+]
+
+
+@dataclass
+class GoogleEventChanges:
+    """Eventos do Google montados por prepare_google_events, prontos para gravar"""
+
+    user: User
+    # Todos os eventos do lote, novos e existentes, por google_event_id
+    events: Dict[str, GoogleEvent]
+    to_create: List[GoogleEvent]
+    to_update: List[GoogleEvent]
+
+    def save(self) -> Dict[str, GoogleEvent]:
+        """
+        Grava os eventos: novos via bulk_create e existentes via bulk_update.
+        Deve ser chamado dentro da transação de escrita do chamador.
+
+        Returns:
+            Dicionário {google_event_id: GoogleEvent}, com as chaves preenchidas
+        """
+        if self.to_create:
+            # update_conflicts cobre o caso de outro worker ter criado o evento
+            # entre a leitura e a inserção
+            GoogleEvent.objects.bulk_create(
+                self.to_create,
+                update_conflicts=True,
+                unique_fields=["user", "google_event_id"],
+                update_fields=GOOGLE_EVENT_UPDATE_FIELDS,
+            )
+        if self.to_update:
+            GoogleEvent.objects.bulk_update(
+                self.to_update, GOOGLE_EVENT_UPDATE_FIELDS, batch_size=500
+            )
+
+        if any(event.pk is None for event in self.to_create):
+            # Backend sem RETURNING no upsert: recarrega para obter as chaves
+            self.events.update(
+                {
+                    event.google_event_id: event
+                    for event in GoogleEvent.objects.filter(
+                        user=self.user,
+                        google_event_id__in=[
+                            event.google_event_id for event in self.to_create
+                        ],
+                    )
+                }
+            )
+
+        return self.events
+
+
+def prepare_google_events(
+    user: User, google_events: List[Dict], calendar_id: str = ""
+) -> GoogleEventChanges:
+    """
+    Prepara a gravação em lote de eventos do Google: carrega os já existentes
+    com uma única consulta e aplica os dados recebidos em memória (como
+    _bulk_save_insper_events faz com os eventos do Insper).
+
+    A leitura é feita antes da transação de escrita: no SQLite uma transação
+    que lê e depois grava não consegue promover o lock com outros workers
+    gravando e falha na hora com "database is locked".
+
+    Args:
+        user: Usuário
+        google_events: Dados dos eventos do Google
+        calendar_id: ID do calendário (padrão: email do organizador)
+
+    Returns:
+        Eventos a gravar com GoogleEventChanges.save
+    """
+    now = timezone.now()
+    events_by_id = {google_event["id"]: google_event for google_event in google_events}
+
+    events = {
+        event.google_event_id: event
+        for event in GoogleEvent.objects.filter(
+            user=user, google_event_id__in=list(events_by_id)
+        )
+    }
+
+    changes = GoogleEventChanges(user=user, events=events, to_create=[], to_update=[])
+    for google_event_id, google_event in events_by_id.items():
+        google_event_obj = events.get(google_event_id)
+        if google_event_obj is None:
+            google_event_obj = GoogleEvent(user=user, google_event_id=google_event_id)
+            events[google_event_id] = google_event_obj
+            changes.to_create.append(google_event_obj)
+        else:
+            changes.to_update.append(google_event_obj)
+
+        for field, value in _google_event_defaults(google_event, calendar_id).items():
+            setattr(google_event_obj, field, value)
+        # bulk_create/bulk_update não passam por GoogleEvent.save
+        google_event_obj.update_content_hash()
+        google_event_obj.updated_at = now
+
+    return changes
+
+
+def build_google_event(
+    user: User, google_event: Dict, calendar_id: str = ""
+) -> GoogleEvent:
+    """
+    Monta um GoogleEvent sem gravá-lo no banco (usado pelo modo de simulação)
+
+    Args:
+        user: Usuário
+        google_event: Dados do evento do Google
+        calendar_id: ID do calendário (padrão: email do organizador)
+
+    Returns:
+        Instância do GoogleEvent não salva
+    """
+    return GoogleEvent(
+        user=user,
+        google_event_id=google_event["id"],
+        **_google_event_defaults(google_event, calendar_id),
+    )
+
+
+def _google_event_defaults(google_event: Dict, calendar_id: str = "") -> Dict:
+    """
+    Campos do model GoogleEvent a partir dos dados retornados pelo Google
+
+    Args:
+        google_event: Dados do evento do Google
+        calendar_id: ID do calendário (padrão: email do organizador)
+
+    Returns:
+        Dicionário de campos do GoogleEvent
+    """
+    start_dt: Optional[datetime] = None
+    end_dt: Optional[datetime] = None
+
+    # Parse das datas
+    if google_event.get("start", {}).get("dateTime"):
+        start_dt = datetime.fromisoformat(
+            google_event["start"]["dateTime"].replace("Z", "+00:00")
+        )
+    if google_event.get("end", {}).get("dateTime"):
+        end_dt = datetime.fromisoformat(
+            google_event["end"]["dateTime"].replace("Z", "+00:00")
+        )
+
+    return {
+        "google_calendar_id": calendar_id
+        or google_event.get("organizer", {}).get("email", ""),
+        "title": google_event.get("summary", ""),
+        "description": google_event.get("description", ""),
+        "start_datetime": start_dt,
+        "end_datetime": end_dt,
+        "all_day": "date" in google_event.get("start", {}),
+        "location": google_event.get("location", ""),
+        "html_link": google_event.get("htmlLink", ""),
+        "timezone": google_event.get("start", {}).get("timeZone", "America/Sao_Paulo"),
+        "raw_data": google_event,
+        "is_active": True,
+        "synced_from_insper": True,
+        "last_synced_at": timezone.now(),
+    }
+
+
+def record_failed_operation(
+    sync_session: Optional[SyncSession], change: PlannedChange, error: str
+) -> Optional[EventMapping]:
+    """
+    Registra uma operação que falhou no mapeamento do evento, com os dados
+    necessários para repeti-la, e agenda a próxima tentativa
+
+    Args:
+        sync_session: Sessão em que a operação falhou
+        change: Operação que falhou
+        error: Mensagem de erro
+
+    Returns:
+        Mapeamento atualizado ou None se não houver evento do Insper associado
+    """
+    mapping = change.mapping
+    if mapping is None:
+        lookup = {"google_event": change.google_event}
+        if change.insper_event is not None:
+            lookup["insper_event"] = change.insper_event
+        mapping = EventMapping.objects.filter(**lookup).first()
+
+    if mapping is None:
+        if change.insper_event is None or sync_session is None:
+            logger.warning(
+                f"Falha no evento {change.google_event_id} sem evento do Insper "
+                "associado; fica para a próxima sincronização"
+            )
+            return None
+        mapping = EventMapping(
+            insper_event=change.insper_event,
+            google_event=change.google_event,
+            direction="insper_to_google",
+        )
+
+    if sync_session is not None:
+        mapping.sync_session = sync_session
+    mapping.operation = change.action
+    mapping.payload = change.payload or {}
+    mapping.schedule_retry(error)
+    return mapping
@@ -0,0 +1,150 @@
+"""
+Mede a sincronização de ponta a ponta contra servidores falsos do Insper e do
+Google, em um banco de dados descartável
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sync.benchmark import BenchmarkConfig, isolated_environment, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa sincronizações de usuários sintéticos contra servidores falsos "
+        "do Insper e do Google e mede vazão, tempos, requisições e consultas"
+    )
+
+    def add_arguments(self, parser):
+        defaults = BenchmarkConfig()
+        parser.add_argument(
+            "--users", type=int, default=defaults.users, help="Usuários sintéticos"
+        )
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=defaults.months,
+            help="Meses sincronizados por usuário",
+        )
+        parser.add_argument(
+            "--events-per-month",
+            type=int,
+            default=defaults.events_per_month,
+            help="Eventos do Insper por usuário e mês",
+        )
+        parser.add_argument(
+            "--existing-events",
+            type=int,
+            default=defaults.existing_events,
+            help="Eventos não gerenciados já existentes em cada calendário Google",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=defaults.runs,
+            help="Execuções (a primeira cria os eventos, as seguintes atualizam)",
+        )
+        parser.add_argument(
+            "--change-rate",
+            type=float,
+            default=defaults.change_rate,
+            help="Fração dos eventos alterada no Insper entre as execuções",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=defaults.concurrency,
+            help="Usuários sincronizados em paralelo",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=defaults.latency,
+            help="Latência simulada de cada requisição, em segundos",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=defaults.error_rate,
+            help="Fração das requisições que falham nos servidores falsos",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=defaults.seed,
+            help="Semente dos erros e alterações simulados",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Imprime o relatório em JSON"
+        )
+
+    def handle(self, *args, **options):
+        config = BenchmarkConfig(
+            users=options["users"],
+            months=options["months"],
+            events_per_month=options["events_per_month"],
+            existing_events=options["existing_events"],
+            runs=options["runs"],
+            change_rate=options["change_rate"],
+            concurrency=options["concurrency"],
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+        )
+        if config.users < 1 or config.runs < 1 or config.concurrency < 1:
+            raise CommandError("--users, --runs e --concurrency devem ser positivos")
+        if not 0 <= config.change_rate <= 1 or not 0 <= config.error_rate <= 1:
+            raise CommandError("--change-rate e --error-rate devem estar entre 0 e 1")
+
+        with isolated_environment():
+            report = run_benchmark(config)
+
+        failed_runs = [run["run"] for run in report["runs"] if not run["valid"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+        else:
+            self._write_report(report)
+
+        if failed_runs:
+            raise CommandError(
+                "Sincronizações falharam nas execuções "
+                f"{', '.join(map(str, failed_runs))}; os tempos não são válidos"
+            )
+
+    def _write_report(self, report):
+        for run in report["runs"]:
+            requests = ", ".join(
+                f"{upstream} {count}"
+                for upstream, count in run["requests_per_user"].items()
+            )
+            events = run["events"]
+            if run["valid"]:
+                header = (
+                    f"Execução {run['run']}: {run['completed']}/{run['users']} "
+                    f"concluídas em {run['wall_seconds']} s "
+                    f"({run['users_per_minute']} usuários/min)\n"
+                    f"  sincronização: p50 {run['sync_seconds']['p50']} s, "
+                    f"p95 {run['sync_seconds']['p95']} s, "
+                    f"máx {run['sync_seconds']['max']} s"
+                )
+            else:
+                header = self.style.ERROR(
+                    f"Execução {run['run']}: FALHOU, {run['completed']}/"
+                    f"{run['users']} concluídas (vazão e tempos descartados)"
+                )
+            self.stdout.write(
+                f"{header}\n"
+                f"  requisições por usuário: {requests}\n"
+                f"  consultas por usuário: média "
+                f"{run['db_queries_per_user']['mean']}, "
+                f"p95 {run['db_queries_per_user']['p95']}\n"
+                f"  eventos: {events['created']} criados, "
+                f"{events['updated']} atualizados, {events['deleted']} removidos, "
+                f"{events['failed']} com erro"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{report['google_events']} eventos no Google ao final")
+        )
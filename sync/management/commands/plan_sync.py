@@ -0,0 +1,114 @@
+"""
+Simula a sincronização dos usuários sem alterar o Google Calendar nem o banco
+"""
+
+import json
+import math
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from sync.tasks import plan_user_sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula o plano de sincronização (criações, atualizações e remoções) "
+        "e estima as requisições ao Google, sem gravar nada"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users",
+            nargs="*",
+            help="E-mails ou IDs dos usuários (padrão: todos com sincronização ativa)",
+        )
+        parser.add_argument("--start", help="Data inicial (YYYY-MM-DD)")
+        parser.add_argument("--end", help="Data final (YYYY-MM-DD)")
+        parser.add_argument(
+            "--stored",
+            action="store_true",
+            help="Usa apenas os eventos salvos no banco, sem requisições externas",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Imprime um relatório JSON por linha"
+        )
+
+    def handle(self, *args, **options):
+        users = self._get_users(options["users"])
+        totals = {"create": 0, "update": 0, "delete": 0, "api_requests": 0}
+        user_requests = []
+        failures = 0
+
+        for user in users:
+            try:
+                report = plan_user_sync(
+                    user, options["start"], options["end"], options["stored"]
+                )
+            except Exception as e:
+                failures += 1
+                if options["json"]:
+                    self.stdout.write(json.dumps({"user": user.email, "error": str(e)}))
+                else:
+                    self.stderr.write(f"{user.email}: erro ao planejar: {e}")
+                continue
+
+            for key in totals:
+                totals[key] += report[key]
+            user_requests.append(report["api_requests"])
+
+            if options["json"]:
+                self.stdout.write(json.dumps(report))
+            else:
+                self.stdout.write(
+                    f"{report['user']}: {report['create']} criar, "
+                    f"{report['update']} atualizar, {report['delete']} remover, "
+                    f"{report['noop']} sem mudança, {report['skipped']} ignorados "
+                    f"({report['api_requests']} requisições, "
+                    f"{report['http_calls']} chamadas HTTP)"
+                )
+
+        if options["json"]:
+            return
+
+        # O limite por usuário só pesa para quem tem mais requisições que ele
+        project_limit = settings.GOOGLE_CALENDAR_PROJECT_REQUESTS_PER_MINUTE
+        user_limit = settings.GOOGLE_CALENDAR_USER_REQUESTS_PER_MINUTE
+        minutes = max(
+            totals["api_requests"] / project_limit,
+            max((requests / user_limit for requests in user_requests), default=0),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(user_requests)} usuários planejados, {failures} com erro: "
+                f"{totals['create']} criar, {totals['update']} atualizar, "
+                f"{totals['delete']} remover, "
+                f"{totals['api_requests']} requisições ao Google "
+                f"(mínimo de {math.ceil(minutes)} min pela quota)"
+            )
+        )
+
+    def _get_users(self, identifiers):
+        if not identifiers:
+            return list(
+                User.objects.filter(
+                    sync_config__sync_enabled=True,
+                    email_verified=True,
+                    credentials_configured=True,
+                    google_connected=True,
+                    is_active=True,
+                ).order_by("pk")
+            )
+
+        users = []
+        for identifier in identifiers:
+            lookup = (
+                {"pk": identifier} if identifier.isdigit() else {"email": identifier}
+            )
+            try:
+                users.append(User.objects.get(**lookup))
+            except User.DoesNotExist:
+                raise CommandError(f"Usuário {identifier} não encontrado")
+        return users
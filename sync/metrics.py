@@ -0,0 +1,283 @@
+"""
+Medição das etapas de uma sincronização (tempo, requisições HTTP por serviço
+externo e consultas ao banco de dados) e métricas do Prometheus da
+sincronização e das filas
+"""
+
+import math
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from celery.signals import worker_process_shutdown
+from django.db import connection
+from django.utils import timezone
+
+from core import celery_app
+from core.http import collect_requests
+from core.monitoring import CallbackGauge, Counter, Histogram, flush, metrics_enabled
+
+from .models import EventMapping, SyncSession
+
+# Ordem em que as etapas são exibidas
+PHASES = [
+    ("insper_download", "Download do Insper"),
+    ("insper_save", "Gravação dos eventos do Insper"),
+    ("google_token", "Token do Google"),
+    ("google_setup", "Configuração do calendário"),
+    ("google_list", "Listagem do Google"),
+    ("plan", "Planejamento"),
+    ("google_push", "Envio ao Google"),
+    ("db_write", "Gravação dos resultados"),
+]
+PHASE_LABELS = dict(PHASES)
+
+# Limites dos buckets da duração das sincronizações, em segundos
+SYNC_DURATION_BUCKETS = (5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+
+def _celery_queue_depth() -> List[Tuple[Dict[str, str], float]]:
+    """Mensagens aguardando um worker na fila padrão do Celery"""
+    queue = celery_app.conf.task_default_queue
+    with celery_app.connection_for_read(connect_timeout=2) as broker:
+        with broker.channel() as channel:
+            _, message_count, _ = channel.queue_declare(queue=queue, passive=True)
+    return [({"queue": queue}, message_count)]
+
+
+def _retry_queue_depth() -> List[Tuple[Dict[str, str], float]]:
+    """Operações na fila de novas tentativas, vencidas ou agendadas"""
+    failed = EventMapping.objects.filter(status="failed")
+    due = failed.filter(next_retry_at__lte=timezone.now()).count()
+    return [({"state": "due"}, due), ({"state": "scheduled"}, failed.count() - due)]
+
+
+def _running_sessions() -> List[Tuple[Dict[str, str], float]]:
+    return [({}, SyncSession.objects.filter(status="running").count())]
+
+
+SYNC_DURATION = Histogram(
+    "insper_sync_sync_duration_seconds",
+    "Duração das execuções de sincronização por resultado",
+    ["outcome"],
+    buckets=SYNC_DURATION_BUCKETS,
+)
+SYNC_EVENTS = Counter(
+    "insper_sync_events_total",
+    "Eventos enviados ao Google Calendar por operação (falhas incluídas)",
+    ["operation"],
+)
+QUEUE_DEPTH = CallbackGauge(
+    "insper_sync_queue_depth",
+    "Tarefas aguardando um worker na fila do Celery",
+    _celery_queue_depth,
+    ["queue"],
+)
+RETRY_QUEUE_DEPTH = CallbackGauge(
+    "insper_sync_retry_queue_depth",
+    "Operações na fila de novas tentativas (retry_failed_events)",
+    _retry_queue_depth,
+    ["state"],
+)
+RUNNING_SESSIONS = CallbackGauge(
+    "insper_sync_running_sessions",
+    "Sessões de sincronização em andamento",
+    _running_sessions,
+)
+
+
+@worker_process_shutdown.connect
+def _flush_on_worker_shutdown(**kwargs):
+    # Os processos do pool do Celery terminam sem passar pelo atexit
+    if metrics_enabled():
+        flush()
+
+
+class SyncMetrics:
+    """
+    Métricas por etapa de uma sincronização, no formato gravado em
+    SyncSession.metrics:
+
+        {"phases": {etapa: {"seconds", "db_queries", "http": {serviço:
+        {"requests", "bytes_sent", "bytes_received", "seconds"}}}}}
+
+    Uma etapa medida mais de uma vez (ex: um envio por lote, ou uma sessão
+    retomada) acumula os valores.
+    """
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa as métricas
+
+        Args:
+            initial: Métricas já gravadas (ex: de uma sessão retomada), às
+                quais as novas medições são somadas
+        """
+        self.phases: Dict[str, Dict[str, Any]] = {
+            name: {**values, "http": {k: dict(v) for k, v in values["http"].items()}}
+            for name, values in (initial or {}).get("phases", {}).items()
+        }
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Mede uma etapa. As etapas não devem ser aninhadas.
+
+        Args:
+            name: Nome da etapa (ver PHASES)
+        """
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_query), collect_requests() as requests:
+            try:
+                yield
+            finally:
+                self._add(
+                    name, time.perf_counter() - started, queries, requests.as_dict()
+                )
+
+    def _add(
+        self,
+        name: str,
+        seconds: float,
+        queries: int,
+        http: Dict[str, Dict[str, float]],
+    ) -> None:
+        phase = self.phases.setdefault(
+            name, {"seconds": 0.0, "db_queries": 0, "http": {}}
+        )
+        phase["seconds"] = round(phase["seconds"] + seconds, 3)
+        phase["db_queries"] += queries
+        for upstream, stats in http.items():
+            totals = phase["http"].setdefault(upstream, {})
+            for key, value in stats.items():
+                totals[key] = round(totals.get(key, 0) + value, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Métricas no formato gravado em SyncSession.metrics"""
+        return {"phases": self.phases}
+
+
+def summarize_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Organiza as métricas de uma sessão para exibição
+
+    Args:
+        metrics: Valor de SyncSession.metrics
+
+    Returns:
+        Dicionário com "phases" (lista na ordem de PHASES, com "name",
+        "label", "seconds", "db_queries", "requests", "bytes" e "http") e
+        "totals" (mesmas chaves somadas, mais "http" por serviço)
+    """
+    phases = (metrics or {}).get("phases", {})
+    order = [name for name, _ in PHASES] + sorted(set(phases) - set(PHASE_LABELS))
+
+    rows = []
+    totals = {"seconds": 0.0, "db_queries": 0, "requests": 0, "bytes": 0, "http": {}}
+    for name in order:
+        if name not in phases:
+            continue
+        phase = phases[name]
+        http = phase.get("http", {})
+        row = {
+            "name": name,
+            "label": PHASE_LABELS.get(name, name),
+            "seconds": phase.get("seconds", 0.0),
+            "db_queries": phase.get("db_queries", 0),
+            "requests": sum(stats.get("requests", 0) for stats in http.values()),
+            "bytes": sum(
+                stats.get("bytes_sent", 0) + stats.get("bytes_received", 0)
+                for stats in http.values()
+            ),
+            "http": http,
+        }
+        rows.append(row)
+
+        for key in ("seconds", "db_queries", "requests", "bytes"):
+            totals[key] += row[key]
+        for upstream, stats in http.items():
+            upstream_totals = totals["http"].setdefault(upstream, {})
+            for key, value in stats.items():
+                upstream_totals[key] = upstream_totals.get(key, 0) + value
+
+    totals["seconds"] = round(totals["seconds"], 3)
+    return {"phases": rows, "totals": totals}
+
+
+def aggregate_metrics(metrics_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Agrega as métricas de várias sessões por etapa
+
+    Args:
+        metrics_list: Valores de SyncSession.metrics
+
+    Returns:
+        Dicionário com "sessions" (quantidade) e "phases" (lista na ordem de
+        PHASES, mais o total, com "label", "count", média, p50 e p95 de
+        "seconds", e médias de "requests", "bytes" e "db_queries")
+    """
+    summaries = [summarize_metrics(metrics) for metrics in metrics_list if metrics]
+
+    values: Dict[str, Dict[str, List[float]]] = {}
+    labels: Dict[str, str] = {}
+    for summary in summaries:
+        for phase in summary["phases"]:
+            labels[phase["name"]] = phase["label"]
+            phase_values = values.setdefault(phase["name"], {})
+            for key in ("seconds", "requests", "bytes", "db_queries"):
+                phase_values.setdefault(key, []).append(phase[key])
+        total = values.setdefault("total", {})
+        for key in ("seconds", "requests", "bytes", "db_queries"):
+            total.setdefault(key, []).append(summary["totals"][key])
+    labels["total"] = "Total"
+
+    phases = []
+    for name in [name for name, _ in PHASES] + sorted(set(labels) - set(PHASE_LABELS)):
+        if name not in values or name == "total":
+            continue
+        phases.append(_aggregate_phase(name, labels[name], values[name]))
+    if "total" in values:
+        phases.append(_aggregate_phase("total", labels["total"], values["total"]))
+
+    return {"sessions": len(summaries), "phases": phases}
+
+
+def _aggregate_phase(
+    name: str, label: str, values: Dict[str, List[float]]
+) -> Dict[str, Any]:
+    seconds = values["seconds"]
+    return {
+        "name": name,
+        "label": label,
+        "count": len(seconds),
+        "seconds_avg": round(statistics.fmean(seconds), 3),
+        "seconds_p50": round(percentile(seconds, 50), 3),
+        "seconds_p95": round(percentile(seconds, 95), 3),
+        "requests_avg": round(statistics.fmean(values["requests"]), 1),
+        "bytes_avg": round(statistics.fmean(values["bytes"])),
+        "db_queries_avg": round(statistics.fmean(values["db_queries"]), 1),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo
+
+    Args:
+        values: Valores (não vazio)
+        pct: Percentil entre 0 e 100
+
+    Returns:
+        Valor do percentil
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
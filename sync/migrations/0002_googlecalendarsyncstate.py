@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GoogleCalendarSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "calendar_id",
+                    models.CharField(
+                        help_text="ID do calendário no Google", max_length=255
+                    ),
+                ),
+                (
+                    "sync_token",
+                    models.TextField(
+                        blank=True,
+                        help_text="nextSyncToken retornado pela última listagem",
+                    ),
+                ),
+                ("last_full_sync_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="google_sync_states",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "calendar_id")},
+            },
+        ),
+    ]
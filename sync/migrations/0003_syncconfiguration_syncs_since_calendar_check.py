@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0002_googlecalendarsyncstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncconfiguration",
+            name="syncs_since_calendar_check",
+            field=models.PositiveIntegerField(
+                default=10,
+                help_text="Sincronizações desde a última confirmação do calendário no Google",
+            ),
+        ),
+    ]
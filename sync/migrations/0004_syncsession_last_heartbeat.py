@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:17
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0003_syncconfiguration_syncs_since_calendar_check"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncsession",
+            name="last_heartbeat",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="syncsession",
+            index=models.Index(
+                fields=["status", "last_heartbeat"],
+                name="sync_syncse_status_76f2bd_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0004_syncsession_last_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncsession",
+            name="checkpoint",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0005_syncsession_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmapping",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="eventmapping",
+            name="next_retry_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="eventmapping",
+            name="operation",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("create", "Criação"),
+                    ("update", "Atualização"),
+                    ("delete", "Remoção"),
+                ],
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventmapping",
+            name="payload",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name="eventmapping",
+            name="google_event",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="mappings",
+                to="sync.googleevent",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmapping",
+            index=models.Index(
+                fields=["status", "next_retry_at"], name="sync_eventm_status_f833bd_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0006_eventmapping_retry_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncsession",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,11 +1,14 @@
 import hashlib
 import json
+from datetime import timedelta
 from typing import Dict
 
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from core.rate_limit import backoff_delay
+
 
 class SyncSession(models.Model):
     """Sessão de sincronização - rastreia cada execução do processo de sync"""
@@ -40,11 +43,32 @@ class SyncSession(models.Model):
     error_message = models.TextField(blank=True)
     error_details = models.JSONField(default=dict, blank=True)
 
+    # Atualizado a cada etapa; sessões "running" sem sinal recente foram
+    # abandonadas (worker interrompido) e são encerradas periodicamente
+    last_heartbeat = models.DateTimeField(default=timezone.now)
+
+    # Progresso gravado durante a execução, para que uma nova tentativa retome
+    # a sessão sem refazer o que já foi concluído:
+    # {"insper_events": [pks], "completed": {google_event_id: fingerprint ou
+    # "deleted"}, "resumes": n}
+    checkpoint = models.JSONField(default=dict, blank=True)
+
+    # Tempo, requisições HTTP e consultas ao banco por etapa (ver
+    # sync.metrics.SyncMetrics)
+    metrics = models.JSONField(default=dict, blank=True)
+
+    # Uma sessão interrompida só é retomada se tiver começado há menos que
+    # isso (os eventos do Insper do checkpoint não são buscados de novo) e
+    # até MAX_RESUMES vezes
+    CHECKPOINT_MAX_AGE = timedelta(hours=1)
+    MAX_RESUMES = 3
+
     class Meta:
         ordering = ["-started_at"]
         indexes = [
             models.Index(fields=["user", "-started_at"]),
             models.Index(fields=["status", "-started_at"]),
+            models.Index(fields=["status", "last_heartbeat"]),
         ]
 
     def __str__(self):
@@ -58,11 +82,88 @@ class SyncSession(models.Model):
             return timezone.now() - self.started_at
         return None
 
+    @classmethod
+    def find_resumable(cls, user, sync_start_date, sync_end_date):
+        """
+        Busca a sessão interrompida mais recente do usuário para o período,
+        se ela puder ser retomada
+
+        Args:
+            user: Usuário
+            sync_start_date: Data inicial do período
+            sync_end_date: Data final do período
+
+        Returns:
+            SyncSession a retomar ou None
+        """
+        latest = (
+            cls.objects.filter(
+                user=user,
+                sync_start_date=sync_start_date,
+                sync_end_date=sync_end_date,
+                started_at__gte=timezone.now() - cls.CHECKPOINT_MAX_AGE,
+            )
+            .order_by("-started_at")
+            .first()
+        )
+        if (
+            latest
+            and latest.status in ("partial", "failed")
+            and latest.checkpoint.get("insper_events") is not None
+            and latest.checkpoint.get("resumes", 0) < cls.MAX_RESUMES
+        ):
+            return latest
+        return None
+
+    def resume(self):
+        """Volta a sessão interrompida para execução"""
+        self.status = "running"
+        self.completed_at = None
+        self.error_message = ""
+        self.last_heartbeat = timezone.now()
+        self.checkpoint["resumes"] = self.checkpoint.get("resumes", 0) + 1
+        self.save(
+            update_fields=[
+                "status",
+                "completed_at",
+                "error_message",
+                "last_heartbeat",
+                "checkpoint",
+            ]
+        )
+
+    def save_checkpoint(self, **progress):
+        """
+        Grava o progresso da sessão
+
+        Args:
+            **progress: Chaves do checkpoint a atualizar. "completed" é
+                mesclado com as operações já registradas.
+        """
+        completed = progress.pop("completed", None)
+        if completed:
+            self.checkpoint.setdefault("completed", {}).update(completed)
+        self.checkpoint.update(progress)
+        self.save(update_fields=["checkpoint"])
+
+    def heartbeat(self):
+        """Registra que a sincronização ainda está em andamento"""
+        self.last_heartbeat = timezone.now()
+        self.save(update_fields=["last_heartbeat"])
+
     def mark_completed(self):
         """Marca a sessão como concluída"""
         self.status = "completed"
         self.completed_at = timezone.now()
-        self.save(update_fields=["status", "completed_at"])
+        self.checkpoint = {}
+        self.save(update_fields=["status", "completed_at", "checkpoint"])
+
+    def mark_partial(self, error_message: str):
+        """Marca a sessão como parcialmente concluída (pode ser retomada)"""
+        self.status = "partial"
+        self.completed_at = timezone.now()
+        self.error_message = error_message
+        self.save(update_fields=["status", "completed_at", "error_message"])
 
     def mark_failed(self, error_message: str, error_details: Dict | None = None):
         """Marca a sessão como falhada"""
@@ -252,6 +353,32 @@ class GoogleEvent(models.Model):
         super().save(*args, **kwargs)
 
 
+class GoogleCalendarSyncState(models.Model):
+    """Estado da sincronização incremental (syncToken) de um calendário do Google"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="google_sync_states",
+    )
+    calendar_id = models.CharField(
+        max_length=255, help_text="ID do calendário no Google"
+    )
+    sync_token = models.TextField(
+        blank=True, help_text="nextSyncToken retornado pela última listagem"
+    )
+
+    # Metadados
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["user", "calendar_id"]
+
+    def __str__(self):
+        return f"Estado de sync: {self.user.email} ({self.calendar_id})"
+
+
 class EventMapping(models.Model):
     """Mapeamento entre eventos do Insper e Google Calendar"""
 
@@ -269,12 +396,29 @@ class EventMapping(models.Model):
         ("bidirectional", "Bidirecional"),
     ]
 
+    OPERATION_CHOICES = [
+        ("create", "Criação"),
+        ("update", "Atualização"),
+        ("delete", "Remoção"),
+    ]
+
+    # Operações que falharam são repetidas com backoff exponencial até
+    # MAX_RETRY_ATTEMPTS vezes; depois disso ficam para a próxima sincronização
+    MAX_RETRY_ATTEMPTS = 5
+    RETRY_BASE_DELAY_SECONDS = 5 * 60
+    RETRY_MAX_DELAY_SECONDS = 6 * 60 * 60
+
     # Relacionamentos
     insper_event = models.ForeignKey(
         InsperEvent, on_delete=models.CASCADE, related_name="mappings"
     )
+    # Vazio quando a criação do evento no Google falhou
     google_event = models.ForeignKey(
-        GoogleEvent, on_delete=models.CASCADE, related_name="mappings"
+        GoogleEvent,
+        on_delete=models.CASCADE,
+        related_name="mappings",
+        null=True,
+        blank=True,
     )
     sync_session = models.ForeignKey(
         SyncSession, on_delete=models.CASCADE, related_name="event_mappings"
@@ -297,16 +441,24 @@ class EventMapping(models.Model):
     needs_manual_review = models.BooleanField(default=False)
     review_notes = models.TextField(blank=True)
 
+    # Fila de novas tentativas: operação que falhou e dados enviados ao Google
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_retry_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         unique_together = ["insper_event", "google_event"]
         indexes = [
             models.Index(fields=["status", "-last_synced_at"]),
             models.Index(fields=["sync_session", "status"]),
             models.Index(fields=["needs_manual_review"]),
+            models.Index(fields=["status", "next_retry_at"]),
         ]
 
     def __str__(self):
-        return f"Mapping: {self.insper_event.title} ↔ {self.google_event.title} ({self.status})"
+        google_title = self.google_event.title if self.google_event else "-"
+        return f"Mapping: {self.insper_event.title} ↔ {google_title} ({self.status})"
 
     def mark_synced(self):
         """Marca o mapeamento como sincronizado com sucesso"""
@@ -320,6 +472,25 @@ class EventMapping(models.Model):
         self.error_message = error_message
         self.save(update_fields=["status", "error_message", "last_synced_at"])
 
+    def schedule_retry(self, error_message: str):
+        """
+        Marca a operação como falhada e agenda a próxima tentativa com backoff
+        exponencial (sem nova tentativa após MAX_RETRY_ATTEMPTS)
+        """
+        self.status = "failed"
+        self.error_message = error_message
+        self.attempts += 1
+        if self.attempts < self.MAX_RETRY_ATTEMPTS:
+            delay = backoff_delay(
+                self.attempts - 1,
+                self.RETRY_BASE_DELAY_SECONDS,
+                self.RETRY_MAX_DELAY_SECONDS,
+            )
+            self.next_retry_at = timezone.now() + timedelta(seconds=delay)
+        else:
+            self.next_retry_at = None
+        self.save()
+
     def mark_conflict(self, review_notes: str = ""):
         """Marca o mapeamento como em conflito"""
         self.status = "conflict"
@@ -338,6 +509,9 @@ class EventMapping(models.Model):
 class SyncConfiguration(models.Model):
     """Configurações de sincronização por usuário"""
 
+    # A cada quantas sincronizações o calendário salvo é confirmado no Google
+    CALENDAR_CHECK_INTERVAL = 10
+
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sync_config"
     )
@@ -366,6 +540,10 @@ class SyncConfiguration(models.Model):
     )
     include_teacher_in_description = models.BooleanField(default=True)
     include_discipline_code = models.BooleanField(default=True)
+    syncs_since_calendar_check = models.PositiveIntegerField(
+        default=CALENDAR_CHECK_INTERVAL,
+        help_text="Sincronizações desde a última confirmação do calendário no Google",
+    )
 
     # Metadados
     created_at = models.DateTimeField(auto_now_add=True)
@@ -391,3 +569,11 @@ class SyncConfiguration(models.Model):
         if not self.sync_all_events:
             return discipline_code not in self.excluded_disciplines
         return True
+
+    def should_check_calendar(self) -> bool:
+        """Verifica se o calendário salvo precisa ser confirmado no Google"""
+        return self.syncs_since_calendar_check >= self.CALENDAR_CHECK_INTERVAL
+
+    def request_calendar_check(self) -> None:
+        """Força a confirmação do calendário na próxima sincronização"""
+        self.syncs_since_calendar_check = self.CALENDAR_CHECK_INTERVAL
@@ -0,0 +1,389 @@
+"""
+Planejamento da sincronização: compara os eventos do Insper com os do Google e
+decide o que criar, atualizar ou remover, sem acessar rede nem banco de dados
+"""
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.utils import timezone
+
+from core.google_calendar import GoogleCalendarClient, generate_event_id
+
+from .models import EventMapping, GoogleEvent, InsperEvent, SyncConfiguration
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+NOOP = "noop"
+
+# Marca de remoção concluída no checkpoint da sessão
+DELETED = "deleted"
+
+
+@dataclass
+class PlannedChange:
+    """Operação planejada para um evento do Google Calendar"""
+
+    action: str
+    google_event_id: str
+    insper_event: Optional[InsperEvent] = None
+    google_event: Optional[GoogleEvent] = None
+    payload: Optional[Dict[str, Any]] = None
+    # Mapeamento da fila de novas tentativas que originou a operação
+    mapping: Optional[EventMapping] = None
+
+
+@dataclass
+class SyncPlan:
+    """Resultado do planejamento: operações agrupadas por tipo"""
+
+    creates: List[PlannedChange] = field(default_factory=list)
+    updates: List[PlannedChange] = field(default_factory=list)
+    deletes: List[PlannedChange] = field(default_factory=list)
+    noops: List[PlannedChange] = field(default_factory=list)
+    skipped: int = 0
+
+    def __iter__(self) -> Iterator[PlannedChange]:
+        yield from self.creates
+        yield from self.updates
+        yield from self.deletes
+        yield from self.noops
+
+    @property
+    def has_changes(self) -> bool:
+        """Se há alguma operação a enviar ao Google"""
+        return bool(self.creates or self.updates or self.deletes)
+
+    def estimate_api_calls(
+        self, batch_size: int = GoogleCalendarClient.BATCH_MAX_SIZE
+    ) -> Dict[str, int]:
+        """
+        Estima o custo de executar o plano no Google
+
+        Args:
+            batch_size: Máximo de operações por chamada de lote
+
+        Returns:
+            Dicionário com "requests" (unidades de quota, uma por operação) e
+            "http_calls" (chamadas de lote)
+        """
+        operations = [self.creates, self.updates, self.deletes]
+        return {
+            "requests": sum(len(changes) for changes in operations),
+            "http_calls": sum(
+                math.ceil(len(changes) / batch_size) for changes in operations
+            ),
+        }
+
+    def summary(self) -> Dict[str, int]:
+        """Quantidade de operações por tipo"""
+        return {
+            CREATE: len(self.creates),
+            UPDATE: len(self.updates),
+            DELETE: len(self.deletes),
+            NOOP: len(self.noops),
+            "skipped": self.skipped,
+        }
+
+
+def build_sync_plan(
+    insper_events: List[InsperEvent],
+    google_events: List[GoogleEvent],
+    sync_config: SyncConfiguration,
+    completed: Optional[Dict[str, str]] = None,
+) -> SyncPlan:
+    """
+    Monta o plano de sincronização. Os eventos do Google são indexados pelo ID
+    do evento do Insper gravado em extendedProperties e o conteúdo é comparado
+    pela impressão digital, então o custo é linear no número de eventos.
+
+    Args:
+        insper_events: Eventos do Insper (objetos model)
+        google_events: Eventos do Google criados pelo Insper Sync (objetos model)
+        sync_config: Configuração de sincronização
+        completed: Operações já concluídas por uma execução anterior da mesma
+            sessão ({google_event_id: fingerprint ou "deleted"}); as que
+            continuam iguais entram no plano como no-op
+
+    Returns:
+        Plano com as operações a executar
+    """
+    plan = SyncPlan()
+    completed = completed or {}
+
+    google_events_map: Dict[str, GoogleEvent] = {}
+    for google_event in google_events:
+        insper_event_id = _private_properties(google_event).get("insper_event_id", "")
+        if insper_event_id:
+            google_events_map[insper_event_id] = google_event
+
+    for insper_event in insper_events:
+        if not should_sync_event(insper_event, sync_config):
+            plan.skipped += 1
+            continue
+
+        payload = build_google_event_data(insper_event, sync_config)
+        fingerprint = payload["extendedProperties"]["private"]["sync_fingerprint"]
+        existing = google_events_map.get(insper_event.insper_event_id)
+
+        if existing is None:
+            # ID fixo por usuário e evento: repetir a criação (retry da task ou
+            # sincronização interrompida) sobrescreve o evento em vez de duplicá-lo
+            event_id = google_event_id(insper_event)
+            payload["id"] = event_id
+            if completed.get(event_id) == fingerprint:
+                plan.noops.append(
+                    PlannedChange(NOOP, event_id, insper_event=insper_event)
+                )
+            else:
+                plan.creates.append(
+                    PlannedChange(
+                        CREATE, event_id, insper_event=insper_event, payload=payload
+                    )
+                )
+            continue
+
+        action = (
+            NOOP
+            if _private_properties(existing).get("sync_fingerprint") == fingerprint
+            or completed.get(existing.google_event_id) == fingerprint
+            else UPDATE
+        )
+        change = PlannedChange(
+            action,
+            existing.google_event_id,
+            insper_event=insper_event,
+            google_event=existing,
+            payload=payload if action == UPDATE else None,
+        )
+        (plan.updates if action == UPDATE else plan.noops).append(change)
+
+    # Remove eventos que não existem mais no Insper
+    insper_event_ids = {event.insper_event_id for event in insper_events}
+    for google_event in google_events:
+        insper_event_id = _private_properties(google_event).get("insper_event_id", "")
+        if (
+            insper_event_id
+            and insper_event_id not in insper_event_ids
+            and completed.get(google_event.google_event_id) != DELETED
+        ):
+            plan.deletes.append(
+                PlannedChange(
+                    DELETE, google_event.google_event_id, google_event=google_event
+                )
+            )
+
+    return plan
+
+
+def build_retry_plan(mappings: List[EventMapping]) -> SyncPlan:
+    """
+    Monta um plano com as operações da fila de novas tentativas, reenviando
+    os mesmos dados que falharam
+
+    Args:
+        mappings: Mapeamentos com status "failed" (com insper_event e
+            google_event carregados)
+
+    Returns:
+        Plano com as operações a repetir
+    """
+    plan = SyncPlan()
+    for mapping in mappings:
+        if mapping.operation == CREATE:
+            event_id = mapping.payload.get("id", "")
+            changes = plan.creates
+        elif mapping.google_event is not None:
+            event_id = mapping.google_event.google_event_id
+            changes = plan.updates if mapping.operation == UPDATE else plan.deletes
+        else:
+            plan.skipped += 1
+            continue
+
+        changes.append(
+            PlannedChange(
+                mapping.operation,
+                event_id,
+                insper_event=mapping.insper_event,
+                google_event=mapping.google_event,
+                payload=mapping.payload or None,
+                mapping=mapping,
+            )
+        )
+
+    return plan
+
+
+def _private_properties(google_event: GoogleEvent) -> Dict[str, str]:
+    """Propriedades privadas gravadas pelo Insper Sync em um evento do Google"""
+    return (
+        (google_event.raw_data or {}).get("extendedProperties", {}).get("private", {})
+    )
+
+
+def should_sync_event(
+    insper_event: InsperEvent, sync_config: SyncConfiguration
+) -> bool:
+    """
+    Verifica se um evento deve ser sincronizado baseado nas configurações
+
+    Args:
+        insper_event: Evento do Insper (objeto model)
+        sync_config: Configuração de sincronização
+
+    Returns:
+        True se deve sincronizar
+    """
+    # Verifica tipo de evento
+    if not sync_config.should_sync_event_type(getattr(insper_event, "tipo_evento", "")):
+        return False
+
+    # Verifica disciplina
+    disciplina = getattr(insper_event, "disciplina_codigo", "")
+    if disciplina and not sync_config.should_sync_discipline(disciplina):
+        return False
+
+    return True
+
+
+def build_google_event_data(
+    insper_event: InsperEvent, sync_config: SyncConfiguration
+) -> Dict:
+    """
+    Monta os dados do evento enviados ao Google Calendar, incluindo a
+    impressão digital do conteúdo em extendedProperties.private
+
+    Args:
+        insper_event: Evento do Insper (objeto model)
+        sync_config: Configuração de sincronização
+
+    Returns:
+        Dados do evento no formato do Google Calendar
+    """
+    event_data = {
+        "summary": format_event_title(insper_event, sync_config),
+        "description": format_event_description(insper_event, sync_config),
+        "start": {
+            "dateTime": timezone.localtime(insper_event.start_datetime).isoformat(),
+            "timeZone": "America/Sao_Paulo",
+        },
+        "end": {
+            "dateTime": timezone.localtime(insper_event.end_datetime).isoformat(),
+            "timeZone": "America/Sao_Paulo",
+        },
+        "location": insper_event.dependencia or "",
+        "source": {
+            "title": "Insper Sync",
+            "url": "https://sync.insper.dev",
+        },
+        "extendedProperties": {
+            "private": {
+                "insper_event_id": insper_event.insper_event_id,
+                "sync_source": "insper",
+                "disciplina_codigo": insper_event.disciplina_codigo or "",
+                "docente": insper_event.docente or "",
+                "turma": insper_event.turma or "",
+            }
+        },
+    }
+
+    event_data["extendedProperties"]["private"]["sync_fingerprint"] = (
+        calculate_event_fingerprint(event_data)
+    )
+
+    return event_data
+
+
+def calculate_event_fingerprint(event_data: Dict) -> str:
+    """
+    Calcula hash MD5 dos campos enviados ao Google para detectar mudanças
+
+    Args:
+        event_data: Dados do evento no formato do Google Calendar
+
+    Returns:
+        Hash do conteúdo
+    """
+    content_str = json.dumps(event_data, sort_keys=True)
+    return hashlib.md5(content_str.encode()).hexdigest()
+
+
+def google_event_id(insper_event: InsperEvent) -> str:
+    """
+    ID do evento no Google derivado do usuário e do ID do evento no Insper
+
+    Args:
+        insper_event: Evento do Insper (objeto model)
+
+    Returns:
+        ID do evento no formato aceito pelo Google
+    """
+    return generate_event_id(
+        "insper-sync", insper_event.user_id, insper_event.insper_event_id
+    )
+
+
+def format_event_title(
+    insper_event: InsperEvent, sync_config: SyncConfiguration
+) -> str:
+    """
+    Formata título do evento conforme configurações
+
+    Args:
+        insper_event: Evento do Insper (objeto model)
+        sync_config: Configuração de sincronização
+
+    Returns:
+        Título formatado
+    """
+    title = insper_event.title
+
+    if sync_config.add_insper_prefix:
+        title = f"[Insper] {title}"
+
+    return title
+
+
+def format_event_description(
+    insper_event: InsperEvent, sync_config: SyncConfiguration
+) -> str:
+    """
+    Formata descrição do evento conforme configurações
+
+    Args:
+        insper_event: Evento do Insper (objeto model)
+        sync_config: Configuração de sincronização
+
+    Returns:
+        Descrição formatada
+    """
+    description_parts = []
+
+    # Descrição original
+    if insper_event.description:
+        description_parts.append(insper_event.description)
+
+    # Informações adicionais conforme configuração
+    if sync_config.include_discipline_code and insper_event.disciplina_codigo:
+        description_parts.append(
+            f"Código da disciplina: {insper_event.disciplina_codigo}"
+        )
+
+    if insper_event.docente:
+        description_parts.append(f"Docente: {insper_event.docente}")
+
+    if insper_event.turma:
+        description_parts.append(f"Turma: {insper_event.turma}")
+
+    if insper_event.dependencia:
+        description_parts.append(f"Local: {insper_event.dependencia}")
+
+    # Adiciona informações de sincronização
+    description_parts.append("\n---")
+    description_parts.append("Sincronizado automaticamente via Insper Sync")
+
+    return "\n".join(description_parts)
@@ -1,30 +1,75 @@
 import logging
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from celery import shared_task
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import caches
 from django.db import transaction
+from django.db.models import (
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+)
 from django.utils import timezone
 
 from accounts.models import User
-from core.google_calendar import GoogleCalendarClient, get_or_refresh_access_token
-from core.insper import InsperAuth, InsperCalendar
+from core.insper import InsperCalendar, InsperSessionCache
 from core.insper import InsperEvent as InsperEventSrc
+from core.locks import CacheLock
 
+from .context import SyncContext
+from .executor import SyncExecutor, build_google_event, prepare_google_events
+from .metrics import SYNC_DURATION, SyncMetrics
 from .models import (
     EventMapping,
+    GoogleCalendarSyncState,
     GoogleEvent,
     InsperEvent,
     SyncConfiguration,
     SyncSession,
 )
+from .planner import build_retry_plan, build_sync_plan
 
 logger = logging.getLogger(__name__)
 
+# Expiração do lock de sincronização do usuário (e do pedido pendente), caso
+# o worker morra sem soltá-lo
+SYNC_LOCK_TIMEOUT = 30 * 60
+
+# Espera antes de tentar de novo uma execução que encontrou o lock ocupado
+SYNC_LOCK_RETRY_DELAY = 60
+
+# Máximo de operações da fila de novas tentativas processadas por execução
+RETRY_BATCH_LIMIT = 500
+
+# Por quanto tempo o início da última execução bem-sucedida é lembrado para
+# descartar pedidos que ela já atendeu
+SYNC_LAST_RUN_TIMEOUT = 24 * 60 * 60
+
+# Campos dos eventos do Google usados pela sincronização (resposta parcial).
+# A listagem incremental (syncToken) não aceita filtrar por
+# privateExtendedProperty, então o filtro por sync_source continua local.
+GOOGLE_EVENT_FIELDS = (
+    "id,status,summary,description,location,htmlLink,start,end,"
+    "organizer/email,extendedProperties/private"
+)
+
 
 @shared_task(bind=True, max_retries=3)
 def sync_user_calendar(
-    self, user_id: int, start_date: Optional[str] = None, end_date: Optional[str] = None
+    self,
+    user_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dry_run: bool = False,
+    requested_at: Optional[float] = None,
 ):
     """
     Task principal para sincronizar calendário de um usuário
@@ -33,6 +78,11 @@ def sync_user_calendar(
         user_id: ID do usuário
         start_date: Data inicial (formato YYYY-MM-DD, opcional)
         end_date: Data final (formato YYYY-MM-DD, opcional)
+        dry_run: Apenas calcula o plano (ver plan_user_sync), sem alterar o
+            Google Calendar nem o banco de dados
+        requested_at: Momento do pedido (timestamp), preenchido por
+            enqueue_user_sync. A execução é descartada se outra já tiver
+            começado depois dele.
     """
     try:
         # Busca o usuário
@@ -44,26 +94,10 @@ def sync_user_calendar(
                 f"Usuário {user.email} não pode sincronizar (configurações incompletas)"
             )
 
-        # Define datas padrão (próximo mês se não especificado)
-        if not start_date or not end_date:
-            now = timezone.now()
-            default_start = now.replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            if now.month == 12:
-                default_end = default_start.replace(
-                    year=now.year + 1, month=1
-                ) + timedelta(days=31)
-            else:
-                default_end = default_start.replace(month=now.month + 1) + timedelta(
-                    days=31
-                )
-
-            start_date = start_date or default_start.date().isoformat()
-            end_date = end_date or default_end.date().isoformat()
+        if dry_run:
+            return plan_user_sync(user, start_date, end_date)
 
-        start_dt = datetime.fromisoformat(start_date)
-        end_dt = datetime.fromisoformat(end_date)
+        start_dt, end_dt = _resolve_sync_range(start_date, end_date)
 
         # Obtém ou cria configuração de sincronização
         sync_config, _ = SyncConfiguration.objects.get_or_create(
@@ -74,31 +108,75 @@ def sync_user_calendar(
         if not sync_config.sync_enabled:
             return f"Sincronização desabilitada para {user.email}"
 
-        # Cria sessão de sincronização
-        sync_session = SyncSession.objects.create(
-            user=user,
-            sync_start_date=start_dt.date(),
-            sync_end_date=end_dt.date(),
-            status="running",
-        )
+        # Uma sincronização por usuário por vez, entre todos os workers
+        lock = _sync_lock(user.pk)
+        if not lock.acquire():
+            return _defer_sync(self.request.id, user, start_date, end_date)
+
+        with lock:
+            # Pedidos feitos a partir daqui geram uma nova execução
+            _consume_pending_sync(user.pk, self.request.id)
+            if _is_sync_satisfied(user.pk, requested_at):
+                return (
+                    f"Sincronização de {user.email} já atendida por uma execução "
+                    "iniciada depois do pedido"
+                )
+            run_started_at = time.time()
 
-        try:
-            # Executa a sincronização
-            result = _perform_sync(user, sync_config, sync_session, start_dt, end_dt)
+            # Registra a tentativa para o agendador respeitar a frequência,
+            # inclusive quando a sincronização foi disparada manualmente
+            sync_config.last_sync_attempt = timezone.now()
+            sync_config.save(update_fields=["last_sync_attempt"])
 
-            # Marca sessão como concluída
-            sync_session.mark_completed()
+            # Retoma a sessão interrompida do mesmo período (retry da task ou
+            # próxima execução) ou cria uma nova
+            sync_session = SyncSession.find_resumable(
+                user, start_dt.date(), end_dt.date()
+            )
+            if sync_session:
+                logger.info(f"Retomando sessão {sync_session.pk} de {user.email}")
+                sync_session.resume()
+            else:
+                sync_session = SyncSession.objects.create(
+                    user=user,
+                    sync_start_date=start_dt.date(),
+                    sync_end_date=end_dt.date(),
+                    status="running",
+                )
 
-            # Atualiza última sincronização do usuário
-            user.last_sync = timezone.now()
-            user.save(update_fields=["last_sync"])
+            try:
+                # Executa a sincronização
+                result = _perform_sync(
+                    user, sync_config, sync_session, start_dt, end_dt, lock
+                )
 
-            return result
+                if sync_session.events_failed:
+                    # Parte das operações falhou (ex: quota esgotada): elas
+                    # ficam na fila de novas tentativas (retry_failed_events)
+                    # e o que foi concluído fica no checkpoint da sessão
+                    sync_session.mark_partial(
+                        f"{sync_session.events_failed} eventos não sincronizados"
+                    )
+                else:
+                    # Marca sessão como concluída
+                    sync_session.mark_completed()
+                SYNC_DURATION.observe(
+                    time.time() - run_started_at, outcome=sync_session.status
+                )
 
-        except Exception as e:
-            # Marca sessão como falhada
-            sync_session.mark_failed(str(e))
-            raise
+                # Atualiza última sincronização do usuário
+                user.last_sync = timezone.now()
+                user.save(update_fields=["last_sync"])
+                if _is_default_range(start_date, end_date):
+                    _record_sync_run(user.pk, run_started_at)
+
+                return result
+
+            except Exception as e:
+                # Marca sessão como falhada
+                sync_session.mark_failed(str(e))
+                SYNC_DURATION.observe(time.time() - run_started_at, outcome="failed")
+                raise
 
     except User.DoesNotExist:
         return f"Usuário com ID {user_id} não encontrado"
@@ -117,12 +195,384 @@ def sync_user_calendar(
             )
 
 
+def enqueue_user_sync(
+    user_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    countdown: float = 0,
+) -> Optional[AsyncResult]:
+    """
+    Agenda a sincronização de um usuário, agrupando pedidos repetidos do
+    período padrão: se já houver uma execução na fila para o usuário que
+    comece até o horário pedido, nada é agendado e ela atende também este
+    pedido. Uma execução pendente mais tardia (ex: do agendador) é
+    substituída por esta e, ao rodar, é descartada. Pedidos com período
+    explícito são sempre agendados.
+
+    Args:
+        user_id: ID do usuário
+        start_date: Data inicial (formato YYYY-MM-DD, opcional)
+        end_date: Data final (formato YYYY-MM-DD, opcional)
+        countdown: Segundos até a execução
+
+    Returns:
+        Resultado da task agendada, ou None se o pedido foi agrupado
+    """
+    if not _is_default_range(start_date, end_date):
+        # Um período explícito não é atendido pelas execuções do período
+        # padrão (nem as atende)
+        return sync_user_calendar.apply_async(
+            args=[user_id, start_date, end_date], countdown=countdown
+        )
+
+    cache = caches[CacheLock.CACHE_ALIAS]
+    pending_key = _pending_sync_key(user_id)
+    now = time.time()
+    pending = {"task_id": uuid.uuid4().hex, "eta": now + countdown}
+    timeout = int(countdown) + SYNC_LOCK_TIMEOUT
+
+    if not cache.add(pending_key, pending, timeout=timeout):
+        current = cache.get(pending_key)
+        if current and current["eta"] <= pending["eta"]:
+            return None
+        cache.set(pending_key, pending, timeout=timeout)
+
+    try:
+        return sync_user_calendar.apply_async(
+            args=[user_id, start_date, end_date],
+            kwargs={"requested_at": now},
+            countdown=countdown,
+            task_id=pending["task_id"],
+        )
+    except Exception:
+        cache.delete(pending_key)
+        raise
+
+
+def is_sync_running(user_id: int) -> bool:
+    """Se há uma sincronização em execução para o usuário"""
+    return _sync_lock(user_id).is_locked()
+
+
+def _is_default_range(start_date: Optional[str], end_date: Optional[str]) -> bool:
+    """Se o pedido usa o período padrão (ver _resolve_sync_range)"""
+    return not start_date and not end_date
+
+
+def _sync_lock(user_id: int) -> CacheLock:
+    return CacheLock(f"sync:user:{user_id}", timeout=SYNC_LOCK_TIMEOUT)
+
+
+def _pending_sync_key(user_id: int) -> str:
+    return f"sync:pending:{user_id}"
+
+
+def _last_run_key(user_id: int) -> str:
+    return f"sync:last_run:{user_id}"
+
+
+def _consume_pending_sync(user_id: int, task_id: Optional[str]) -> None:
+    """
+    Marca o pedido pendente do usuário como atendido, se for esta execução
+
+    Args:
+        user_id: ID do usuário
+        task_id: ID da task em execução
+    """
+    cache = caches[CacheLock.CACHE_ALIAS]
+    pending_key = _pending_sync_key(user_id)
+    pending = cache.get(pending_key)
+    if pending and pending["task_id"] == task_id:
+        cache.delete(pending_key)
+
+
+def _is_sync_satisfied(user_id: int, requested_at: Optional[float]) -> bool:
+    """
+    Verifica se uma sincronização bem-sucedida começou depois do pedido,
+    tornando esta execução desnecessária
+
+    Args:
+        user_id: ID do usuário
+        requested_at: Momento do pedido atendido por esta execução
+
+    Returns:
+        True se o pedido já foi atendido
+    """
+    if requested_at is None:
+        return False
+    last_run = caches[CacheLock.CACHE_ALIAS].get(_last_run_key(user_id))
+    return last_run is not None and last_run >= requested_at
+
+
+def _record_sync_run(user_id: int, started_at: float) -> None:
+    """
+    Registra o início da última sincronização bem-sucedida do usuário no
+    período padrão
+
+    Args:
+        user_id: ID do usuário
+        started_at: Momento em que a execução começou (timestamp)
+    """
+    caches[CacheLock.CACHE_ALIAS].set(
+        _last_run_key(user_id), started_at, timeout=SYNC_LAST_RUN_TIMEOUT
+    )
+
+
+def _defer_sync(
+    task_id: Optional[str],
+    user: User,
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> str:
+    """
+    Trata uma execução que encontrou outra sincronização do usuário em
+    andamento: se não houver outra execução na fila, esta é reagendada para
+    depois da atual; caso contrário é descartada, pois a da fila já a atende.
+    Execuções com período explícito são sempre reagendadas.
+
+    Args:
+        task_id: ID da task em execução
+        user: Usuário
+        start_date: Data inicial (formato YYYY-MM-DD, opcional)
+        end_date: Data final (formato YYYY-MM-DD, opcional)
+
+    Returns:
+        Mensagem de resultado
+    """
+    if _is_default_range(start_date, end_date):
+        cache = caches[CacheLock.CACHE_ALIAS]
+        pending_key = _pending_sync_key(user.pk)
+        pending = cache.get(pending_key)
+
+        if pending and pending["task_id"] != task_id:
+            return f"Sincronização de {user.email} agrupada com a execução pendente"
+
+        cache.delete(pending_key)
+
+    enqueue_user_sync(user.pk, start_date, end_date, countdown=SYNC_LOCK_RETRY_DELAY)
+    return (
+        f"Sincronização de {user.email} já em andamento; "
+        f"nova execução em {SYNC_LOCK_RETRY_DELAY}s"
+    )
+
+
+def _resolve_sync_range(
+    start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> Tuple[datetime, datetime]:
+    """
+    Resolve o período da sincronização (próximo mês se não especificado)
+
+    Args:
+        start_date: Data inicial (formato YYYY-MM-DD, opcional)
+        end_date: Data final (formato YYYY-MM-DD, opcional)
+
+    Returns:
+        Tupla (data_inicial, data_final)
+    """
+    if not start_date or not end_date:
+        now = timezone.now()
+        default_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if now.month == 12:
+            default_end = default_start.replace(year=now.year + 1, month=1) + timedelta(
+                days=31
+            )
+        else:
+            default_end = default_start.replace(month=now.month + 1) + timedelta(
+                days=31
+            )
+
+        start_date = start_date or default_start.date().isoformat()
+        end_date = end_date or default_end.date().isoformat()
+
+    return datetime.fromisoformat(start_date), datetime.fromisoformat(end_date)
+
+
+def plan_user_sync(
+    user: User,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    use_stored: bool = False,
+) -> Dict[str, Any]:
+    """
+    Calcula o que a sincronização de um usuário faria, sem alterar o Google
+    Calendar nem o banco de dados (apenas o token de acesso pode ser renovado).
+
+    Os eventos do Insper são buscados com a sessão em cache e os do Google
+    partem da cópia local, atualizada em memória apenas com as mudanças desde
+    o último syncToken. Com `use_stored`, nenhuma requisição é feita e o plano
+    usa só o que está no banco.
+
+    Args:
+        user: Usuário
+        start_date: Data inicial (formato YYYY-MM-DD, opcional)
+        end_date: Data final (formato YYYY-MM-DD, opcional)
+        use_stored: Usa apenas os eventos já salvos no banco
+
+    Returns:
+        Relatório com a quantidade de operações por tipo e a estimativa de
+        requisições ("api_requests", unidades de quota) e de chamadas HTTP
+        ("http_calls") ao Google
+    """
+    start_dt, end_dt = _resolve_sync_range(start_date, end_date)
+    sync_config = SyncConfiguration.objects.filter(user=user).first()
+    if sync_config is None:
+        sync_config = SyncConfiguration(user=user, google_calendar_name="Insper Sync")
+
+    insper_events = _preview_insper_events(user, start_dt, end_dt, use_stored)
+    calendar_id, google_events, listing_calls = _preview_google_events(
+        user, sync_config, start_dt, end_dt, use_stored
+    )
+    plan = build_sync_plan(insper_events, google_events, sync_config)
+    estimate = plan.estimate_api_calls()
+
+    # Sem calendário salvo: lista os calendários e cria um novo
+    if not calendar_id:
+        setup_calls = 2
+    else:
+        setup_calls = 1 if sync_config.should_check_calendar() else 0
+
+    return {
+        "user": user.email,
+        "start_date": start_dt.date().isoformat(),
+        "end_date": end_dt.date().isoformat(),
+        "calendar_id": calendar_id,
+        "insper_events": len(insper_events),
+        "google_events": len(google_events),
+        **plan.summary(),
+        "api_requests": estimate["requests"] + setup_calls + listing_calls,
+        "http_calls": estimate["http_calls"] + setup_calls + listing_calls,
+    }
+
+
+def _preview_insper_events(
+    user: User, start_dt: datetime, end_dt: datetime, use_stored: bool = False
+) -> List[InsperEvent]:
+    """
+    Eventos do Insper do período como objetos InsperEvent não salvos
+
+    Args:
+        user: Usuário
+        start_dt: Data de início
+        end_dt: Data de fim
+        use_stored: Usa os eventos já salvos no banco em vez de buscá-los
+
+    Returns:
+        Lista de objetos InsperEvent
+    """
+    if use_stored:
+        return list(
+            InsperEvent.objects.filter(
+                user=user,
+                is_active=True,
+                end_datetime__gt=_aware(start_dt),
+                start_datetime__lt=_aware(end_dt),
+            )
+        )
+
+    events_by_id = {
+        event_data["id"]: event_data
+        for event_data in _download_insper_events(user, start_dt, end_dt)
+    }
+    insper_events = []
+    for insper_event_id, event_data in events_by_id.items():
+        insper_event = InsperEvent(user=user, insper_event_id=insper_event_id)
+        _apply_insper_event_data(insper_event, event_data)
+        insper_events.append(insper_event)
+    return insper_events
+
+
+def _preview_google_events(
+    user: User,
+    sync_config: SyncConfiguration,
+    start_dt: datetime,
+    end_dt: datetime,
+    use_stored: bool = False,
+) -> Tuple[Optional[str], List[GoogleEvent], int]:
+    """
+    Eventos do Google do período a partir da cópia local, com as mudanças
+    desde o último syncToken aplicadas apenas em memória
+
+    Args:
+        user: Usuário
+        sync_config: Configuração de sincronização
+        start_dt: Data de início
+        end_dt: Data de fim
+        use_stored: Não consulta o Google
+
+    Returns:
+        Tupla (id_do_calendário, eventos, chamadas_de_listagem). As chamadas
+        de listagem são as páginas buscadas (1 em `use_stored`).
+    """
+    calendar_id = user.google_calendar_id
+    if not calendar_id:
+        return None, [], 0
+
+    events_by_id = {
+        event.google_event_id: event
+        for event in GoogleEvent.objects.filter(
+            user=user,
+            google_calendar_id=calendar_id,
+            is_active=True,
+            synced_from_insper=True,
+        )
+    }
+    listing_calls = 1
+
+    if not use_stored:
+        sync_state = GoogleCalendarSyncState.objects.filter(
+            user=user, calendar_id=calendar_id
+        ).first()
+        listing_calls = 0
+
+        with SyncContext(user, sync_config) as ctx:
+            for success, page, error in ctx.google.iter_event_changes(
+                calendar_id,
+                sync_token=sync_state.sync_token if sync_state else None,
+                event_fields=GOOGLE_EVENT_FIELDS,
+            ):
+                if not success or page is None:
+                    raise Exception(f"Erro ao buscar eventos do Google: {error}")
+
+                # Na listagem completa, a cópia local não vale mais nada
+                if page["fullSync"] and listing_calls == 0:
+                    events_by_id = {}
+                listing_calls += 1
+
+                for event in page.get("items", []):
+                    if event.get("status") == "cancelled":
+                        events_by_id.pop(event["id"], None)
+                        continue
+
+                    private = event.get("extendedProperties", {}).get("private", {})
+                    if private.get("sync_source") == "insper":
+                        events_by_id[event["id"]] = build_google_event(
+                            user, event, calendar_id
+                        )
+
+    start_dt, end_dt = _aware(start_dt), _aware(end_dt)
+    google_events = [
+        event
+        for event in events_by_id.values()
+        if event.start_datetime
+        and event.end_datetime
+        and event.end_datetime > start_dt
+        and event.start_datetime < end_dt
+    ]
+    return calendar_id, google_events, listing_calls
+
+
+def _aware(dt: datetime) -> datetime:
+    """Converte datas sem fuso para o fuso padrão do projeto"""
+    return timezone.make_aware(dt) if timezone.is_naive(dt) else dt
+
+
 def _perform_sync(
     user: User,
     sync_config: SyncConfiguration,
     sync_session: SyncSession,
     start_dt: datetime,
     end_dt: datetime,
+    lock: Optional[CacheLock] = None,
 ) -> str:
     """
     Executa o processo de sincronização
@@ -133,42 +583,27 @@ def _perform_sync(
         sync_session: Sessão de sincronização
         start_dt: Data de início
         end_dt: Data de fim
+        lock: Lock de sincronização do usuário (renovado a cada etapa)
 
     Returns:
         Mensagem de resultado
     """
-
-    # Passo 1: Buscar eventos do Insper
-    logger.info(f"Buscando eventos do Insper para {user.email}")
-    insper_events = _fetch_insper_events(user, start_dt, end_dt)
-    sync_session.insper_events_found = len(insper_events)
-    sync_session.save(update_fields=["insper_events_found"])
-
-    # Passo 2: Configurar Google Calendar
-    logger.info(f"Configurando Google Calendar para {user.email}")
-    google_calendar_id = _setup_google_calendar(user, sync_config)
-
-    # Passo 3: Buscar eventos existentes do Google
-    logger.info(f"Buscando eventos do Google para {user.email}")
-    google_events = _fetch_google_events(user, google_calendar_id, start_dt, end_dt)
-    sync_session.google_events_found = len(google_events)
-    sync_session.save(update_fields=["google_events_found"])
-
-    # Passo 4: Sincronizar eventos
-    logger.info(f"Sincronizando eventos para {user.email}")
-    sync_stats = _synchronize_events(
-        user,
-        sync_config,
-        sync_session,
-        google_calendar_id,
-        insper_events,
-        google_events,
-    )
-
-    # Atualiza estatísticas da sessão
-    sync_session.events_created = sync_stats["created"]
-    sync_session.events_updated = sync_stats["updated"]
-    sync_session.events_deleted = sync_stats["deleted"]
+    # Tempo, requisições e consultas de cada etapa, somados aos de execuções
+    # anteriores da mesma sessão e gravados mesmo se a sincronização falhar
+    metrics = SyncMetrics(sync_session.metrics)
+    try:
+        sync_stats = _run_sync_steps(
+            user, sync_config, sync_session, start_dt, end_dt, lock, metrics
+        )
+    finally:
+        sync_session.metrics = metrics.as_dict()
+        sync_session.save(update_fields=["metrics"])
+
+    # Atualiza estatísticas da sessão (somando as de execuções anteriores, se
+    # a sessão foi retomada; as falhas são sempre as da última execução)
+    sync_session.events_created += sync_stats["created"]
+    sync_session.events_updated += sync_stats["updated"]
+    sync_session.events_deleted += sync_stats["deleted"]
     sync_session.events_failed = sync_stats["failed"]
     sync_session.save(
         update_fields=[
@@ -188,8 +623,78 @@ def _perform_sync(
     )
 
 
+def _run_sync_steps(
+    user: User,
+    sync_config: SyncConfiguration,
+    sync_session: SyncSession,
+    start_dt: datetime,
+    end_dt: datetime,
+    lock: Optional[CacheLock],
+    metrics: SyncMetrics,
+) -> Dict[str, int]:
+    """
+    Executa as etapas da sincronização, medindo cada uma
+
+    Args:
+        user: Usuário
+        sync_config: Configuração de sincronização
+        sync_session: Sessão de sincronização
+        start_dt: Data de início
+        end_dt: Data de fim
+        lock: Lock de sincronização do usuário (renovado a cada etapa)
+        metrics: Métricas da sincronização
+
+    Returns:
+        Estatísticas de sincronização
+    """
+    # Passo 1: Buscar eventos do Insper (ou reaproveitar os do checkpoint,
+    # ao retomar uma sessão interrompida)
+    checkpoint_event_ids = sync_session.checkpoint.get("insper_events")
+    if checkpoint_event_ids is not None:
+        logger.info(f"Usando eventos do Insper do checkpoint para {user.email}")
+        insper_events = list(InsperEvent.objects.filter(pk__in=checkpoint_event_ids))
+    else:
+        logger.info(f"Buscando eventos do Insper para {user.email}")
+        insper_events = _fetch_insper_events(user, start_dt, end_dt, metrics)
+        sync_session.save_checkpoint(
+            insper_events=[event.pk for event in insper_events]
+        )
+    sync_session.insper_events_found = len(insper_events)
+    sync_session.save(update_fields=["insper_events_found"])
+
+    # As etapas do Google compartilham o mesmo token e cliente HTTP
+    with SyncContext(user, sync_config, sync_session, lock, metrics) as ctx:
+        try:
+            # Passo 2: Configurar Google Calendar
+            logger.info(f"Configurando Google Calendar para {user.email}")
+            with metrics.phase("google_setup"):
+                _setup_google_calendar(ctx)
+            ctx.heartbeat()
+
+            # Passo 3: Buscar eventos existentes do Google
+            logger.info(f"Buscando eventos do Google para {user.email}")
+            with metrics.phase("google_list"):
+                google_events = _fetch_google_events(ctx, start_dt, end_dt)
+            sync_session.google_events_found = len(google_events)
+            sync_session.save(update_fields=["google_events_found"])
+            ctx.heartbeat()
+
+            # Passo 4: Sincronizar eventos
+            logger.info(f"Sincronizando eventos para {user.email}")
+            return _synchronize_events(ctx, insper_events, google_events)
+        except Exception:
+            # O calendário pode ter sido removido no Google (404): a próxima
+            # tentativa confirma o ID salvo antes de usá-lo
+            sync_config.request_calendar_check()
+            sync_config.save(update_fields=["syncs_since_calendar_check"])
+            raise
+
+
 def _fetch_insper_events(
-    user: User, start_dt: datetime, end_dt: datetime
+    user: User,
+    start_dt: datetime,
+    end_dt: datetime,
+    metrics: Optional[SyncMetrics] = None,
 ) -> List[InsperEvent]:
     """
     Busca eventos do calendário do Insper e salva/atualiza no banco,
@@ -199,41 +704,51 @@ def _fetch_insper_events(
         user: Usuário
         start_dt: Data de início
         end_dt: Data de fim
+        metrics: Métricas da sincronização (opcional)
 
     Returns:
         Lista de objetos InsperEvent
     """
+    metrics = metrics or SyncMetrics()
     try:
-        from core.insper import InsperEvent as InsperEventSrc
-
-        with InsperAuth() as auth:
-            # Faz login no Insper
-            success = auth.login(
-                user.insper_username, user.insper_enc_password, encrypt=False
-            )
-            if not success:
-                raise Exception("Falha na autenticação com o Insper")
-
-            # Busca eventos
-            calendar = InsperCalendar(auth)
-            events: List[InsperEventSrc] = calendar.get_events_for_range(
-                start_dt, end_dt
-            )
+        with metrics.phase("insper_download"):
+            events_data = _download_insper_events(user, start_dt, end_dt)
 
-            # Salva/atualiza todos no banco e retorna objetos
-            insper_event_objs = []
-            for event in events:
-                # Converte para dict e salva usando função já existente
-                event_dict = _convert_insper_event_to_dict(event)
-                insper_event_obj = _save_insper_event(user, event_dict)
-                insper_event_objs.append(insper_event_obj)
-            return insper_event_objs
+        # Salva/atualiza todos no banco de uma vez e retorna objetos
+        with metrics.phase("insper_save"):
+            return _bulk_save_insper_events(user, events_data)
 
     except Exception as e:
         logger.error(f"Erro ao buscar eventos do Insper: {str(e)}")
         raise
 
 
+def _download_insper_events(
+    user: User, start_dt: datetime, end_dt: datetime
+) -> List[Dict]:
+    """
+    Busca os eventos do calendário do Insper, sem salvá-los
+
+    Args:
+        user: Usuário
+        start_dt: Data de início
+        end_dt: Data de fim
+
+    Returns:
+        Lista de dados dos eventos
+    """
+    # Busca eventos reaproveitando a sessão autenticada do cache
+    # (o login só é refeito se o portal recusar a sessão)
+    events: List[InsperEventSrc] = InsperSessionCache.run(
+        user.insper_username,
+        user.insper_enc_password,
+        lambda auth: InsperCalendar(auth).get_events_for_range(start_dt, end_dt),
+        encrypt=False,
+    )
+
+    return [_convert_insper_event_to_dict(event) for event in events]
+
+
 def _convert_insper_event_to_dict(insper_event: InsperEventSrc) -> Dict:
     """
     Converte evento do Insper para dicionário padrão
@@ -286,28 +801,27 @@ def _convert_insper_event_to_dict(insper_event: InsperEventSrc) -> Dict:
     }
 
 
-def _setup_google_calendar(user: User, sync_config: SyncConfiguration) -> str:
+def _setup_google_calendar(ctx: SyncContext) -> str:
     """
-    Configura calendário do Google (cria se necessário)
+    Configura calendário do Google (cria se necessário) e o registra no
+    contexto da sincronização
 
     Args:
-        user: Usuário
-        sync_config: Configuração de sincronização
+        ctx: Contexto da sincronização
 
     Returns:
         ID do calendário
     """
-    # Obtém token válido
-    success, access_token, error = get_or_refresh_access_token(user)
-    if not success or not access_token:
-        raise Exception(f"Erro ao obter token do Google: {error}")
-
-    # Cria cliente do Google Calendar
-    client = GoogleCalendarClient(access_token)
-
-    # Obtém ou cria calendário do Insper Sync
-    success, calendar_id, error = client.get_or_create_insper_calendar(
-        sync_config.google_calendar_name
+    user = ctx.user
+    sync_config = ctx.sync_config
+
+    # O calendário salvo é usado diretamente e só é confirmado no Google de
+    # tempos em tempos (ou após uma falha), evitando listar todos os calendários
+    verify = sync_config.should_check_calendar()
+    success, calendar_id, error = ctx.google.get_or_create_insper_calendar(
+        sync_config.google_calendar_name,
+        calendar_id=user.google_calendar_id or None,
+        verify=verify,
     )
 
     if not success or not calendar_id:
@@ -318,193 +832,261 @@ def _setup_google_calendar(user: User, sync_config: SyncConfiguration) -> str:
         user.google_calendar_id = calendar_id
         user.save(update_fields=["google_calendar_id"])
 
+    sync_config.syncs_since_calendar_check = (
+        0 if verify else sync_config.syncs_since_calendar_check + 1
+    )
+    sync_config.save(update_fields=["syncs_since_calendar_check"])
+
+    ctx.calendar_id = calendar_id
     return calendar_id
 
 
 def _fetch_google_events(
-    user: User, calendar_id: str, start_dt: datetime, end_dt: datetime
+    ctx: SyncContext, start_dt: datetime, end_dt: datetime
 ) -> List[GoogleEvent]:
     """
-    Busca eventos existentes do Google Calendar e salva/atualiza no banco,
-    retornando objetos GoogleEvent (model Django)
+    Atualiza a cópia local dos eventos do Google Calendar a partir das
+    mudanças desde a última sincronização (syncToken) e retorna os objetos
+    GoogleEvent (model Django) do período
 
     Args:
-        user: Usuário
-        calendar_id: ID do calendário
+        ctx: Contexto da sincronização (com o calendário já configurado)
         start_dt: Data de início
         end_dt: Data de fim
 
     Returns:
         Lista de objetos GoogleEvent
     """
-    # Obtém token válido
-    success, access_token, error = get_or_refresh_access_token(user)
-    if not success or not access_token:
-        raise Exception(f"Erro ao obter token do Google: {error}")
+    user = ctx.user
+    calendar_id = ctx.calendar_id
 
-    # Busca eventos
-    client = GoogleCalendarClient(access_token)
-    success, events, error = client.list_events(
-        calendar_id=calendar_id, time_min=start_dt, time_max=end_dt, max_results=2500
+    sync_state, _ = GoogleCalendarSyncState.objects.get_or_create(
+        user=user, calendar_id=calendar_id
     )
 
-    if not success:
-        raise Exception(f"Erro ao buscar eventos do Google: {error}")
+    # Busca as mudanças página por página, processando cada uma enquanto a
+    # próxima é baixada
+    client = ctx.google
+    listing_started_at = timezone.now()
+    full_sync = False
+    next_sync_token = None
+
+    for success, page, error in client.iter_event_changes(
+        calendar_id,
+        sync_token=sync_state.sync_token or None,
+        event_fields=GOOGLE_EVENT_FIELDS,
+    ):
+        if not success or page is None:
+            raise Exception(f"Erro ao buscar eventos do Google: {error}")
+
+        full_sync = page["fullSync"]
+        next_sync_token = page.get("nextSyncToken") or next_sync_token
+
+        # Cada página é gravada com uma atualização para os removidos e um
+        # upsert em lote para os alterados; vale a última versão de cada evento
+        cancelled_ids = []
+        changed_events = []
+        for event in {event["id"]: event for event in page.get("items", [])}.values():
+            # Eventos removidos aparecem como cancelados na listagem incremental
+            if event.get("status") == "cancelled":
+                cancelled_ids.append(event["id"])
+                continue
 
-    # Filtra apenas eventos criados pelo Insper Sync e salva/atualiza no banco
-    google_event_objs = []
-    for event in events or []:
-        extended_props = event.get("extendedProperties", {}).get("private", {})
-        if extended_props.get("sync_source") == "insper":
-            google_event_obj = _save_google_event(user, event)
-            google_event_objs.append(google_event_obj)
+            # Salva/atualiza apenas eventos criados pelo Insper Sync
+            extended_props = event.get("extendedProperties", {}).get("private", {})
+            if extended_props.get("sync_source") == "insper":
+                changed_events.append(event)
 
-    return google_event_objs
+        if not cancelled_ids and not changed_events:
+            continue
+
+        # Leituras antes da transação de escrita (ver prepare_google_events)
+        changes = prepare_google_events(user, changed_events, calendar_id)
+        with transaction.atomic():
+            if cancelled_ids:
+                GoogleEvent.objects.filter(
+                    user=user, google_event_id__in=cancelled_ids
+                ).update(is_active=False)
+            changes.save()
+
+    if full_sync:
+        # Na listagem completa, o que não voltou não existe mais no Google
+        GoogleEvent.objects.filter(
+            user=user,
+            google_calendar_id=calendar_id,
+            is_active=True,
+            last_synced_at__lt=listing_started_at,
+        ).update(is_active=False)
+        sync_state.last_full_sync_at = listing_started_at
+
+    if next_sync_token:
+        sync_state.sync_token = next_sync_token
+        sync_state.save(update_fields=["sync_token", "last_full_sync_at", "updated_at"])
+
+    if timezone.is_naive(start_dt):
+        start_dt = timezone.make_aware(start_dt)
+    if timezone.is_naive(end_dt):
+        end_dt = timezone.make_aware(end_dt)
+
+    return list(
+        GoogleEvent.objects.filter(
+            user=user,
+            google_calendar_id=calendar_id,
+            is_active=True,
+            synced_from_insper=True,
+            end_datetime__gt=start_dt,
+            start_datetime__lt=end_dt,
+        )
+    )
 
 
 def _synchronize_events(
-    user: User,
-    sync_config: SyncConfiguration,
-    sync_session: SyncSession,
-    google_calendar_id: str,
+    ctx: SyncContext,
     insper_events: List[InsperEvent],
     google_events: List[GoogleEvent],
 ) -> Dict[str, int]:
     """
-    Sincroniza eventos entre Insper e Google
+    Sincroniza eventos entre Insper e Google: monta o plano em memória e o
+    aplica em lotes
 
     Args:
-        user: Usuário
-        sync_config: Configuração de sincronização
-        sync_session: Sessão de sincronização
-        google_calendar_id: ID do calendário do Google
+        ctx: Contexto da sincronização (com o calendário já configurado)
         insper_events: Eventos do Insper
         google_events: Eventos do Google
 
     Returns:
         Estatísticas de sincronização
     """
-    stats = {"created": 0, "updated": 0, "deleted": 0, "failed": 0}
-
-    # Obtém token válido
-    success, access_token, error = get_or_refresh_access_token(user)
-    if not success or not access_token:
-        raise Exception(f"Erro ao obter token do Google: {error}")
-
-    client = GoogleCalendarClient(access_token)
-
-    # Cria mapeamento de eventos existentes
-    google_events_map = {}
-    for event in google_events:
-        ext_props = event.raw_data.get("extendedProperties", {})
-        private = ext_props.get("private", {})
-        insper_event_id = private.get("insper_event_id", "")
-        if insper_event_id:
-            google_events_map[insper_event_id] = event
-
-    # Processa eventos do Insper
-    for insper_event in insper_events:
-        try:
-            if not _should_sync_event(insper_event, sync_config):
-                continue
-            insper_event_id = insper_event.insper_event_id
-            existing_google_event = google_events_map.get(insper_event_id)
-            if existing_google_event:
-                if _event_needs_update(
-                    insper_event, existing_google_event, sync_config
-                ):
-                    success = _update_google_event(
-                        client,
-                        google_calendar_id,
-                        existing_google_event,
-                        insper_event,
-                        sync_config,
-                    )
-                    if success:
-                        stats["updated"] += 1
-                        _create_event_mapping(
-                            sync_session, insper_event, existing_google_event, "synced"
-                        )
-                    else:
-                        stats["failed"] += 1
-            else:
-                google_event = _create_google_event(
-                    client, google_calendar_id, insper_event, sync_config
-                )
-                if google_event:
-                    stats["created"] += 1
-                    google_event_obj = _save_google_event(user, google_event)
-                    _create_event_mapping(
-                        sync_session, insper_event, google_event_obj, "synced"
-                    )
-                else:
-                    stats["failed"] += 1
-        except Exception as e:
-            logger.error(
-                f"Erro ao processar evento {getattr(insper_event, 'insper_event_id', 'unknown')}: {str(e)}"
-            )
-            stats["failed"] += 1
-
-    # Remove eventos que não existem mais no Insper
-    insper_event_ids = {event.insper_event_id for event in insper_events}
-    for google_event in google_events:
-        ext_props = google_event.raw_data.get("extendedProperties", {})
-        private = ext_props.get("private", {})
-        google_insper_id = private.get("insper_event_id", "")
-        if google_insper_id and google_insper_id not in insper_event_ids:
-            success, error = client.delete_event(
-                google_calendar_id, google_event.google_event_id
-            )
-            if success:
-                stats["deleted"] += 1
-                GoogleEvent.objects.filter(
-                    user=user, google_event_id=google_event.google_event_id
-                ).update(is_active=False)
-            else:
-                logger.error(
-                    f"Erro ao deletar evento {google_event.google_event_id}: {error}"
-                )
-    return stats
-
-
-def _should_sync_event(
-    insper_event: InsperEvent, sync_config: SyncConfiguration
-) -> bool:
+    completed = (
+        ctx.sync_session.checkpoint.get("completed") if ctx.sync_session else None
+    )
+    with ctx.metrics.phase("plan"):
+        plan = build_sync_plan(insper_events, google_events, ctx.sync_config, completed)
+    logger.info(f"Plano de sincronização para {ctx.user.email}: {plan.summary()}")
+
+    return SyncExecutor(ctx).execute(plan)
+
+
+INSPER_EVENT_UPDATE_FIELDS = [
+    "insper_internal_id",
+    "title",
+    "description",
+    "start_datetime",
+    "end_datetime",
+    "all_day",
+    "disciplina_codigo",
+    "docente",
+    "turma",
+    "dependencia",
+    "tipo_evento",
+    "timezone",
+    "raw_data",
+    "content_hash",
+    "is_active",
+    "last_synced_at",
+    "updated_at",
+]
+
+
+def _bulk_save_insper_events(user: User, events_data: List[Dict]) -> List[InsperEvent]:
     """
-    Verifica se um evento deve ser sincronizado baseado nas configurações
+    Salva ou atualiza eventos do Insper no banco de dados em lote.
+
+    Carrega os eventos já existentes com uma única consulta, calcula os hashes
+    de conteúdo em memória e grava tudo em uma única transação: novos eventos
+    via bulk_create, eventos alterados via bulk_update e os demais apenas têm
+    last_synced_at atualizado.
 
     Args:
-        insper_event: Evento do Insper (objeto model)
-        sync_config: Configuração de sincronização
+        user: Usuário
+        events_data: Lista de dados dos eventos
 
     Returns:
-        True se deve sincronizar
+        Lista de instâncias do InsperEvent, na ordem de `events_data`
     """
-    # Verifica tipo de evento
-    if not sync_config.should_sync_event_type(getattr(insper_event, "tipo_evento", "")):
-        return False
+    now = timezone.now()
 
-    # Verifica disciplina
-    disciplina = getattr(insper_event, "disciplina_codigo", "")
-    if disciplina and not sync_config.should_sync_discipline(disciplina):
-        return False
+    # Um mesmo evento pode aparecer em mais de uma página/mês
+    events_by_id = {event_data["id"]: event_data for event_data in events_data}
 
-    return True
+    existing_events = {
+        event.insper_event_id: event
+        for event in InsperEvent.objects.filter(
+            user=user, insper_event_id__in=list(events_by_id)
+        )
+    }
 
+    to_create: List[InsperEvent] = []
+    to_update: List[InsperEvent] = []
+    unchanged_ids: List[int] = []
+
+    for insper_event_id, event_data in events_by_id.items():
+        insper_event = existing_events.get(insper_event_id)
+        if insper_event is None:
+            insper_event = InsperEvent(user=user, insper_event_id=insper_event_id)
+            existing_events[insper_event_id] = insper_event
+
+        previous_hash = insper_event.content_hash
+        previous_dependencia = insper_event.dependencia
+        was_active = insper_event.is_active
+
+        _apply_insper_event_data(insper_event, event_data)
+        insper_event.update_content_hash()
+        insper_event.is_active = True
+        insper_event.last_synced_at = now
+
+        if insper_event.pk is None:
+            to_create.append(insper_event)
+        elif (
+            insper_event.content_hash != previous_hash
+            or insper_event.dependencia != previous_dependencia
+            or not was_active
+        ):
+            insper_event.updated_at = now
+            to_update.append(insper_event)
+        else:
+            unchanged_ids.append(insper_event.pk)
+
+    with transaction.atomic():
+        if to_create:
+            # update_conflicts cobre o caso de outro worker ter criado o evento
+            # entre a consulta acima e a inserção
+            InsperEvent.objects.bulk_create(
+                to_create,
+                update_conflicts=True,
+                unique_fields=["user", "insper_event_id"],
+                update_fields=INSPER_EVENT_UPDATE_FIELDS,
+            )
+        if to_update:
+            InsperEvent.objects.bulk_update(
+                to_update, INSPER_EVENT_UPDATE_FIELDS, batch_size=500
+            )
+        if unchanged_ids:
+            InsperEvent.objects.filter(pk__in=unchanged_ids).update(last_synced_at=now)
+
+    if any(insper_event.pk is None for insper_event in to_create):
+        # Backend sem RETURNING no upsert: recarrega para obter as chaves
+        existing_events.update(
+            {
+                event.insper_event_id: event
+                for event in InsperEvent.objects.filter(
+                    user=user,
+                    insper_event_id__in=[event.insper_event_id for event in to_create],
+                )
+            }
+        )
 
-def _save_insper_event(user: User, event_data: Dict) -> InsperEvent:
+    return [existing_events[insper_event_id] for insper_event_id in events_by_id]
+
+
+def _apply_insper_event_data(insper_event: InsperEvent, event_data: Dict) -> None:
     """
-    Salva ou atualiza evento do Insper no banco de dados
+    Copia os dados de um evento do Insper para a instância do model
 
     Args:
-        user: Usuário
+        insper_event: Instância do InsperEvent
         event_data: Dados do evento
-
-    Returns:
-        Instância do InsperEvent
     """
-    from django.utils import timezone
-
     # Ensure datetime fields are timezone-aware
     start_dt = event_data["start_datetime"]
     end_dt = event_data["end_datetime"]
@@ -514,409 +1096,177 @@ def _save_insper_event(user: User, event_data: Dict) -> InsperEvent:
     if end_dt and timezone.is_naive(end_dt):
         end_dt = timezone.make_aware(end_dt)
 
-    insper_internal_id = event_data.get("internal_id") or f"auto-{event_data['id']}"
-
-    with transaction.atomic():
-        insper_event, created = InsperEvent.objects.get_or_create(
-            user=user,
-            insper_event_id=event_data["id"],
-            defaults={
-                "insper_internal_id": insper_internal_id,
-                "title": event_data["title"],
-                "description": event_data.get("description", ""),
-                "start_datetime": start_dt,
-                "end_datetime": end_dt,
-                "all_day": event_data.get("all_day", False),
-                "disciplina_codigo": event_data.get("disciplina_codigo", ""),
-                "docente": event_data.get("docente", ""),
-                "turma": event_data.get("turma", ""),
-                "dependencia": event_data.get("dependencia", ""),
-                "tipo_evento": event_data.get("tipo_evento", ""),
-                "timezone": event_data.get("timezone", "America/Sao_Paulo"),
-                "raw_data": event_data.get("raw_data", {}),
-                "is_active": True,
-                "last_synced_at": timezone.now(),
-            },
-        )
-
-        # Se não foi criado, atualiza os campos
-        if not created:
-            fields_to_update = []
-
-            if insper_event.title != event_data["title"]:
-                insper_event.title = event_data["title"]
-                fields_to_update.append("title")
-
-            if insper_event.description != event_data.get("description", ""):
-                insper_event.description = event_data.get("description", "")
-                fields_to_update.append("description")
-
-            if insper_event.start_datetime != start_dt:
-                insper_event.start_datetime = start_dt
-                fields_to_update.append("start_datetime")
-
-            if insper_event.end_datetime != end_dt:
-                insper_event.end_datetime = end_dt
-                fields_to_update.append("end_datetime")
-
-            # Atualiza outros campos conforme necessário
-            insper_event.docente = event_data.get("docente", "")
-            insper_event.turma = event_data.get("turma", "")
-            insper_event.dependencia = event_data.get("dependencia", "")
-            insper_event.is_active = True
-            insper_event.last_synced_at = timezone.now()
-
-            fields_to_update.extend(
-                ["docente", "turma", "dependencia", "is_active", "last_synced_at"]
-            )
-
-            if fields_to_update:
-                insper_event.save(update_fields=fields_to_update)
-
-        return insper_event
+    insper_event.insper_internal_id = (
+        event_data.get("internal_id") or f"auto-{event_data['id']}"
+    )
+    insper_event.title = event_data["title"]
+    insper_event.description = event_data.get("description", "")
+    insper_event.start_datetime = start_dt
+    insper_event.end_datetime = end_dt
+    insper_event.all_day = event_data.get("all_day", False)
+    insper_event.disciplina_codigo = event_data.get("disciplina_codigo") or ""
+    insper_event.docente = event_data.get("docente") or ""
+    insper_event.turma = event_data.get("turma") or ""
+    insper_event.dependencia = event_data.get("dependencia") or ""
+    insper_event.tipo_evento = event_data.get("tipo_evento") or ""
+    insper_event.timezone = event_data.get("timezone") or "America/Sao_Paulo"
+    insper_event.raw_data = event_data.get("raw_data", {})
 
 
-def _event_needs_update(
-    insper_event: InsperEvent, google_event: Dict, sync_config: SyncConfiguration
-) -> bool:
+@shared_task
+def sync_all_users():
     """
-    Verifica se um evento do Google precisa ser atualizado
-
-    Args:
-        insper_event: Evento do Insper (objeto model)
-        google_event: Dados do evento do Google
-        sync_config: Configuração de sincronização
-
-    Returns:
-        True se precisa atualizar
+    Task periódica que agenda a sincronização dos usuários cuja frequência de
+    sincronização já venceu. As tasks são distribuídas ao longo do intervalo do
+    agendador para não dispararem todas ao mesmo tempo.
     """
-    # Compara títulos
-    expected_title = _format_event_title(insper_event, sync_config)
-    if google_event.get("summary", "") != expected_title:
-        return True
-
-    # Compara descrições
-    expected_description = _format_event_description(insper_event, sync_config)
-    if google_event.get("description", "") != expected_description:
-        return True
-
-    # Compara datas
-    google_start = google_event.get("start", {})
-    google_end = google_event.get("end", {})
-
-    if google_start.get("dateTime"):
-        google_start_dt = datetime.fromisoformat(
-            google_start["dateTime"].replace("Z", "+00:00")
+    now = timezone.now()
+    interval = timedelta(minutes=settings.SYNC_SCHEDULER_INTERVAL_MINUTES)
+
+    # A frequência de cada usuário é comparada no próprio banco: só as
+    # configurações devidas são carregadas. O filtro de 1 hora (frequência
+    # mínima) usa o índice de last_sync_attempt antes do cálculo.
+    due_configs = list(
+        SyncConfiguration.objects.alias(
+            next_sync_at=ExpressionWrapper(
+                F("last_sync_attempt")
+                + ExpressionWrapper(
+                    F("sync_frequency_hours") * Value(timedelta(hours=1)),
+                    output_field=DurationField(),
+                ),
+                output_field=DateTimeField(),
+            )
         )
-        if google_start_dt != insper_event.start_datetime:
-            return True
-
-    if google_end.get("dateTime"):
-        google_end_dt = datetime.fromisoformat(
-            google_end["dateTime"].replace("Z", "+00:00")
+        .filter(
+            Q(last_sync_attempt__isnull=True)
+            | Q(last_sync_attempt__lte=now - timedelta(hours=1), next_sync_at__lte=now),
+            sync_enabled=True,
+            user__email_verified=True,
+            user__credentials_configured=True,
+            user__google_connected=True,
+            user__is_active=True,
         )
-        if google_end_dt != insper_event.end_datetime:
-            return True
-
-    return False
-
-
-def _create_google_event(
-    client: GoogleCalendarClient,
-    calendar_id: str,
-    insper_event: InsperEvent,
-    sync_config: SyncConfiguration,
-) -> Optional[Dict]:
-    """
-    Cria evento no Google Calendar
-
-    Args:
-        client: Cliente do Google Calendar
-        calendar_id: ID do calendário
-        insper_event: Evento do Insper (objeto model)
-        sync_config: Configuração de sincronização
-
-    Returns:
-        Dados do evento criado ou None se falhou
-    """
-    try:
-        event_data = {
-            "summary": _format_event_title(insper_event, sync_config),
-            "description": _format_event_description(insper_event, sync_config),
-            "start": {
-                "dateTime": insper_event.start_datetime.isoformat(),
-                "timeZone": "America/Sao_Paulo",
-            },
-            "end": {
-                "dateTime": insper_event.end_datetime.isoformat(),
-                "timeZone": "America/Sao_Paulo",
-            },
-            "location": insper_event.dependencia or "",
-            "source": {
-                "title": "Insper Sync",
-                "url": "https://sync.insper.dev",
-            },
-            "extendedProperties": {
-                "private": {
-                    "insper_event_id": insper_event.insper_event_id,
-                    "sync_source": "insper",
-                    "disciplina_codigo": insper_event.disciplina_codigo or "",
-                    "docente": insper_event.docente or "",
-                    "turma": insper_event.turma or "",
-                }
-            },
-        }
-
-        success, google_event, error = client.create_event(calendar_id, event_data)
-
-        if success and google_event:
-            return google_event
-        else:
-            logger.error(f"Erro ao criar evento no Google: {error}")
-            return None
-
-    except Exception as e:
-        logger.error(f"Erro ao criar evento no Google: {str(e)}")
-        return None
-
-
-def _update_google_event(
-    client: GoogleCalendarClient,
-    calendar_id: str,
-    google_event: Dict,
-    insper_event: InsperEvent,
-    sync_config: SyncConfiguration,
-) -> bool:
-    """
-    Atualiza evento no Google Calendar
+        .order_by(F("last_sync_attempt").asc(nulls_first=True))
+        .values_list("pk", "user_id", "user__email")
+    )
 
-    Args:
-        client: Cliente do Google Calendar
-        calendar_id: ID do calendário
-        google_event: Evento existente do Google
-        insper_event: Evento do Insper (objeto model)
-        sync_config: Configuração de sincronização
+    if not due_configs:
+        return []
 
-    Returns:
-        True se atualizou com sucesso
-    """
-    try:
-        updated_data = {
-            "summary": _format_event_title(insper_event, sync_config),
-            "description": _format_event_description(insper_event, sync_config),
-            "start": {
-                "dateTime": insper_event.start_datetime.isoformat(),
-                "timeZone": "America/Sao_Paulo",
-            },
-            "end": {
-                "dateTime": insper_event.end_datetime.isoformat(),
-                "timeZone": "America/Sao_Paulo",
-            },
-            "location": insper_event.dependencia or "",
-            "extendedProperties": {
-                "private": {
-                    "insper_event_id": insper_event.insper_event_id,
-                    "sync_source": "insper",
-                    "disciplina_codigo": insper_event.disciplina_codigo or "",
-                    "docente": insper_event.docente or "",
-                    "turma": insper_event.turma or "",
-                }
-            },
-        }
-
-        success, _, error = client.update_event(
-            calendar_id, google_event["id"], updated_data
-        )
-
-        if not success:
-            logger.error(f"Erro ao atualizar evento no Google: {error}")
+    step = interval / len(due_configs)
+    scheduled = []
+    results = []
+    for index, (config_id, user_id, email) in enumerate(due_configs):
+        countdown = (step * index).total_seconds()
+        try:
+            result = enqueue_user_sync(user_id, countdown=countdown)
+            if result is None:
+                results.append(f"Sincronização de {email} já está na fila")
+                continue
+            # Marca a tentativa no horário previsto de execução, evitando que a
+            # próxima rodada agende o mesmo usuário novamente
+            scheduled.append(
+                SyncConfiguration(
+                    pk=config_id,
+                    last_sync_attempt=now + timedelta(seconds=countdown),
+                )
+            )
+            results.append(
+                f"Sincronização agendada para {email} em {int(countdown)}s: {result.id}"
+            )
+        except Exception as e:
+            results.append(f"Erro ao agendar sincronização para {email}: {str(e)}")
 
-        return success
+    SyncConfiguration.objects.bulk_update(scheduled, ["last_sync_attempt"])
 
-    except Exception as e:
-        logger.error(f"Erro ao atualizar evento no Google: {str(e)}")
-        return False
+    return results
 
 
-def _save_google_event(user: User, google_event: Dict) -> GoogleEvent:
+@shared_task
+def reap_stale_sync_sessions():
     """
-    Salva evento do Google no banco de dados
-
-    Args:
-        user: Usuário
-        google_event: Dados do evento do Google
-
-    Returns:
-        Instância do GoogleEvent
+    Task periódica que marca como falhas as sessões em execução cujo worker
+    parou de enviar heartbeats (ex: processo interrompido no meio da
+    sincronização)
     """
-    start_dt = None
-    end_dt = None
-
-    # Parse das datas
-    if google_event.get("start", {}).get("dateTime"):
-        start_dt = datetime.fromisoformat(
-            google_event["start"]["dateTime"].replace("Z", "+00:00")
-        )
-    if google_event.get("end", {}).get("dateTime"):
-        end_dt = datetime.fromisoformat(
-            google_event["end"]["dateTime"].replace("Z", "+00:00")
-        )
-
-    google_event_obj, created = GoogleEvent.objects.get_or_create(
-        user=user,
-        google_event_id=google_event["id"],
-        defaults={
-            "google_calendar_id": google_event.get("organizer", {}).get("email", ""),
-            "title": google_event.get("summary", ""),
-            "description": google_event.get("description", ""),
-            "start_datetime": start_dt,
-            "end_datetime": end_dt,
-            "all_day": "date" in google_event.get("start", {}),
-            "location": google_event.get("location", ""),
-            "html_link": google_event.get("htmlLink", ""),
-            "timezone": google_event.get("start", {}).get(
-                "timeZone", "America/Sao_Paulo"
-            ),
-            "raw_data": google_event,
-            "is_active": True,
-            "synced_from_insper": True,
-            "last_synced_at": timezone.now(),
-        },
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=settings.SYNC_HEARTBEAT_TIMEOUT_MINUTES)
+
+    reaped_count = SyncSession.objects.filter(
+        status="running", last_heartbeat__lt=cutoff
+    ).update(
+        status="failed",
+        completed_at=now,
+        error_message="Sincronização interrompida: o worker parou de responder",
     )
 
-    return google_event_obj
+    return f"Encerradas {reaped_count} sessões de sincronização abandonadas"
 
 
-def _create_event_mapping(
-    sync_session: SyncSession,
-    insper_event: InsperEvent,
-    google_event,
-    status: str = "synced",
-):
+@shared_task
+def retry_failed_events():
     """
-    Cria mapeamento entre eventos do Insper e Google
-
-    Args:
-        sync_session: Sessão de sincronização
-        insper_event: Evento do Insper
-        google_event: Evento do Google (dict ou GoogleEvent)
-        status: Status do mapeamento
+    Task periódica que repete as operações que falharam individualmente (fila
+    de novas tentativas em EventMapping), sem baixar a agenda do Insper nem
+    listar o Google Calendar
     """
-    try:
-        # Se google_event é um dict, busca ou cria o GoogleEvent
-        from .models import GoogleEvent as GoogleEventModel
-
-        if isinstance(google_event, dict):
-            google_event_obj, _ = GoogleEventModel.objects.get_or_create(
-                user=insper_event.user, google_event_id=google_event["id"]
-            )
-        else:
-            google_event_obj = google_event
-        EventMapping.objects.get_or_create(
-            insper_event=insper_event,
-            google_event=google_event_obj,
-            defaults={
-                "sync_session": sync_session,
-                "status": status,
-                "direction": "insper_to_google",
-            },
-        )
-    except Exception as e:
-        logger.error(f"Erro ao criar mapeamento de evento: {str(e)}")
-
-
-def _format_event_title(
-    insper_event: InsperEvent, sync_config: SyncConfiguration
-) -> str:
-    """
-    Formata título do evento conforme configurações
-
-    Args:
-        insper_event: Evento do Insper (objeto model)
-        sync_config: Configuração de sincronização
+    due_mappings = (
+        EventMapping.objects.filter(status="failed", next_retry_at__lte=timezone.now())
+        .select_related("insper_event__user", "google_event", "sync_session")
+        .order_by("next_retry_at")[:RETRY_BATCH_LIMIT]
+    )
 
-    Returns:
-        Título formatado
-    """
-    title = insper_event.title
+    mappings_by_user: Dict[int, List[EventMapping]] = {}
+    for mapping in due_mappings:
+        mappings_by_user.setdefault(mapping.insper_event.user_id, []).append(mapping)
 
-    if sync_config.add_insper_prefix:
-        title = f"[Insper] {title}"
+    results = []
+    for mappings in mappings_by_user.values():
+        user = mappings[0].insper_event.user
+        try:
+            results.append(_retry_user_operations(user, mappings))
+        except Exception as e:
+            logger.error(f"Erro ao repetir operações de {user.email}: {str(e)}")
+            results.append(f"Erro ao repetir operações de {user.email}: {str(e)}")
 
-    return title
+    return results
 
 
-def _format_event_description(
-    insper_event: InsperEvent, sync_config: SyncConfiguration
-) -> str:
+def _retry_user_operations(user: User, mappings: List[EventMapping]) -> str:
     """
-    Formata descrição do evento conforme configurações
+    Repete no Google as operações da fila de um usuário
 
     Args:
-        insper_event: Evento do Insper (objeto model)
-        sync_config: Configuração de sincronização
+        user: Usuário
+        mappings: Mapeamentos com operações a repetir
 
     Returns:
-        Descrição formatada
+        Mensagem com o resultado
     """
-    description_parts = []
-
-    # Descrição original
-    if insper_event.description:
-        description_parts.append(insper_event.description)
-
-    # Informações adicionais conforme configuração
-    if sync_config.include_discipline_code and insper_event.disciplina_codigo:
-        description_parts.append(
-            f"Código da disciplina: {insper_event.disciplina_codigo}"
-        )
-
-    if insper_event.docente:
-        description_parts.append(f"Docente: {insper_event.docente}")
-
-    if insper_event.turma:
-        description_parts.append(f"Turma: {insper_event.turma}")
-
-    if insper_event.dependencia:
-        description_parts.append(f"Local: {insper_event.dependencia}")
+    if not user.can_sync() or not user.google_calendar_id:
+        return f"Usuário {user.email} não pode sincronizar (configurações incompletas)"
 
-    # Adiciona informações de sincronização
-    description_parts.append("\n---")
-    description_parts.append("Sincronizado automaticamente via Insper Sync")
-    description_parts.append(
-        f"Última atualização: {timezone.now().strftime('%d/%m/%Y %H:%M')}"
-    )
+    sync_config = SyncConfiguration.objects.filter(user=user, sync_enabled=True).first()
+    if sync_config is None:
+        return f"Sincronização desabilitada para {user.email}"
 
-    return "\n".join(description_parts)
+    # Uma sincronização completa em andamento já refaz essas operações
+    lock = _sync_lock(user.pk)
+    if not lock.acquire():
+        return f"Sincronização de {user.email} em andamento; novas tentativas adiadas"
 
+    with lock:
+        plan = build_retry_plan(mappings)
+        with SyncContext(user, sync_config, lock=lock) as ctx:
+            ctx.calendar_id = user.google_calendar_id
+            stats = SyncExecutor(ctx).execute(plan)
 
-@shared_task
-def sync_all_users():
-    """
-    Task para sincronizar todos os usuários que podem ser sincronizados
-    """
-    users = User.objects.filter(
-        email_verified=True,
-        credentials_configured=True,
-        google_connected=True,
-        is_active=True,
+    succeeded = stats["created"] + stats["updated"] + stats["deleted"]
+    return (
+        f"Novas tentativas de {user.email}: {succeeded} concluídas, "
+        f"{stats['failed']} falharam"
     )
 
-    results = []
-    for user in users:
-        try:
-            # Verifica configuração de sincronização
-            sync_config = getattr(user, "sync_config", None)
-            if sync_config and sync_config.sync_enabled:
-                result = sync_user_calendar.delay(user.pk)
-                results.append(f"Sincronização iniciada para {user.email}: {result.id}")
-            else:
-                results.append(f"Sincronização desabilitada para {user.email}")
-        except Exception as e:
-            results.append(f"Erro ao iniciar sincronização para {user.email}: {str(e)}")
-
-    return results
-
 
 @shared_task
 def cleanup_old_sync_sessions():
@@ -1,3 +1,639 @@
-from django.test import TestCase
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.google_calendar import GoogleCalendarClient, generate_event_id
+from core.google_calendar_async import AsyncGoogleCalendarClient
+from core.http import override_transport
+from core.rate_limit import RateLimiter, wait_for_budget
+
+from . import tasks
+from .benchmark.runner import BENCHMARK_CACHES, create_benchmark_users
+from .benchmark.servers import FakeGoogleCalendar, FakeInsperPortal, FakeUpstreams
+from .executor import SyncExecutor
+from .models import EventMapping, GoogleEvent, InsperEvent, SyncConfiguration
+from .planner import (
+    CREATE,
+    DELETE,
+    DELETED,
+    UPDATE,
+    PlannedChange,
+    build_google_event_data,
+    build_retry_plan,
+    build_sync_plan,
+    google_event_id,
+)
+
+# Caches em memória: locks, limitadores e pedidos pendentes não vazam entre
+# testes nem para o ambiente configurado
+test_settings = override_settings(CACHES=BENCHMARK_CACHES, COORDINATION_CACHE_URL="")
+
+
+class CacheIsolationMixin:
+    def setUp(self):
+        super().setUp()
+        for alias in BENCHMARK_CACHES:
+            caches[alias].clear()
+
+
+def make_insper_event(user, insper_event_id, title="Aula", **fields):
+    start = timezone.make_aware(datetime(2026, 3, 2, 10, 0))
+    return InsperEvent(
+        user=user,
+        insper_event_id=insper_event_id,
+        title=title,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=2),
+        raw_data={},
+        **fields,
+    )
+
+
+def make_google_event(user, insper_event, sync_config):
+    payload = build_google_event_data(insper_event, sync_config)
+    return GoogleEvent(
+        user=user,
+        google_event_id=google_event_id(insper_event),
+        title=payload["summary"],
+        start_datetime=insper_event.start_datetime,
+        end_datetime=insper_event.end_datetime,
+        raw_data=payload,
+    )
+
+
+@test_settings
+class SyncPlanTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_benchmark_users(1)[0]
+        self.sync_config = SyncConfiguration.objects.create(user=self.user)
+
+    def test_new_event_is_created_with_deterministic_id(self):
+        insper_event = make_insper_event(self.user, "evt-1")
+
+        plan = build_sync_plan([insper_event], [], self.sync_config)
+
+        self.assertEqual(len(plan.creates), 1)
+        change = plan.creates[0]
+        self.assertEqual(change.google_event_id, google_event_id(insper_event))
+        self.assertEqual(change.payload["id"], change.google_event_id)
+
+    def test_unchanged_event_is_noop(self):
+        insper_event = make_insper_event(self.user, "evt-1")
+        google_event = make_google_event(self.user, insper_event, self.sync_config)
+
+        plan = build_sync_plan([insper_event], [google_event], self.sync_config)
+
+        self.assertFalse(plan.has_changes)
+        self.assertEqual(len(plan.noops), 1)
+
+    def test_changed_event_is_updated(self):
+        insper_event = make_insper_event(self.user, "evt-1")
+        google_event = make_google_event(self.user, insper_event, self.sync_config)
+        insper_event.title = "Prova"
+
+        plan = build_sync_plan([insper_event], [google_event], self.sync_config)
+
+        self.assertEqual([change.action for change in plan.updates], [UPDATE])
+        self.assertEqual(plan.updates[0].google_event_id, google_event.google_event_id)
+
+    def test_event_removed_from_insper_is_deleted(self):
+        insper_event = make_insper_event(self.user, "evt-1")
+        google_event = make_google_event(self.user, insper_event, self.sync_config)
+
+        plan = build_sync_plan([], [google_event], self.sync_config)
+
+        self.assertEqual([change.action for change in plan.deletes], [DELETE])
+
+    def test_checkpoint_turns_completed_operations_into_noops(self):
+        created = make_insper_event(self.user, "evt-1")
+        updated = make_insper_event(self.user, "evt-2")
+        updated_google = make_google_event(self.user, updated, self.sync_config)
+        updated.title = "Prova"
+        removed = make_insper_event(self.user, "evt-3")
+        removed_google = make_google_event(self.user, removed, self.sync_config)
+
+        first = build_sync_plan(
+            [created, updated], [updated_google, removed_google], self.sync_config
+        )
+        completed = {
+            change.google_event_id: change.payload["extendedProperties"]["private"][
+                "sync_fingerprint"
+            ]
+            for change in first.creates + first.updates
+        }
+        completed[removed_google.google_event_id] = DELETED
+
+        resumed = build_sync_plan(
+            [created, updated],
+            [updated_google, removed_google],
+            self.sync_config,
+            completed=completed,
+        )
+
+        self.assertFalse(resumed.has_changes)
+        self.assertEqual(len(resumed.noops), 2)
+
+    def test_checkpoint_with_stale_fingerprint_is_sent_again(self):
+        insper_event = make_insper_event(self.user, "evt-1")
+        completed = {google_event_id(insper_event): "fingerprint-antigo"}
+
+        plan = build_sync_plan(
+            [insper_event], [], self.sync_config, completed=completed
+        )
+
+        self.assertEqual(len(plan.creates), 1)
+
+    def test_excluded_event_type_is_skipped(self):
+        self.sync_config.sync_all_events = False
+        self.sync_config.excluded_event_types = ["Prova"]
+        insper_event = make_insper_event(self.user, "evt-1", tipo_evento="Prova")
+
+        plan = build_sync_plan([insper_event], [], self.sync_config)
+
+        self.assertEqual(plan.skipped, 1)
+        self.assertFalse(plan.has_changes)
+
+
+@test_settings
+class RetryPlanTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_benchmark_users(1)[0]
+        self.sync_config = SyncConfiguration.objects.create(user=self.user)
+
+    def _mapping(self, insper_event_id, operation, with_google_event=True):
+        insper_event = make_insper_event(self.user, insper_event_id)
+        insper_event.save()
+        google_event = None
+        if with_google_event:
+            google_event = make_google_event(self.user, insper_event, self.sync_config)
+            google_event.save()
+        payload = build_google_event_data(insper_event, self.sync_config)
+        payload["id"] = google_event_id(insper_event)
+        return EventMapping(
+            insper_event=insper_event,
+            google_event=google_event,
+            status="failed",
+            operation=operation,
+            payload=payload,
+        )
+
+    def test_operations_are_replayed_with_the_saved_payload(self):
+        create = self._mapping("evt-1", CREATE, with_google_event=False)
+        update = self._mapping("evt-2", UPDATE)
+        delete = self._mapping("evt-3", DELETE)
+
+        plan = build_retry_plan([create, update, delete])
+
+        self.assertEqual(
+            [change.google_event_id for change in plan.creates],
+            [create.payload["id"]],
+        )
+        self.assertEqual(plan.creates[0].payload, create.payload)
+        self.assertEqual(plan.updates[0].mapping, update)
+        self.assertEqual(
+            plan.deletes[0].google_event_id, delete.google_event.google_event_id
+        )
+
+    def test_update_without_google_event_is_skipped(self):
+        mapping = self._mapping("evt-1", UPDATE, with_google_event=False)
+
+        plan = build_retry_plan([mapping])
+
+        self.assertEqual(plan.skipped, 1)
+        self.assertFalse(plan.has_changes)
+
+
+class GenerateEventIdTests(TestCase):
+    def test_id_is_valid_base32hex(self):
+        event_id = generate_event_id("insper-sync", 42, "evento/ç 1")
+
+        self.assertRegex(event_id, r"^[a-v0-9]{5,1024}$")
+
+    def test_id_is_deterministic_and_unique_per_parts(self):
+        self.assertEqual(
+            generate_event_id("insper-sync", 1, "a"),
+            generate_event_id("insper-sync", 1, "a"),
+        )
+        self.assertNotEqual(
+            generate_event_id("insper-sync", 1, "a"),
+            generate_event_id("insper-sync", 2, "a"),
+        )
+
+
+def make_event_data(index):
+    start = datetime(2026, 3, 2, 10, 0) + timedelta(days=index)
+    return {
+        "id": generate_event_id("test", index),
+        "summary": f"Evento {index}",
+        "start": {"dateTime": start.isoformat(), "timeZone": "America/Sao_Paulo"},
+        "end": {
+            "dateTime": (start + timedelta(hours=1)).isoformat(),
+            "timeZone": "America/Sao_Paulo",
+        },
+    }
+
+
+class FlakyGoogleCalendar(FakeGoogleCalendar):
+    """Google falso que falha (503) nas próximas requisições marcadas"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = []
+        self.batch_sizes = []
+
+    def _should_fail(self):
+        return self.failures.pop(0) if self.failures else False
+
+    def _batch(self, account, request):
+        self.batch_sizes.append(request.content.decode().count("Content-ID:"))
+        return super()._batch(account, request)
+
+
+@test_settings
+@mock.patch.object(GoogleCalendarClient, "RETRY_BASE_DELAY", 0)
+class BatchTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.google = FlakyGoogleCalendar()
+        upstreams = FakeUpstreams(FakeInsperPortal(), self.google)
+        transport = override_transport(upstreams.transport())
+        transport.__enter__()
+        self.addCleanup(transport.__exit__, None, None, None)
+
+        self.client = GoogleCalendarClient("test-token")
+        success, calendar, _ = self.client.create_calendar("Insper")
+        self.assertTrue(success)
+        self.calendar_id = calendar["id"]
+
+    def test_parse_batch_response_matches_items_by_content_id(self):
+        response = httpx.Response(
+            200,
+            headers={"content-type": 'multipart/mixed; boundary="batch_abc"'},
+            content=(
+                "--batch_abc\r\n"
+                "Content-Type: application/http\r\n"
+                "Content-ID: <response-item-1>\r\n"
+                "\r\n"
+                "HTTP/1.1 404 Not Found\r\n"
+                "Content-Type: application/json\r\n"
+                "\r\n"
+                '{"error": {"code": 404}}\r\n'
+                "--batch_abc\r\n"
+                "Content-Type: application/http\r\n"
+                "Content-ID: <response-item-0>\r\n"
+                "\r\n"
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: application/json\r\n"
+                "\r\n"
+                '{"id": "abc"}\r\n'
+                "--batch_abc\r\n"
+                "Content-Type: application/http\r\n"
+                "Content-ID: <response-item-2>\r\n"
+                "\r\n"
+                "HTTP/1.1 204 No Content\r\n"
+                "\r\n"
+                "--batch_abc--\r\n"
+            ),
+        )
+
+        parsed = GoogleCalendarClient._parse_batch_response(response)
+
+        self.assertEqual(parsed[0], (200, {"id": "abc"}, None))
+        self.assertEqual(parsed[1][0], 404)
+        self.assertIn("404", parsed[1][2])
+        self.assertEqual(parsed[2], (204, None, None))
+
+    def test_only_transient_failures_are_retried(self):
+        events = [make_event_data(index) for index in range(4)]
+        # Itens 0 e 2 falham com erro temporário na primeira chamada
+        self.google.failures = [True, False, True, False]
+
+        results = self.client.batch_upsert_events(self.calendar_id, events)
+
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertEqual(
+            [data["id"] for _, data, _ in results], [event["id"] for event in events]
+        )
+        self.assertEqual(self.google.batch_sizes, [4, 2])
+
+    def test_permanent_failures_are_not_retried(self):
+        results = self.client.batch_delete_events(
+            self.calendar_id, ["inexistente1", "inexistente2"]
+        )
+
+        self.assertEqual([success for success, _, _ in results], [False, False])
+        self.assertEqual(self.google.batch_sizes, [2])
+
+    def test_existing_id_is_overwritten_on_upsert(self):
+        event = make_event_data(0)
+        self.client.batch_upsert_events(self.calendar_id, [event])
+
+        results = self.client.batch_upsert_events(
+            self.calendar_id, [{**event, "summary": "Alterado"}]
+        )
+
+        self.assertEqual(results[0][1]["summary"], "Alterado")
+        self.assertEqual(self.google.event_count(), 1)
+
+    def test_request_without_budget_is_not_sent(self):
+        with (
+            mock.patch.object(GoogleCalendarClient, "MAX_RETRIES", 0),
+            mock.patch("core.google_calendar.wait_for_budget", return_value=False),
+        ):
+            results = self.client.batch_upsert_events(
+                self.calendar_id, [make_event_data(0)]
+            )
+
+        self.assertFalse(results[0][0])
+        self.assertIn("Quota", results[0][2])
+        self.assertEqual(self.google.batch_sizes, [])
+
+
+@test_settings
+@mock.patch.object(AsyncGoogleCalendarClient, "RETRY_BASE_DELAY", 0)
+class AsyncGoogleCalendarClientTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.google = FlakyGoogleCalendar()
+        upstreams = FakeUpstreams(FakeInsperPortal(), self.google)
+        transport = override_transport(upstreams.transport())
+        transport.__enter__()
+        self.addCleanup(transport.__exit__, None, None, None)
+
+    def run_client(self, operation):
+        async def main():
+            async with AsyncGoogleCalendarClient(
+                "test-token", max_concurrency=2
+            ) as client:
+                success, calendar_id, _ = await client.get_or_create_insper_calendar()
+                self.assertTrue(success)
+                return await operation(client, calendar_id)
+
+        return asyncio.run(main())
+
+    def test_batch_upsert_retries_transient_failures(self):
+        events = [make_event_data(index) for index in range(60)]
+
+        async def operation(client, calendar_id):
+            # O primeiro item falha com erro temporário na primeira chamada
+            self.google.failures = [True] + [False] * 59
+            return await client.batch_upsert_events(calendar_id, events)
+
+        results = self.run_client(operation)
+
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertEqual(
+            [data["id"] for _, data, _ in results], [event["id"] for event in events]
+        )
+        # Os dois lotes vão juntos e só o item que falhou é reenviado
+        self.assertEqual(sorted(self.google.batch_sizes[:2]), [10, 50])
+        self.assertEqual(self.google.batch_sizes[2:], [1])
+
+    def test_iter_event_changes_lists_only_changes_after_sync_token(self):
+        events = [make_event_data(index) for index in range(5)]
+
+        async def collect(client, calendar_id, sync_token=None):
+            pages = [
+                page
+                async for success, page, _ in client.iter_event_changes(
+                    calendar_id, sync_token=sync_token, max_results=2
+                )
+                if success
+            ]
+            return pages
+
+        async def operation(client, calendar_id):
+            await client.batch_upsert_events(calendar_id, events)
+            full = await collect(client, calendar_id)
+            await client.batch_delete_events(calendar_id, [events[0]["id"]])
+            changes = await collect(client, calendar_id, full[-1]["nextSyncToken"])
+            return full, changes
+
+        full, changes = self.run_client(operation)
+
+        self.assertEqual(len(full), 3)
+        self.assertTrue(all(page["fullSync"] for page in full))
+        self.assertEqual(sum(len(page["items"]) for page in full), 5)
+        self.assertEqual(len(changes), 1)
+        self.assertFalse(changes[0]["fullSync"])
+        self.assertEqual(
+            [(item["id"], item["status"]) for item in changes[0]["items"]],
+            [(events[0]["id"], "cancelled")],
+        )
+
+    def test_request_without_budget_is_not_sent(self):
+        async def operation(client, calendar_id):
+            with (
+                mock.patch.object(AsyncGoogleCalendarClient, "MAX_RETRIES", 0),
+                mock.patch(
+                    "core.google_calendar_async.wait_for_budget_async",
+                    mock.AsyncMock(return_value=False),
+                ),
+            ):
+                return await client.batch_upsert_events(
+                    calendar_id, [make_event_data(0)]
+                )
+
+        results = self.run_client(operation)
+
+        self.assertFalse(results[0][0])
+        self.assertIn("Quota", results[0][2])
+        self.assertEqual(self.google.batch_sizes, [])
+
+
+@test_settings
+class RateLimiterTests(CacheIsolationMixin, TestCase):
+    def test_burst_is_capped_and_refills_over_the_period(self):
+        limiter = RateLimiter("test", limit=100, period=60, burst=10)
+
+        self.assertTrue(all(limiter.try_acquire() for _ in range(10)))
+        self.assertFalse(limiter.try_acquire())
+
+        # 90 fichas por minuto além da rajada: 10 fichas em 6,67 s
+        with mock.patch("core.rate_limit.time.time", return_value=time.time() + 7):
+            self.assertEqual(limiter.remaining(), 10)
+
+    def test_refused_request_returns_tokens_to_other_limiters(self):
+        project = RateLimiter("project", limit=1000, burst=100)
+        user = RateLimiter("user", limit=10, burst=1)
+        self.assertTrue(wait_for_budget([project, user], max_wait=0))
+
+        self.assertFalse(wait_for_budget([project, user], max_wait=0))
+
+        self.assertEqual(project.remaining(), 99)
+
+
+@test_settings
+class SyncExecutorTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_benchmark_users(1)[0]
+        self.executor = SyncExecutor(mock.Mock(user=self.user, sync_session=None))
+        self.change = PlannedChange(
+            CREATE, "evento1", insper_event=make_insper_event(self.user, "evt-1")
+        )
+
+    def test_failure_that_cannot_be_recorded_stops_the_sync(self):
+        with mock.patch(
+            "sync.executor.record_failed_operation",
+            side_effect=DatabaseError("database is locked"),
+        ):
+            with self.assertRaises(DatabaseError):
+                self.executor._save_results(
+                    [self.change], [(False, None, "Erro HTTP 400")], "created"
+                )
+
+    def test_failed_batch_write_sends_items_to_the_retry_queue(self):
+        with (
+            mock.patch(
+                "sync.executor.prepare_google_events",
+                side_effect=DatabaseError("database is locked"),
+            ),
+            mock.patch("sync.executor.record_failed_operation") as record,
+        ):
+            self.executor._save_results(
+                [self.change], [(True, {"id": "evento1"}, None)], "created"
+            )
+
+        record.assert_called_once()
+        self.assertEqual(self.executor.stats["failed"], 1)
+        self.assertEqual(self.executor.stats["created"], 0)
+
+
+@test_settings
+class EnqueueUserSyncTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(tasks.sync_user_calendar, "apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queued(self):
+        return [call.kwargs["args"] for call in self.apply_async.call_args_list]
+
+    def test_repeated_default_requests_are_coalesced(self):
+        self.assertIsNotNone(tasks.enqueue_user_sync(7))
+        self.assertIsNone(tasks.enqueue_user_sync(7))
+
+        self.assertEqual(self.queued(), [[7, None, None]])
+
+    def test_earlier_request_replaces_later_pending_run(self):
+        tasks.enqueue_user_sync(7, countdown=600)
+        tasks.enqueue_user_sync(7)
+
+        self.assertEqual(len(self.queued()), 2)
+        pending = caches["coordination"].get(tasks._pending_sync_key(7))
+        self.assertEqual(
+            pending["task_id"], self.apply_async.call_args.kwargs["task_id"]
+        )
+
+    def test_explicit_range_is_always_queued(self):
+        tasks.enqueue_user_sync(7)
+        tasks.enqueue_user_sync(7, "2026-11-01", "2026-12-20")
+        tasks.enqueue_user_sync(7, "2026-11-01", "2026-12-20")
+
+        self.assertEqual(
+            self.queued(),
+            [
+                [7, None, None],
+                [7, "2026-11-01", "2026-12-20"],
+                [7, "2026-11-01", "2026-12-20"],
+            ],
+        )
+
+    def test_different_users_are_not_coalesced(self):
+        tasks.enqueue_user_sync(7)
+        tasks.enqueue_user_sync(8)
+
+        self.assertEqual(self.queued(), [[7, None, None], [8, None, None]])
+
+    def test_run_started_after_request_satisfies_it(self):
+        requested_at = time.time()
+        self.assertFalse(tasks._is_sync_satisfied(7, requested_at))
+
+        tasks._record_sync_run(7, requested_at + 1)
+
+        self.assertTrue(tasks._is_sync_satisfied(7, requested_at))
+        self.assertFalse(tasks._is_sync_satisfied(7, requested_at + 2))
+        self.assertFalse(tasks._is_sync_satisfied(7, None))
+
+    def test_deferred_run_is_dropped_when_another_is_pending(self):
+        user = create_benchmark_users(1)[0]
+        tasks.enqueue_user_sync(user.pk)
+        self.apply_async.reset_mock()
+
+        tasks._defer_sync("outra-task", user, None, None)
+        self.assertEqual(self.queued(), [])
+
+        tasks._defer_sync("outra-task", user, "2026-11-01", "2026-12-20")
+        self.assertEqual(self.queued(), [[user.pk, "2026-11-01", "2026-12-20"]])
+
+
+@test_settings
+class SyncUserCalendarTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.insper = FakeInsperPortal(events_per_month=5)
+        self.google = FakeGoogleCalendar()
+        transport = override_transport(
+            FakeUpstreams(self.insper, self.google).transport()
+        )
+        transport.__enter__()
+        self.addCleanup(transport.__exit__, None, None, None)
+        self.user = create_benchmark_users(1)[0]
+
+        start = timezone.localdate().replace(day=1)
+        self.start_date = start.isoformat()
+        self.end_date = (start + timedelta(days=31)).replace(day=1).isoformat()
+
+    def sync(self):
+        tasks.sync_user_calendar.apply(
+            args=[self.user.pk, self.start_date, self.end_date]
+        ).get()
+        return self.user.sync_sessions.order_by("-started_at").first()
+
+    def test_first_sync_creates_events_and_second_is_noop(self):
+        first = self.sync()
+
+        self.assertEqual(first.status, "completed")
+        self.assertEqual(first.events_created, 5)
+        self.assertEqual(self.google.event_count(), 5)
+        self.assertEqual(
+            GoogleEvent.objects.filter(user=self.user, is_active=True).count(), 5
+        )
+        self.assertEqual(
+            EventMapping.objects.filter(
+                insper_event__user=self.user, status="synced"
+            ).count(),
+            5,
+        )
+        for google_event in GoogleEvent.objects.filter(user=self.user):
+            self.assertTrue(re.fullmatch(r"[a-v0-9]+", google_event.google_event_id))
+
+        second = self.sync()
+
+        self.assertEqual(second.status, "completed")
+        self.assertEqual(
+            (second.events_created, second.events_updated, second.events_deleted),
+            (0, 0, 0),
+        )
+
+    def test_events_changed_in_the_portal_are_updated(self):
+        self.sync()
+        self.insper.publish_changes(1.0)
+
+        session = self.sync()
+
+        self.assertEqual(session.events_created, 0)
+        self.assertEqual(session.events_updated, 5)
+        self.assertEqual(self.google.event_count(), 5)
@@ -16,6 +16,8 @@ urlpatterns = [
         views.sync_session_detail,
         name="sync_session_detail",
     ),
+    # Métricas de desempenho (equipe)
+    path("metrics/", views.sync_metrics, name="sync_metrics"),
     # Ações de limpeza
     path("clear-history/", views.clear_sync_history, name="clear_sync_history"),
     path("reset-data/", views.reset_sync_data, name="reset_sync_data"),
@@ -1,14 +1,19 @@
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
 from django.views.generic import ListView
 
+from .metrics import aggregate_metrics, summarize_metrics
 from .models import SyncConfiguration, SyncSession
-from .tasks import sync_user_calendar
+from .tasks import enqueue_user_sync, is_sync_running
+
+# Sessões consideradas nas métricas agregadas e listadas individualmente
+SYNC_METRICS_SESSIONS = 200
+SYNC_METRICS_RECENT_SESSIONS = 20
 
 
 @login_required
@@ -25,9 +30,11 @@ def sync_configuration(request):
         sync_config.sync_frequency_hours = int(
             request.POST.get("sync_frequency_hours", 6)
         )
-        sync_config.google_calendar_name = request.POST.get(
-            "google_calendar_name", "Insper Sync"
-        )
+        google_calendar_name = request.POST.get("google_calendar_name", "Insper Sync")
+        if google_calendar_name != sync_config.google_calendar_name:
+            # Outro nome aponta para outro calendário: refaz a busca por nome
+            sync_config.request_calendar_check()
+        sync_config.google_calendar_name = google_calendar_name
         sync_config.add_insper_prefix = request.POST.get("add_insper_prefix") == "on"
         sync_config.include_teacher_in_description = (
             request.POST.get("include_teacher_in_description") == "on"
@@ -73,35 +80,30 @@ def manual_sync(request):
         )
         return redirect("dashboard")
 
-    # Verifica se já há uma sincronização em andamento
-    running_sessions = SyncSession.objects.filter(
-        user=request.user,
-        status="running",
-        started_at__gte=timezone.now() - timezone.timedelta(minutes=30),
-    )
-
-    if running_sessions.exists():
-        messages.warning(
-            request, "Já há uma sincronização em andamento. Aguarde a conclusão."
-        )
-        return redirect("dashboard")
-
     # Obtém parâmetros opcionais
     start_date = request.POST.get("start_date")
     end_date = request.POST.get("end_date")
 
     try:
-        # Inicia task de sincronização
-        task_result = sync_user_calendar.delay(request.user.id, start_date, end_date)
-
-        messages.success(
-            request,
-            "Sincronização iniciada com sucesso! "
-            "Você pode acompanhar o progresso no dashboard.",
-        )
+        # Inicia task de sincronização; cliques repetidos enquanto houver uma
+        # execução na fila são agrupados nela
+        task_result = enqueue_user_sync(request.user.id, start_date, end_date)
+
+        if task_result is None:
+            messages.info(
+                request,
+                "Já há uma sincronização na fila. "
+                "Você pode acompanhar o progresso no dashboard.",
+            )
+        else:
+            messages.success(
+                request,
+                "Sincronização iniciada com sucesso! "
+                "Você pode acompanhar o progresso no dashboard.",
+            )
 
-        # Armazena ID da task na sessão para acompanhamento
-        request.session["current_sync_task_id"] = task_result.id
+            # Armazena ID da task na sessão para acompanhamento
+            request.session["current_sync_task_id"] = task_result.id
 
     except Exception as e:
         messages.error(request, f"Erro ao iniciar sincronização: {str(e)}")
@@ -161,6 +163,7 @@ def sync_status(request):
             "error_message": latest_session.error_message if latest_session else None,
         },
         "task_status": task_status,
+        "sync_running": is_sync_running(request.user.id),
         "can_sync": request.user.can_sync(),
         "last_sync": request.user.last_sync.isoformat()
         if request.user.last_sync
@@ -230,11 +233,34 @@ def sync_session_detail(request, session_id):
         "session": session,
         "event_mappings": event_mappings,
         "duration": session.duration(),
+        "metrics": summarize_metrics(session.metrics),
     }
 
     return render(request, "sync/session_detail.html", context)
 
 
+@staff_member_required
+def sync_metrics(request):
+    """View com as métricas de desempenho agregadas das sincronizações recentes"""
+    sessions = list(
+        SyncSession.objects.exclude(metrics={})
+        .select_related("user")
+        .order_by("-started_at")[:SYNC_METRICS_SESSIONS]
+    )
+
+    recent_sessions = [
+        {"session": session, "totals": summarize_metrics(session.metrics)["totals"]}
+        for session in sessions[:SYNC_METRICS_RECENT_SESSIONS]
+    ]
+
+    context = {
+        "aggregate": aggregate_metrics([session.metrics for session in sessions]),
+        "recent_sessions": recent_sessions,
+    }
+
+    return render(request, "sync/metrics.html", context)
+
+
 @login_required
 @require_POST
 def clear_sync_history(request):
@@ -275,11 +301,18 @@ def reset_sync_data(request):
 
     try:
         # Remove todos os dados de sincronização do usuário
-        from .models import EventMapping, GoogleEvent, InsperEvent
+        from .models import (
+            EventMapping,
+            GoogleCalendarSyncState,
+            GoogleEvent,
+            InsperEvent,
+        )
 
         EventMapping.objects.filter(insper_event__user=request.user).delete()
 
         GoogleEvent.objects.filter(user=request.user).delete()
+        # Sem os eventos locais, a próxima listagem precisa ser completa
+        GoogleCalendarSyncState.objects.filter(user=request.user).delete()
         InsperEvent.objects.filter(user=request.user).delete()
         SyncSession.objects.filter(user=request.user).delete()
 